@@ -1,9 +1,19 @@
 import os
+import sys
+import time
+from contextlib import contextmanager
+import click
+sys.path.append(os.path.dirname(__file__))
+from src.dag_runner import Stage, run_stages, format_summary, local_imports
+
+DATA_URL = "https://archive.ics.uci.edu/static/public/519/heart+failure+clinical+records.zip"
+DATA_SHA256 = "f0739603e2f9573ffc7d509573cbf9bcb4cc889e4eea0f35a75bec68fc9163d7"
 
 # Command 1: Download and convert the dataset
 command_1 = """
 python scripts/download_and_convert.py \
   --url "https://archive.ics.uci.edu/static/public/519/heart+failure+clinical+records.zip" \
+  --sha256 "f0739603e2f9573ffc7d509573cbf9bcb4cc889e4eea0f35a75bec68fc9163d7" \
   --write_to "data/raw"
 """
 
@@ -40,13 +50,173 @@ python scripts/model_evaluation.py \
   --results-to "results/tables"
 """
 
-# Execute all commands
-commands = [command_1, command_2, command_3, command_4, command_5]
+# Index mode: the split stage saves row indices and one shared base dataset,
+# and the downstream stages slice their rows out of it
+SPLIT_FILES = ["data/processed/heart_failure_train.csv", "data/processed/heart_failure_test.csv"]
+INDEX_FILES = ["data/processed/heart_failure_split_indices.npz", "data/processed/heart_failure_base.npy"]
+
+command_2_indices = """
+python scripts/process_and_analyze.py \
+  --file_path "./data/raw/heart_failure_clinical_records_dataset_converted.csv" \
+  --output_dir "./data/processed" \
+  --indices_only
+"""
+
+command_3_indices = """
+python scripts/correlation_analysis.py \
+  --base_file "./data/processed/heart_failure_base.npy" \
+  --indices_file "./data/processed/heart_failure_split_indices.npz" \
+  --output_file "./results/figures/heatmap.png"
+"""
+
+command_4_indices = """
+python scripts/modelling.py \
+  --base-data "./data/processed/heart_failure_base.npy" \
+  --split-indices "./data/processed/heart_failure_split_indices.npz" \
+  --pipeline-to "results/models" \
+  --plot-to "results/figures" \
+  --table-to "results/tables" \
+  --seed 123
+"""
+
+command_5_indices = """
+python scripts/model_evaluation.py \
+  --base-data "data/processed/heart_failure_base.npy" \
+  --split-indices "data/processed/heart_failure_split_indices.npz" \
+  --pipeline-from "results/models/pipeline.pickle" \
+  --results-to "results/tables"
+"""
+
 
-for i, cmd in enumerate(commands, 1):
-    print(f"Running Command {i}...")
-    result = os.system(cmd)
-    if result != 0:
-        print(f"Error occurred while running Command {i}. Exiting...")
+def script_inputs(script):
+    """A script and every repository module it imports, so editing any of them re-runs its stage."""
+    return [script, *local_imports(script)]
+
+
+def make_stages(indices_only=False):
+    """
+    Declare each stage's inputs and outputs so unchanged stages are skipped
+    and independent stages (correlation analysis and modelling) run in parallel.
+
+    With `indices_only`, the split is stored as row indices plus a shared base
+    dataset instead of train and test copies.
+    """
+    split_files = INDEX_FILES if indices_only else SPLIT_FILES
+    train_files = split_files if indices_only else split_files[:1]
+    test_files = split_files if indices_only else split_files[1:]
+    return [
+        Stage("download_and_convert", command_1,
+              inputs=script_inputs("scripts/download_and_convert.py"),
+              outputs=["data/raw/heart_failure_clinical_records_dataset_converted.csv"]),
+        Stage("process_and_analyze", command_2_indices if indices_only else command_2,
+              inputs=[*script_inputs("scripts/process_and_analyze.py"),
+                      "data/raw/heart_failure_clinical_records_dataset_converted.csv"],
+              outputs=split_files),
+        Stage("correlation_analysis", command_3_indices if indices_only else command_3,
+              inputs=[*script_inputs("scripts/correlation_analysis.py"), *split_files],
+              outputs=["results/figures/heatmap.png"]),
+        Stage("modelling", command_4_indices if indices_only else command_4,
+              inputs=[*script_inputs("scripts/modelling.py"), *train_files],
+              outputs=["results/models/pipeline.pickle", "results/tables/logistic_regression_coefficients.csv"]),
+        Stage("model_evaluation", command_5_indices if indices_only else command_5,
+              inputs=[*script_inputs("scripts/model_evaluation.py"), *test_files,
+                      "results/models/pipeline.pickle"],
+              outputs=["results/tables/confusion_matrix.csv", "results/tables/test_scores.csv"]),
+    ]
+
+
+stages = make_stages()
+
+def run_in_process(url=DATA_URL, sha256=DATA_SHA256):
+    """
+    Run every stage in this interpreter, handing DataFrames from one stage to the next.
+
+    The raw CSV is parsed once; the converted dataset, the train/test splits,
+    the heatmap, the pipeline and the result tables are still written, but
+    only as final artifacts that no later stage reads back.
+
+    Returns
+    -------
+    list of dict
+        One entry per stage with its `name`, `status` and `seconds`, in the
+        format used by `format_summary`.
+    """
+    import zipfile
+    from sklearn import config_context
+    from scripts.download_and_convert import download_zip, select_csv_member, binary_columns_to_bool, write_converted_data
+    from src.dataset_io import ZipMember, read_dataset
+    from scripts.process_and_analyze import validate_data, explore_data
+    from scripts.correlation_analysis import run_correlation_analysis
+    from scripts.modelling import run_modelling
+    from scripts.model_evaluation import evaluate_model
+    from src.split_data import split_data
+
+    summary = []
+
+    @contextmanager
+    def stage(name):
+        print(f"Running stage '{name}'...", flush=True)
+        start = time.perf_counter()
+        yield
+        summary.append({'name': name, 'status': 'ran', 'seconds': time.perf_counter() - start})
+
+    with stage("download_and_convert"):
+        path_to_zip_file = download_zip(url, "data/raw", sha256=sha256)
+        member = select_csv_member(path_to_zip_file)
+        with zipfile.ZipFile(path_to_zip_file) as zip_ref:
+            # The report reads the raw CSV file
+            zip_ref.extract(member, "data/raw")
+        heart_failure_data, binary_columns = binary_columns_to_bool(read_dataset(ZipMember(path_to_zip_file, member)))
+        print(f"Detected binary columns: {binary_columns}")
+        write_converted_data(heart_failure_data, "data/raw")
+
+    with stage("process_and_analyze"):
+        heart_failure_data = validate_data(heart_failure_data)
+        explore_data(heart_failure_data)
+        heart_failure_train, heart_failure_test = split_data(
+            heart_failure_data, "data/processed", train_size=0.8, random_state=522
+        )
+
+    with stage("correlation_analysis"):
+        # preprocess_data modifies its inputs, so give it copies
+        run_correlation_analysis(heart_failure_train.copy(), heart_failure_test.copy(),
+                                 "results/figures/heatmap.png")
+
+    with stage("modelling"):
+        heart_failure_fit = run_modelling(heart_failure_train, "results/models", "results/figures",
+                                          "results/tables", seed=123)
+
+    with stage("model_evaluation"):
+        with config_context(transform_output="pandas"):
+            evaluate_model(heart_failure_fit, heart_failure_test, "results/tables")
+
+    return summary
+
+
+@click.command()
+@click.option('--force', is_flag=True, help="Run every stage even if its inputs are unchanged")
+@click.option('--jobs', type=int, default=None, help="Maximum number of stages to run at the same time")
+@click.option('--state-file', type=str, default=".run_all_state.json", help="File recording the input hashes of the last successful run of each stage")
+@click.option('--in-process', is_flag=True, help="Run every stage in this interpreter, passing DataFrames between stages instead of re-reading CSVs")
+@click.option('--indices-only', is_flag=True, help="Store the train/test split as row indices plus one shared base dataset, which the later stages slice, instead of train and test copies")
+def main(force, jobs, state_file, in_process, indices_only):
+    '''Runs the analysis stages, skipping stages whose inputs have not changed.'''
+    if in_process and indices_only:
+        raise click.UsageError("--in-process already passes DataFrames between stages; it cannot be used with --indices-only.")
+    start = time.perf_counter()
+    if in_process:
+        summary = run_in_process()
+    else:
+        summary = run_stages(make_stages(indices_only), state_file=state_file, max_workers=jobs, force=force)
+
+    print()
+    print(format_summary(summary))
+    print(f"Wall time: {time.perf_counter() - start:.2f}s")
+
+    if any(entry['status'] in ('failed', 'not run') for entry in summary):
+        print("Error occurred while running the analysis. Exiting...")
         exit(1)
-    print(f"Command {i} executed successfully.\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# benchmark_backend.py
+# date: 2026-10-18
+
+import os
+import sys
+import time
+import click
+import numpy as np
+import pandas as pd
+from joblib import effective_n_jobs
+from sklearn.linear_model import LogisticRegression
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_fit import model_fit
+from src.dataset_io import read_dataset
+from scripts.benchmark_tuning import make_preprocessor
+
+
+@click.command()
+@click.option('--training-data', type=str, default="data/processed/heart_failure_train.csv", help="Path to training data")
+@click.option('--scale', type=int, default=1, help="Replicate the training rows this many times to mimic a larger dataset")
+@click.option('--max-workers', type=int, default=-1, help="Largest number of workers to try; -1 uses all cores")
+@click.option('--backends', type=str, default="loky,dask", help="Comma-separated execution backends to compare")
+@click.option('--table-to', type=str, default=None, help="Optional path of a CSV file to write the results table to")
+def main(training_data, scale, max_workers, backends, table_to):
+    '''Times the logistic regression grid search on 1, 2, 4, ... workers for
+    each execution backend and reports the speedup over one worker.'''
+    heart_failure_train = read_dataset(training_data)
+    heart_failure_train = pd.concat([heart_failure_train] * scale, ignore_index=True)
+    grid = {"logisticregression__C": 10.0 ** np.arange(-5, 5, 1)}
+    model = LogisticRegression(random_state=123, max_iter=2000, class_weight="balanced")
+
+    max_workers = effective_n_jobs(max_workers)
+    worker_counts = sorted({2 ** i for i in range(max_workers.bit_length())} | {max_workers})
+
+    results = []
+    baseline_scores = None
+    for backend in backends.split(","):
+        single_worker_time = None
+        for n_jobs in worker_counts:
+            start = time.perf_counter()
+            try:
+                _, search = model_fit(model, make_preprocessor(), grid, heart_failure_train,
+                                      search="grid", n_jobs=n_jobs, backend=backend)
+            except ImportError as e:
+                print(f"Skipping {backend}: {e}")
+                break
+            elapsed = time.perf_counter() - start
+            if baseline_scores is None:
+                baseline_scores = search.cv_results_['mean_test_score']
+            single_worker_time = single_worker_time or elapsed
+            results.append({
+                'backend': backend,
+                'workers': n_jobs,
+                'wall_s': elapsed,
+                'speedup': single_worker_time / elapsed,
+                'same_scores': np.allclose(search.cv_results_['mean_test_score'], baseline_scores),
+            })
+
+    table = pd.DataFrame(results)
+    print(table.to_string(index=False))
+
+    if table_to:
+        output_dir = os.path.dirname(table_to)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        table.to_csv(table_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# benchmark_scheduler.py
+# date: 2026-10-18
+
+import os
+import sys
+import time
+import click
+import numpy as np
+import pandas as pd
+from joblib import effective_n_jobs
+from sklearn.model_selection import cross_validate
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_fit import model_fit
+from src.tuning_scheduler import tune_models
+from src.dataset_io import read_dataset
+from scripts.benchmark_tuning import make_preprocessor
+
+
+def busy_time(search):
+    """Total time the fit and score tasks of a GridSearchCV ran for, over all candidates and folds."""
+    results = search.cv_results_
+    return float(((results['mean_fit_time'] + results['mean_score_time']) * search.n_splits_).sum())
+
+
+@click.command()
+@click.option('--training-data', type=str, default="data/processed/heart_failure_train.csv", help="Path to training data")
+@click.option('--n-jobs', type=int, default=-1, help="CPU budget shared by the models; -1 uses all cores")
+@click.option('--table-to', type=str, default=None, help="Optional path of a CSV file to write the results table to")
+def main(training_data, n_jobs, table_to):
+    '''Compares wall time and core utilisation of tuning the three modelling
+    models one after another with tuning them in one shared worker pool.'''
+    heart_failure_train = read_dataset(training_data)
+    X = heart_failure_train.drop(columns=['DEATH_EVENT'])
+    y = heart_failure_train['DEATH_EVENT']
+    workers = effective_n_jobs(n_jobs)
+
+    knn_grid = {"kneighborsclassifier__n_neighbors": range(1, 100, 3)}
+    lr_grid = {"logisticregression__C": 10.0 ** np.arange(-5, 5, 1)}
+    lr_model = LogisticRegression(random_state=123, max_iter=2000, class_weight="balanced")
+
+    # One after another, as scripts/modelling.py runs them with exhaustive grids
+    start = time.perf_counter()
+    dt_scores = cross_validate(make_pipeline(make_preprocessor(), DecisionTreeClassifier(random_state=522)),
+                               X, y, return_train_score=True)
+    _, knn_search = model_fit(KNeighborsClassifier(), make_preprocessor(), knn_grid, heart_failure_train,
+                              n_jobs=n_jobs)
+    _, lr_search = model_fit(lr_model, make_preprocessor(), lr_grid, heart_failure_train, n_jobs=n_jobs)
+    sequential_wall = time.perf_counter() - start
+    sequential_busy = (float(dt_scores['fit_time'].sum() + dt_scores['score_time'].sum())
+                       + busy_time(knn_search) + busy_time(lr_search))
+
+    results = tune_models({
+        'decision_tree': {'model': DecisionTreeClassifier(random_state=522),
+                          'preprocessor': make_preprocessor(), 'grid': None, 'cv': 5},
+        'knn': {'model': KNeighborsClassifier(), 'preprocessor': make_preprocessor(), 'grid': knn_grid},
+        'logistic_regression': {'model': lr_model, 'preprocessor': make_preprocessor(), 'grid': lr_grid},
+    }, heart_failure_train, n_jobs=n_jobs)
+    schedule = results['_schedule']
+
+    same_results = (
+        np.allclose(dt_scores['test_score'], results['decision_tree']['test_score'])
+        and np.allclose(knn_search.cv_results_['mean_test_score'], results['knn'].cv_results_['mean_test_score'])
+        and np.allclose(lr_search.cv_results_['mean_test_score'],
+                        results['logistic_regression'].cv_results_['mean_test_score'])
+    )
+    table = pd.DataFrame([
+        {'schedule': 'sequential', 'wall_s': sequential_wall, 'workers': workers,
+         'utilisation': sequential_busy / (sequential_wall * workers)},
+        {'schedule': 'shared pool', 'wall_s': schedule['wall_time'], 'workers': schedule['workers'],
+         'utilisation': schedule['utilisation']},
+    ])
+    print(table.to_string(index=False))
+    print(f"Per-model cross-validation scores identical: {same_results}")
+
+    if table_to:
+        output_dir = os.path.dirname(table_to)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        table.to_csv(table_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
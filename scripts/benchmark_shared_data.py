@@ -0,0 +1,96 @@
+# benchmark_shared_data.py
+# date: 2026-10-18
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import click
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_fit import model_fit
+from src.dataset_io import read_dataset
+from scripts.benchmark_tuning import make_preprocessor
+
+
+def _peak_rss():
+    """Return this process's id and its peak resident set size in bytes, from /proc."""
+    # Keep the task alive briefly so the tasks spread over all the workers
+    time.sleep(0.05)
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                return os.getpid(), int(line.split()[1]) * 1024
+    return os.getpid(), None
+
+
+def worker_peak_rss(n_jobs=-1):
+    """
+    Measure the peak resident memory of each joblib worker process.
+
+    The workers are reused between calls, so this reports the largest
+    footprint they reached during earlier parallel work, such as a
+    cross-validated search. With a single job the current process is
+    measured instead. Returns None where `/proc` is not available.
+    """
+    if not os.path.exists('/proc/self/status'):
+        return None
+    n_workers = effective_n_jobs(n_jobs)
+    measurements = Parallel(n_jobs=n_jobs)(delayed(_peak_rss)() for _ in range(4 * n_workers))
+    return {pid: rss for pid, rss in measurements if rss is not None}
+
+
+def run_search(heart_failure_train, shared_data):
+    """Tune the Logistic Regression grid and return the wall time and the workers' peak RSS in bytes."""
+    model = LogisticRegression(random_state=123, max_iter=2000, class_weight="balanced")
+    grid = {"logisticregression__C": 10.0 ** np.arange(-5, 5, 1)}
+    start = time.perf_counter()
+    _, search = model_fit(model, make_preprocessor(), grid, heart_failure_train,
+                          cache_transformers=False, shared_data=shared_data)
+    elapsed = time.perf_counter() - start
+    peak_rss = worker_peak_rss() or {}
+    return elapsed, peak_rss, search.best_params_
+
+
+@click.command()
+@click.option('--training-data', type=str, default="data/processed/heart_failure_train.csv", help="Path to training data")
+@click.option('--scale', type=int, default=200, help="Number of times the training data is repeated to build the benchmark data")
+@click.option('--table-to', type=str, default=None, help="Optional path of a CSV file to write the results table to")
+def main(training_data, scale, table_to):
+    '''Compares wall time and peak worker memory of model_fit with the
+    DataFrame sent to every worker and with a shared memory-mapped design matrix.'''
+    heart_failure_train = read_dataset(training_data)
+    heart_failure_train = pd.concat([heart_failure_train] * scale, ignore_index=True)
+    print(f"Benchmark data: {len(heart_failure_train):,} rows "
+          f"({heart_failure_train.memory_usage(deep=True).sum() / 1e6:.1f} MB in memory)")
+
+    results = []
+    for shared_data in [False, True]:
+        # A fresh process per mode, so neither its workers nor its peak memory carry over
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            elapsed, peak_rss, best_params = executor.submit(run_search, heart_failure_train, shared_data).result()
+        results.append({
+            'shared_data': shared_data,
+            'wall_s': elapsed,
+            'workers': len(peak_rss),
+            'max_worker_rss_mb': max(peak_rss.values(), default=np.nan) / 1e6,
+            'total_worker_rss_mb': sum(peak_rss.values()) / 1e6,
+            'best_params': best_params,
+        })
+
+    results = pd.DataFrame(results)
+    print(results.to_string(index=False))
+
+    if table_to:
+        output_dir = os.path.dirname(table_to)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        results.to_csv(table_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# benchmark_storage.py
+# date: 2026-10-18
+
+import os
+import sys
+import tempfile
+import time
+import click
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.dataset_io import FILE_FORMATS, read_dataset, write_dataset
+
+
+def best_time(fn, repeats):
+    """Return the fastest wall time in seconds over `repeats` calls of `fn`, and its last result."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+@click.command()
+@click.option('--data-file', type=click.Path(exists=True, dir_okay=False), default="data/raw/heart_failure_clinical_records_dataset_converted.csv", help="Dataset to scale up and benchmark")
+@click.option('--scale', type=int, default=1000, help="Number of times the dataset is repeated to build the benchmark data")
+@click.option('--columns', type=str, default="age,ejection_fraction,DEATH_EVENT", help="Comma-separated columns for the projected-read benchmark")
+@click.option('--repeats', type=int, default=3, help="Number of timed repetitions per measurement")
+@click.option('--table-to', type=str, default=None, help="Optional path of a CSV file to write the results table to")
+def main(data_file, scale, columns, repeats, table_to):
+    '''Compares file size, load time, projected-column load time and dtype
+    preservation of CSV, Parquet and Feather on a scaled-up dataset.'''
+    data = read_dataset(data_file)
+    data = pd.concat([data] * scale, ignore_index=True)
+    columns = columns.split(",")
+    print(f"Benchmark data: {len(data):,} rows x {data.shape[1]} columns")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for file_format, extension in FILE_FORMATS.items():
+            path = os.path.join(tmp_dir, f"benchmark{extension}")
+            try:
+                write_time, _ = best_time(lambda: write_dataset(data, path), 1)
+            except ImportError as e:
+                print(f"Skipping {file_format}: {e}")
+                continue
+            read_time, loaded = best_time(lambda: read_dataset(path), repeats)
+            projected_time, _ = best_time(lambda: read_dataset(path, columns=columns), repeats)
+            results.append({
+                'format': file_format,
+                'size_mb': os.path.getsize(path) / 1e6,
+                'write_s': write_time,
+                'read_s': read_time,
+                'projected_read_s': projected_time,
+                'dtypes_preserved': bool((loaded.dtypes == data.dtypes).all())
+            })
+
+    results = pd.DataFrame(results)
+    csv_read = results.loc[results['format'] == 'csv', 'read_s'].iloc[0]
+    results['read_speedup_vs_csv'] = csv_read / results['read_s']
+    print(results.to_string(index=False))
+
+    if table_to:
+        output_dir = os.path.dirname(table_to)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        results.to_csv(table_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
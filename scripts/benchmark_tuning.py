@@ -0,0 +1,113 @@
+# benchmark_tuning.py
+# date: 2026-10-18
+
+import os
+import sys
+import time
+import click
+import numpy as np
+import pandas as pd
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_fit import model_fit
+from src.path_search import lr_path_search
+from src.dataset_io import read_dataset
+
+
+def make_preprocessor():
+    """The preprocessor used by scripts/modelling.py."""
+    numeric_columns = ['age', 'creatinine_phosphokinase', 'ejection_fraction', 'platelets', 'serum_creatinine', 'serum_sodium', 'time']
+    binary_columns = ['anaemia', 'diabetes', 'high_blood_pressure', 'sex', 'smoking']
+    return make_column_transformer(
+        (StandardScaler(), numeric_columns),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), binary_columns),
+        remainder='passthrough'
+    )
+
+
+def time_search(model, grid, heart_failure_train, **kwargs):
+    """Run `model_fit` once and return its wall time in seconds and the search object."""
+    start = time.perf_counter()
+    _, search = model_fit(model, make_preprocessor(), grid, heart_failure_train, **kwargs)
+    return time.perf_counter() - start, search
+
+
+def compare(name, search, baseline, candidate):
+    """Summarise a candidate search against the baseline grid search as one results row."""
+    (base_time, base_search), (cand_time, cand_search) = baseline, candidate
+    base_scores = base_search.cv_results_['mean_test_score']
+    cand_scores = cand_search.cv_results_['mean_test_score']
+    return {
+        'model': name,
+        'search': search,
+        'grid_s': base_time,
+        'candidate_s': cand_time,
+        'speedup': base_time / cand_time,
+        'grid_fits': base_search.n_fits_,
+        'candidate_fits': getattr(cand_search, 'n_fits_', np.nan),
+        'grid_best': base_search.best_params_,
+        'candidate_best': cand_search.best_params_,
+        # Only comparable when every candidate was scored once on the same folds
+        'max_score_diff': float(np.abs(base_scores - cand_scores).max())
+                          if len(base_scores) == len(cand_scores) else np.nan,
+    }
+
+
+@click.command()
+@click.option('--training-data', type=str, default="data/processed/heart_failure_train.csv", help="Path to training data")
+@click.option('--scale', type=int, default=1, help="Number of times the training data is repeated, to see how the strategies scale")
+@click.option('--halving-factor', type=int, default=3, help="Reduction factor of the successive-halving search")
+@click.option('--table-to', type=str, default=None, help="Optional path of a CSV file to write the results table to")
+def main(training_data, scale, halving_factor, table_to):
+    '''Compares wall time, number of fits and results of the exhaustive grid
+    search with the faster search strategies of model_fit on the modelling grids.'''
+    heart_failure_train = read_dataset(training_data)
+    heart_failure_train = pd.concat([heart_failure_train] * scale, ignore_index=True)
+    print(f"Benchmark data: {len(heart_failure_train):,} rows")
+
+    lr_model = LogisticRegression(random_state=123, max_iter=2000, class_weight="balanced")
+    dt_model = DecisionTreeClassifier(random_state=522)
+    # The decision tree candidates are the effective alphas of the full training set's pruning path
+    ccp_alphas = dt_model.cost_complexity_pruning_path(
+        make_preprocessor().fit_transform(heart_failure_train.drop(columns=['DEATH_EVENT'])),
+        heart_failure_train['DEATH_EVENT']
+    ).ccp_alphas
+    models = {
+        'knn': (KNeighborsClassifier(), {"kneighborsclassifier__n_neighbors": range(1, 100, 3)}),
+        'logistic regression': (lr_model, {"logisticregression__C": 10.0 ** np.arange(-5, 5, 1)}),
+        'decision tree': (dt_model, {"decisiontreeclassifier__ccp_alpha": ccp_alphas}),
+    }
+
+    results = []
+    for name, (model, grid) in models.items():
+        baseline = time_search(model, grid, heart_failure_train)
+        results.append(compare(name, 'path', baseline,
+                               time_search(model, grid, heart_failure_train, search="path")))
+        results.append(compare(name, 'halving', baseline,
+                               time_search(model, grid, heart_failure_train, search="halving",
+                                           halving_factor=halving_factor)))
+
+    # GridSearchCV does not record solver iterations, so count them for cold starts separately
+    lr_model, lr_grid = models['logistic regression']
+    cold_iterations = lr_path_search(lr_model, make_preprocessor(), lr_grid, heart_failure_train,
+                                     warm_start=False).n_iter_
+    warm_iterations = lr_path_search(lr_model, make_preprocessor(), lr_grid, heart_failure_train).n_iter_
+    print(f"Logistic regression solver iterations: {cold_iterations} from cold starts, "
+          f"{warm_iterations} along the warm-started path.")
+
+    results = pd.DataFrame(results)
+    print(results.to_string(index=False))
+
+    if table_to:
+        output_dir = os.path.dirname(table_to)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        results.to_csv(table_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
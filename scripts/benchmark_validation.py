@@ -0,0 +1,74 @@
+# benchmark_validation.py
+# date: 2026-10-18
+
+import os
+import sys
+import tempfile
+import time
+import click
+import numpy as np
+import pandas as pd
+import pandera as pa
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.chunked_validation import validate_in_chunks
+from src.dataset_io import read_dataset
+from scripts.process_and_analyze import heart_failure_schema
+
+
+def pandera_failures(path, schema):
+    """Load the whole file, validate it with pandera and return the number of failure cases per check."""
+    try:
+        schema.validate(read_dataset(path), lazy=True)
+    except pa.errors.SchemaErrors as e:
+        return e.failure_cases.groupby('check').size().to_dict()
+    return {}
+
+
+@click.command()
+@click.option('--data-file', type=click.Path(exists=True, dir_okay=False), default="data/raw/heart_failure_clinical_records_dataset_converted.csv", help="Dataset to scale up and benchmark")
+@click.option('--scale', type=int, default=1000, help="Number of times the dataset is repeated to build the benchmark data")
+@click.option('--chunksize', type=int, default=100_000, help="Rows per chunk of the chunked validator")
+@click.option('--table-to', type=str, default=None, help="Optional path of a CSV file to write the results table to")
+def main(data_file, scale, chunksize, table_to):
+    '''Compares the throughput of pandera validation of the whole file with
+    chunked vectorized validation against the same schema.'''
+    data = read_dataset(data_file)
+    data = pd.concat([data] * scale, ignore_index=True)
+    # Make the repeated rows distinct so the duplicate check passes, keeping platelets in range
+    data['platelets'] += np.arange(len(data)) % 1000 * 1e-3 + np.arange(len(data)) // 1000 * 1e-6
+    # A few out-of-range values, so both validators also build a failure report
+    data.loc[data.index[::50_000], 'age'] = 150.0
+    schema = heart_failure_schema()
+    print(f"Benchmark data: {len(data):,} rows x {data.shape[1]} columns")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "benchmark.csv")
+        data.to_csv(path, index=False)
+
+        start = time.perf_counter()
+        expected = pandera_failures(path, schema)
+        pandera_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = validate_in_chunks(path, schema, chunksize=chunksize, unique_rows=True, no_empty_rows=True)
+        chunked_time = time.perf_counter() - start
+
+    found = dict(zip(report['check'], report['failure_count']))
+    results = pd.DataFrame([
+        {'validator': 'pandera (whole file)', 'seconds': pandera_time, 'rows_per_second': len(data) / pandera_time,
+         'failures': sum(expected.values())},
+        {'validator': f'chunked ({chunksize:,} rows)', 'seconds': chunked_time,
+         'rows_per_second': len(data) / chunked_time, 'failures': sum(found.values())},
+    ])
+    print(results.to_string(index=False))
+    print(f"Same failure counts per check: {found == expected}")
+
+    if table_to:
+        output_dir = os.path.dirname(table_to)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        results.to_csv(table_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@
 
 import os
 import sys
+from functools import partial
 import pandas as pd
 import altair as alt
 from sklearn.compose import make_column_transformer
@@ -14,6 +15,32 @@ import click
 import warnings
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.correlation_heat import correlation_heat
+from src.dataset_io import read_dataset, iter_dataset_chunks
+from src.stream_fit import fit_preprocessor_in_chunks
+from src.streaming_correlation import streaming_correlation
+from src.split_indices import load_split
+
+NUMERIC_COLUMNS = ['age', 'creatinine_phosphokinase', 'ejection_fraction',
+                   'platelets', 'serum_creatinine', 'serum_sodium', 'time']
+BINARY_COLUMNS = ['anaemia', 'diabetes', 'high_blood_pressure', 'sex', 'smoking']
+
+
+def make_preprocessor(numeric_columns, binary_columns):
+    """
+    Creates the (unfitted) preprocessor that scales numeric features and encodes binary features.
+
+    Parameters:
+        numeric_columns (list): List of numeric columns to scale.
+        binary_columns (list): List of binary columns to encode.
+
+    Returns:
+        sklearn.compose.ColumnTransformer: The preprocessor.
+    """
+    return make_column_transformer(
+        (StandardScaler(), numeric_columns),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), binary_columns),
+        remainder='passthrough'
+    )
 
 
 def preprocess_data(train_df, test_df, numeric_columns, binary_columns):
@@ -34,11 +61,7 @@ def preprocess_data(train_df, test_df, numeric_columns, binary_columns):
     test_df[binary_columns] = test_df[binary_columns].astype(bool)
 
     # Create preprocessing pipeline
-    preprocessor = make_column_transformer(
-        (StandardScaler(), numeric_columns),
-        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), binary_columns),
-        remainder='passthrough'
-    )
+    preprocessor = make_preprocessor(numeric_columns, binary_columns)
     
     # Fit and transform features
     preprocessor.fit(train_df)
@@ -55,18 +78,28 @@ def preprocess_data(train_df, test_df, numeric_columns, binary_columns):
     return train_scaled_df, test_scaled_df, column_names
 
 
-def plot_correlation_matrix(scaled_train, output_file=None):
+def plot_correlation_matrix(scaled_train, output_file=None, method="pearson", chunksize=None, transform=None):
     """
     Plots the correlation matrix for the training dataset.
 
     Parameters:
-        scaled_train (pd.DataFrame): Processed training dataset.
+        scaled_train (pd.DataFrame or str): Processed training dataset, or with `chunksize`
+            the path of a dataset file that is read one chunk at a time.
         output_file (str): File path to save the heatmap (optional).
+        method (str): "pearson" or "spearman" (default="pearson").
+        chunksize (int): Compute the correlations in one pass over chunks of this many rows
+            with `streaming_correlation`, in O(features²) memory (optional).
+        transform (callable): With `chunksize`, applied to each chunk of `scaled_train` first,
+            so the processed dataset does not have to be built in full (optional).
 
     Returns:
         None
     """
-    correlation_matrix = scaled_train.corr()
+    if chunksize:
+        correlation_matrix = streaming_correlation(scaled_train, chunksize=chunksize, method=method,
+                                                   transform=transform)
+    else:
+        correlation_matrix = scaled_train.corr(method=method)
     correlation_long = correlation_matrix.reset_index().melt(id_vars='index')
     correlation_long.columns = ['Feature 1', 'Feature 2', 'Correlation']
 
@@ -86,27 +119,90 @@ def plot_correlation_matrix(scaled_train, output_file=None):
 
 
 @click.command()
-@click.option('--train_file', type=click.Path(exists=True, dir_okay=False), required=True, help="Path to the training dataset CSV file.")
-@click.option('--test_file', type=click.Path(exists=True, dir_okay=False), required=True, help="Path to the test dataset CSV file.")
+@click.option('--train_file', type=click.Path(exists=True, dir_okay=False), help="Path to the training dataset CSV, Parquet or Feather file.")
+@click.option('--test_file', type=click.Path(exists=True, dir_okay=False), help="Path to the test dataset CSV, Parquet or Feather file.")
+@click.option('--base_file', type=click.Path(exists=True, dir_okay=False), help="Path to the shared base dataset (.npy) written by process_and_analyze.py --indices_only; used with --indices_file instead of --train_file and --test_file.")
+@click.option('--indices_file', type=click.Path(exists=True, dir_okay=False), help="Path to the split indices (.npz) whose rows are sliced from --base_file.")
 @click.option('--output_file', type=click.Path(dir_okay=False), help="Path to save the correlation heatmap (optional).")
 @click.option('--threshold_feature_feature', default=0.92, help="Maximum correlation threshold for feature-feature correlation (default=0.92).")
-def main(train_file, test_file, output_file, threshold_feature_feature):
+@click.option('--method', type=click.Choice(["pearson", "spearman"]), default="pearson", help="Correlation method (default='pearson').")
+@click.option('--chunksize', type=int, default=None, help="Read --train_file in chunks of this many rows and compute the correlations without loading it (optional).")
+def main(train_file, test_file, base_file, indices_file, output_file, threshold_feature_feature, method, chunksize):
     """
     Preprocess data, plot the correlation matrix, and validate feature-feature correlations.
     """
-    numeric_columns = ['age', 'creatinine_phosphokinase', 'ejection_fraction', 
-                       'platelets', 'serum_creatinine', 'serum_sodium', 'time']
-    binary_columns = ['anaemia', 'diabetes', 'high_blood_pressure', 'sex', 'smoking']
+    if chunksize:
+        if indices_file or not train_file:
+            raise click.UsageError("--chunksize reads --train_file in chunks and cannot be used with --indices_file.")
+        run_chunked_correlation_analysis(train_file, output_file, method=method, chunksize=chunksize)
+        return
 
     # Load datasets
-    train_df = pd.read_csv(train_file)
-    test_df = pd.read_csv(test_file)
+    if indices_file:
+        if not base_file:
+            raise click.UsageError("--indices_file needs --base_file.")
+        train_df, test_df = load_split(base_file, indices_file)
+    elif train_file and test_file:
+        train_df = read_dataset(train_file)
+        test_df = read_dataset(test_file)
+    else:
+        raise click.UsageError("Give --train_file and --test_file, or --base_file and --indices_file.")
+
+    run_correlation_analysis(train_df, test_df, output_file, method=method)
+
+
+def run_correlation_analysis(train_df, test_df, output_file=None, method="pearson"):
+    """
+    Preprocesses the training and test datasets and plots the training correlation matrix.
+
+    Parameters:
+        train_df (pd.DataFrame): Training dataset.
+        test_df (pd.DataFrame): Test dataset.
+        output_file (str): File path to save the heatmap (optional).
+        method (str): "pearson" or "spearman" (default="pearson").
 
+    Returns:
+        None
+    """
     # Preprocess data
-    scaled_train, _, _ = preprocess_data(train_df, test_df, numeric_columns, binary_columns)
+    scaled_train, _, _ = preprocess_data(train_df, test_df, NUMERIC_COLUMNS, BINARY_COLUMNS)
 
     # Plot and save/display correlation heatmap
-    plot_correlation_matrix(scaled_train, output_file)
+    plot_correlation_matrix(scaled_train, output_file, method=method)
+
+
+def run_chunked_correlation_analysis(train_file, output_file=None, method="pearson", chunksize=100_000):
+    """
+    Preprocesses and correlates a training dataset file chunk by chunk, in O(features²) memory.
+
+    A first pass fits the preprocessor with `fit_preprocessor_in_chunks` (the scaler
+    incrementally with `partial_fit`), and `streaming_correlation` then applies it to
+    one chunk at a time while correlating, so neither the data nor the processed
+    dataset is held in memory whole.
+
+    Parameters:
+        train_file (str): Path to the training dataset CSV, Parquet or Feather file.
+        output_file (str): File path to save the heatmap (optional).
+        method (str): "pearson" or "spearman" (default="pearson").
+        chunksize (int): Number of rows read at a time (default=100_000).
+
+    Returns:
+        None
+    """
+    chunks = (_binary_to_bool(chunk) for chunk in iter_dataset_chunks(train_file, chunksize))
+    preprocessor = fit_preprocessor_in_chunks(chunks, make_preprocessor(NUMERIC_COLUMNS, BINARY_COLUMNS))
+    preprocessor.set_output(transform="pandas")
+    plot_correlation_matrix(train_file, output_file, method=method, chunksize=chunksize,
+                            transform=partial(_transform_chunk, preprocessor))
+
+
+def _binary_to_bool(chunk):
+    chunk[BINARY_COLUMNS] = chunk[BINARY_COLUMNS].astype(bool)
+    return chunk
+
+
+def _transform_chunk(preprocessor, chunk):
+    return preprocessor.transform(_binary_to_bool(chunk))
 
 
 if __name__ == "__main__":
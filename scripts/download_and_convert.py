@@ -3,91 +3,200 @@
 # date: 2024-12-06
 
 import os
+import sys
 import pandas as pd
-import requests
+import shutil
 import zipfile
 import click
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.dataset_io import ZipMember, read_dataset, write_dataset, with_format, zip_members
+from src.dataset_download import download_file
+from src.stream_convert_binary_columns import stream_convert_binary_columns
 
 
-def download_and_extract_zip(url, directory):
+def download_zip(url, directory, cache_dir=None, sha256=None):
     """
-    Download a ZIP file from the given URL and extract its contents to a specified directory.
+    Download a ZIP file from the given URL into a specified directory.
+
+    The ZIP file is streamed to disk through a local download cache (see
+    `download_file`), so an unchanged archive is not downloaded again and an
+    interrupted download resumes where it stopped.
 
     Parameters:
     ----------
     url : str
         The URL of the ZIP file to download.
     directory : str
-        The directory where the ZIP file will be saved and extracted.
+        The directory where the ZIP file will be saved.
+    cache_dir : str, optional
+        Directory of the download cache. Defaults to `.download_cache` inside `directory`.
+    sha256 : str, optional
+        Expected SHA-256 hex digest of the ZIP file.
 
     Returns:
     -------
-    str: Path to the extracted CSV file.
+    str: Path to the downloaded ZIP file.
     """
-    # Validate URL and fetch the file
-    request = requests.get(url, verify= False)
-    filename_from_url = os.path.basename(url)
-
-    if request.status_code != 200:
-        raise ValueError(f"The URL '{url}' does not exist or is inaccessible.")
-    
     if not url.endswith('.zip'):
         raise ValueError(f"The URL '{url}' does not point to a ZIP file.")
-    
+
     # Ensure the output directory exists
     os.makedirs(directory, exist_ok=True)
 
-    # Save the ZIP file
-    path_to_zip_file = os.path.join(directory, filename_from_url)
-    with open(path_to_zip_file, 'wb') as f:
-        f.write(request.content)
+    # Download the ZIP file through the cache and copy it to the output directory
+    cached_file = download_file(url, cache_dir or os.path.join(directory, ".download_cache"), sha256=sha256)
+    path_to_zip_file = os.path.join(directory, os.path.basename(url))
+    shutil.copyfile(cached_file, path_to_zip_file)
+    return path_to_zip_file
+
+
+def select_csv_member(path_to_zip_file, member=None):
+    """
+    Choose the CSV file to read from a ZIP archive.
+
+    The archive's member list is printed. Without `member`, the first CSV
+    file in the archive's own order is chosen, so the choice does not depend
+    on what else is in the output directory.
+
+    Parameters:
+    ----------
+    path_to_zip_file : str
+        Path to the ZIP file.
+    member : str, optional
+        Name of the member to use.
+
+    Returns:
+    -------
+    str: Name of the CSV member.
+    """
+    members = zip_members(path_to_zip_file)
+    print(f"'{path_to_zip_file}' contains {members}")
+    if member is not None:
+        if member not in members:
+            raise ValueError(f"The ZIP file has no member '{member}'.")
+        return member
+    csv_members = [name for name in members if name.lower().endswith('.csv')]
+    if len(csv_members) == 0:
+        raise ValueError("The ZIP file appears to contain no CSV files.")
+    return csv_members[0]
+
+
+def download_and_extract_zip(url, directory, cache_dir=None, sha256=None, member=None):
+    """
+    Download a ZIP file from the given URL and extract its contents to a specified directory.
+
+    Parameters:
+    ----------
+    url : str
+        The URL of the ZIP file to download.
+    directory : str
+        The directory where the ZIP file will be saved and extracted.
+    cache_dir : str, optional
+        Directory of the download cache. Defaults to `.download_cache` inside `directory`.
+    sha256 : str, optional
+        Expected SHA-256 hex digest of the ZIP file.
+    member : str, optional
+        Name of the CSV file in the archive. Defaults to the first CSV file.
+
+    Returns:
+    -------
+    str: Path to the extracted CSV file.
+    """
+    path_to_zip_file = download_zip(url, directory, cache_dir=cache_dir, sha256=sha256)
+    member = select_csv_member(path_to_zip_file, member)
 
     # Extract the ZIP file
     with zipfile.ZipFile(path_to_zip_file, 'r') as zip_ref:
         zip_ref.extractall(directory)
+        n_files = len(zip_ref.namelist())
 
-    # Find the first CSV file in the extracted files
-    extracted_files = [file for file in os.listdir(directory) if file.endswith('.csv')]
-    if len(extracted_files) == 0:
-        raise ValueError("The ZIP file appears to contain no CSV files.")
-    
-    print(f"Successfully extracted {len(extracted_files)} files to '{directory}'.")
-    return os.path.join(directory, extracted_files[0])
+    print(f"Successfully extracted {n_files} files to '{directory}'.")
+    return os.path.join(directory, member)
 
 
-def convert_binary_columns(file_path, output_dir):
+def binary_columns_to_bool(heart_failure_data):
     """
-    Automatically detect and convert binary columns in a dataset to boolean values (True/False).
+    Automatically detect binary columns in a DataFrame and convert them to boolean values (True/False).
 
     Parameters:
     ----------
-    file_path : str
-        The file path of the dataset to process.
-    output_dir : str
-        The directory where the converted dataset will be saved.
+    heart_failure_data : pandas.DataFrame
+        The dataset to process. It is not modified.
 
     Returns:
     -------
-    str: Path to the converted dataset.
+    pandas.DataFrame, list: The converted dataset and the names of the detected binary columns.
     """
-    # Load the dataset
-    heart_failure_data = pd.read_csv(file_path)
-
     # Automatically detect binary columns
     binary_columns = [
         col for col in heart_failure_data.columns
         if heart_failure_data[col].dropna().nunique() == 2
     ]
 
-    print(f"Detected binary columns: {binary_columns}")
-
     # Convert binary columns to True/False
+    heart_failure_data = heart_failure_data.copy()
     heart_failure_data[binary_columns] = heart_failure_data[binary_columns].astype(bool)
 
-    # Save the converted dataset
+    return heart_failure_data, binary_columns
+
+
+def write_converted_data(heart_failure_data, output_dir, file_format="csv"):
+    """
+    Save a converted dataset to the output directory as CSV, Parquet or Feather.
+
+    Returns:
+    -------
+    str: Path to the converted dataset.
+    """
     os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, "heart_failure_clinical_records_dataset_converted.csv")
-    heart_failure_data.to_csv(output_file, index=False)
+    output_file = with_format(
+        os.path.join(output_dir, "heart_failure_clinical_records_dataset_converted.csv"), file_format
+    )
+    return write_dataset(heart_failure_data, output_file)
+
+
+def convert_binary_columns(file_path, output_dir, file_format="csv", chunksize=None):
+    """
+    Automatically detect and convert binary columns in a dataset to boolean values (True/False).
+
+    Parameters:
+    ----------
+    file_path : str or ZipMember
+        The file path of the dataset to process, or a CSV file inside a ZIP
+        archive, which is parsed without extracting it.
+    output_dir : str
+        The directory where the converted dataset will be saved.
+    file_format : str, optional (default="csv")
+        Format of the converted dataset: "csv", "parquet" or "feather".
+        Parquet and Feather keep the boolean dtypes.
+    chunksize : int, optional
+        Detect and convert the binary columns in two passes over chunks of
+        this many rows instead of loading the dataset (see
+        `stream_convert_binary_columns`). The result is the same.
+
+    Returns:
+    -------
+    str: Path to the converted dataset.
+    """
+    if chunksize:
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = with_format(
+            os.path.join(output_dir, "heart_failure_clinical_records_dataset_converted.csv"), file_format
+        )
+        binary_columns = stream_convert_binary_columns(file_path, output_file, chunksize=chunksize)
+        print(f"Detected binary columns: {binary_columns}")
+        print(f"Binary columns converted and saved to {output_file}")
+        return output_file
+
+    # Load the dataset
+    heart_failure_data = read_dataset(file_path)
+
+    # Detect and convert binary columns
+    heart_failure_data, binary_columns = binary_columns_to_bool(heart_failure_data)
+    print(f"Detected binary columns: {binary_columns}")
+
+    # Save the converted dataset
+    output_file = write_converted_data(heart_failure_data, output_dir, file_format)
 
     print(f"Binary columns converted and saved to {output_file}")
     return output_file
@@ -101,17 +210,29 @@ def convert_binary_columns(file_path, output_dir):
     default="../data", 
     help="Path to the directory where data will be saved (default is '../data')."
 )
-def main(url, write_to):
+@click.option('--file_format', type=click.Choice(["csv", "parquet", "feather"]), default="csv", help="Format of the converted dataset (default is 'csv').")
+@click.option('--chunksize', type=int, default=None, help="Convert the dataset in chunks of this many rows without loading it into memory.")
+@click.option('--member', type=str, default=None, help="CSV file in the ZIP archive to convert (default is the first CSV file).")
+@click.option('--extract/--no-extract', default=True, help="Also extract the CSV file next to the archive (default is to extract). The conversion always reads it from the archive.")
+@click.option('--sha256', type=str, default=None, help="Expected SHA-256 hex digest of the ZIP file; the download fails if the content does not match.")
+@click.option('--cache-dir', type=str, default=None, help="Directory of the download cache (default is '.download_cache' inside --write_to).")
+def main(url, write_to, file_format, chunksize, member, extract, sha256, cache_dir):
     """
-    Download and extract a dataset from a ZIP file, then automatically detect and convert binary columns.
+    Download a dataset as a ZIP file, then automatically detect and convert binary columns
+    of the CSV file inside it.
     """
     try:
-        # Step 1: Download and extract the dataset
-        extracted_csv = download_and_extract_zip(url, write_to)
-        print(f"Dataset extracted to {extracted_csv}")
-
-        # Step 2: Convert binary columns
-        converted_file = convert_binary_columns(extracted_csv, write_to)
+        # Step 1: Download the dataset and choose the CSV file in it
+        path_to_zip_file = download_zip(url, write_to, cache_dir=cache_dir, sha256=sha256)
+        member = select_csv_member(path_to_zip_file, member)
+        if extract:
+            with zipfile.ZipFile(path_to_zip_file, 'r') as zip_ref:
+                extracted_csv = zip_ref.extract(member, write_to)
+            print(f"Dataset extracted to {extracted_csv}")
+
+        # Step 2: Convert binary columns, parsing the CSV file straight from the archive
+        converted_file = convert_binary_columns(ZipMember(path_to_zip_file, member), write_to, file_format,
+                                                chunksize=chunksize)
         print(f"Converted dataset saved at {converted_file}")
 
     except Exception as e:
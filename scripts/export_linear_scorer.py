@@ -0,0 +1,69 @@
+# export_linear_scorer.py
+# author: agent
+# date: 2026-10-18
+
+import os
+import pickle
+import sys
+import time
+import click
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.linear_scorer import export_linear_scorer
+
+
+def benchmark(fn, n_repeats):
+    """Return the mean wall time in seconds of calling `fn` `n_repeats` times."""
+    start = time.perf_counter()
+    for _ in range(n_repeats):
+        fn()
+    return (time.perf_counter() - start) / n_repeats
+
+
+@click.command()
+@click.option('--pipeline-from', type=str, help="Path to the fitted pipeline pickle")
+@click.option('--scorer-to', type=str, help="Path of the .npz file the fused scorer will be written to")
+@click.option('--benchmark-data', type=str, default=None, help="Optional CSV used to check parity and benchmark the scorer against the pipeline")
+@click.option('--batch-rows', type=int, default=1_000_000, help="Number of rows in the batched throughput benchmark")
+def main(pipeline_from, scorer_to, benchmark_data, batch_rows):
+    '''Folds the fitted logistic regression pipeline into a single weight vector
+    and bias that can be scored with NumPy alone.'''
+    with open(pipeline_from, 'rb') as f:
+        heart_failure_fit = pickle.load(f)
+
+    output_dir = os.path.dirname(scorer_to)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    scorer = export_linear_scorer(heart_failure_fit, scorer_to)
+    print(f"Linear scorer with {len(scorer.feature_names)} weights saved to {scorer_to}")
+
+    if not benchmark_data:
+        return
+
+    data = pd.read_csv(benchmark_data)
+    X = data[scorer.feature_names].to_numpy(dtype=np.float64)
+
+    # Parity with the original pipeline
+    max_diff = np.max(np.abs(heart_failure_fit.predict_proba(data)[:, 1] - scorer.predict_proba(X)[:, 1]))
+    print(f"Max absolute probability difference vs pipeline: {max_diff:.2e}")
+
+    # Single-row latency
+    row_frame, row_array = data.iloc[[0]], X[0]
+    pipeline_latency = benchmark(lambda: heart_failure_fit.predict_proba(row_frame), 200)
+    scorer_latency = benchmark(lambda: scorer.predict_proba(row_array), 20_000)
+    print(f"Single-row latency: pipeline {pipeline_latency * 1e6:,.1f} us, "
+          f"scorer {scorer_latency * 1e6:,.1f} us ({pipeline_latency / scorer_latency:,.0f}x)")
+
+    # Batched throughput
+    reps = int(np.ceil(batch_rows / len(data)))
+    batch_frame = pd.concat([data] * reps, ignore_index=True).iloc[:batch_rows]
+    batch_array = np.ascontiguousarray(np.tile(X, (reps, 1))[:batch_rows])
+    pipeline_time = benchmark(lambda: heart_failure_fit.predict_proba(batch_frame), 3)
+    scorer_time = benchmark(lambda: scorer.predict_proba(batch_array), 3)
+    print(f"Batched throughput ({batch_rows:,} rows): pipeline {batch_rows / pipeline_time:,.0f} rows/s, "
+          f"scorer {batch_rows / scorer_time:,.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,30 +7,66 @@ import click
 import os
 import pandas as pd
 import numpy as np
-import os
+import sys
 from sklearn import set_config
 from sklearn.metrics import  accuracy_score, precision_score, recall_score, f1_score
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.score_in_chunks import score_in_chunks, scores_from_confusion
+from src.dataset_io import read_dataset
+from src.split_indices import load_split
 
 
 @click.command()
 @click.option('--scaled-test-data', type=str, help="Path to scaled test data")
+@click.option('--base-data', type=str, default=None, help="Path to the shared base dataset (.npy) written by process_and_analyze.py --indices_only; used with --split-indices instead of --scaled-test-data")
+@click.option('--split-indices', type=str, default=None, help="Path to the split indices (.npz) whose test rows are sliced from --base-data")
 @click.option('--pipeline-from', type=str, help="Path to directory where the fit pipeline object lives")
 @click.option('--results-to', type=str, help="Path to directory where the table will be written to")
-
+@click.option('--chunksize', type=int, default=None, help="Score the test data in chunks of this many rows instead of loading it all at once")
+@click.option('--predictions-to', type=str, default=None, help="Path to a CSV file where predictions will be written to (needs --chunksize)")
 @click.option('--seed', type=int, help="Random seed", default=123)
-def main(scaled_test_data, pipeline_from, results_to, seed):
+def main(scaled_test_data, base_data, split_indices, pipeline_from, results_to, chunksize, predictions_to, seed):
     '''Evaluates the health failure classifier on the test data 
     and saves the evaluation results.'''
+    if split_indices and not base_data:
+        raise click.UsageError("--split-indices needs --base-data.")
+    if split_indices and chunksize:
+        raise click.UsageError("--chunksize scores a test data file and cannot be used with --split-indices.")
+    if predictions_to and not chunksize:
+        raise click.UsageError("--predictions-to is only written in chunked mode; use it with --chunksize.")
+
     np.random.seed(seed)
     set_config(transform_output="pandas")
 
-    # read in data & cancer_fit (pipeline object)
-    heart_failure_test = pd.read_csv(scaled_test_data)
     with open(pipeline_from, 'rb') as f:
         heart_failure_fit = pickle.load(f)
 
+    if chunksize:
+        # Streaming mode: keep running confusion-matrix counts over fixed-size chunks
+        cm_crosstab, n_rows, elapsed = score_in_chunks(
+            heart_failure_fit,
+            scaled_test_data,
+            chunksize=chunksize,
+            predictions_to=predictions_to
+        )
+        cm_crosstab.to_csv(os.path.join(results_to, "confusion_matrix.csv"))
+        test_scores = pd.DataFrame({name: [score] for name, score in scores_from_confusion(cm_crosstab).items()})
+        test_scores.to_csv(os.path.join(results_to, "test_scores.csv"), index=False)
+        print(f"Scored {n_rows} rows in {elapsed:.2f}s ({n_rows / max(elapsed, 1e-9):,.0f} rows/s)")
+        return
 
+    # read in data & cancer_fit (pipeline object)
+    if split_indices:
+        _, heart_failure_test = load_split(base_data, split_indices)
+    else:
+        heart_failure_test = read_dataset(scaled_test_data)
+
+    evaluate_model(heart_failure_fit, heart_failure_test, results_to)
 
+
+def evaluate_model(heart_failure_fit, heart_failure_test, results_to):
+    '''Scores the fitted pipeline on the test data and writes the confusion matrix
+    and test scores tables to `results_to`. Returns the test scores.'''
     # Confusion Matrix
     heart_failure_predictions = heart_failure_test.assign(
         predicted=heart_failure_fit.predict(heart_failure_test)
@@ -51,5 +87,7 @@ def main(scaled_test_data, pipeline_from, results_to, seed):
     test_scores = pd.DataFrame({'accuracy': [accuracy], 'precision': [precision], 'recall': [recall], 'f1': [f1]})
     test_scores.to_csv(os.path.join(results_to, "test_scores.csv"), index=False)
 
+    return test_scores
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -15,29 +15,90 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import make_pipeline
+from sklearn.base import clone
 import altair as alt
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.model_fit import model_fit
+from src.tuning_scheduler import tune_models
+from src.execution_backend import execution_backend
+from src.partitioned_fit import partitioned_fit
+from src.dataset_io import read_dataset
+from src.split_indices import load_split
 
 @click.command()
 @click.option('--training-data', type=str, help="Path to training data")
+@click.option('--base-data', type=str, default=None, help="Path to the shared base dataset (.npy) written by process_and_analyze.py --indices_only; used with --split-indices instead of --training-data")
+@click.option('--split-indices', type=str, default=None, help="Path to the split indices (.npz) whose training rows are sliced from --base-data")
 @click.option('--pipeline-to', type=str, help="Path to directory where the final pipeline object will be written to")
 @click.option('--plot-to', type=str, help="Path to directory where the plot will be written to")
 @click.option('--table-to', type=str, help="Path to directory where the table will be written to")
 @click.option('--seed', type=int, help="Random seed", default=522)
-def main(training_data, pipeline_to, plot_to, table_to, seed):
+@click.option('--knn-search', type=click.Choice(['grid', 'halving', 'path']), default='grid', help="Tune KNN with an exhaustive grid search, successive halving or from one neighbour query per fold")
+@click.option('--lr-search', type=click.Choice(['grid', 'halving', 'path']), default='grid', help="Tune Logistic Regression with an exhaustive grid search, successive halving or along a warm-started C path")
+@click.option('--dt-search', type=click.Choice(['cv', 'grid', 'halving', 'path']), default='cv', help="Only cross-validate the Decision Tree, or tune its pruning strength ccp_alpha with an exhaustive grid search, successive halving or from one unpruned tree per fold")
+@click.option('--shared-pool', is_flag=True, help="Run every (model, candidate, fold) fit of the three models in one worker pool, with exhaustive grids")
+@click.option('--n-jobs', type=int, default=-1, help="Number of CPU cores used for tuning; -1 uses all cores")
+@click.option('--cache-dir', type=str, default=None, help="Directory of a persistent fold-score cache, so repeated or interrupted grid searches reuse finished folds (used with --shared-pool and the 'grid' search)")
+@click.option('--partition-column', type=str, default=None, help="Train one Logistic Regression pipeline per value of this column (e.g. a site) in a process pool, instead of the three-model comparison")
+@click.option('--backend', type=str, default=None, help="Where fold fits run: a joblib backend (loky, threading), 'dask' for a local Dask cluster of --n-jobs workers, or a Dask scheduler address such as tcp://host:8786")
+def main(training_data, base_data, split_indices, pipeline_to, plot_to, table_to, seed, knn_search, lr_search, dt_search, shared_pool, n_jobs,
+         cache_dir, backend, partition_column):
     '''Tests three pipelines for heart failure prediction and selects Logistic Regression as the final model.'''
-    
+
+    # Load the dataset
+    if split_indices:
+        if not base_data:
+            raise click.UsageError("--split-indices needs --base-data.")
+        heart_failure_train, _ = load_split(base_data, split_indices)
+    else:
+        heart_failure_train = read_dataset(training_data)
+
+    run_modelling(heart_failure_train, pipeline_to, plot_to, table_to, seed, knn_search, lr_search,
+                  shared_pool, n_jobs, cache_dir, backend, dt_search, partition_column)
+
+
+def run_modelling(heart_failure_train, pipeline_to, plot_to, table_to, seed, knn_search="grid", lr_search="grid",
+                  shared_pool=False, n_jobs=-1, cache_dir=None, backend=None, dt_search="cv",
+                  partition_column=None):
+    """
+    Tune the three candidate models on the training data and save the Logistic Regression outputs.
+
+    Parameters:
+        heart_failure_train (pd.DataFrame): Training dataset including the 'DEATH_EVENT' column.
+        pipeline_to (str): Directory where the final pipeline object will be written to.
+        plot_to (str): Directory where the plot will be written to.
+        table_to (str): Directory where the table will be written to.
+        seed (int): Random seed.
+        knn_search (str): Search strategy for the KNN grid, "grid", "halving" or "path" (see `model_fit`).
+        lr_search (str): Search strategy for the Logistic Regression grid, "grid", "halving" or "path".
+        shared_pool (bool): Cross-validate all three models in one worker pool (see `tune_models`)
+            instead of one after another. The search strategies are then ignored.
+        n_jobs (int): Number of CPU cores used for tuning; -1 uses all cores.
+        cache_dir (str): Optional directory of a persistent fold-score cache, used by the shared
+            pool and by "grid" searches.
+        backend (str): Optional execution backend for the fold fits of the decision tree, the shared
+            pool and the "grid" and "halving" searches (see `src.execution_backend`).
+        dt_search (str): "cv" only cross-validates the Decision Tree; "grid", "halving" or "path"
+            tune its `ccp_alpha` over the pruning path of the full training set (see `model_fit`).
+        partition_column (str): Optional column to partition the data by. One Logistic Regression
+            pipeline per partition is then tuned with `lr_search` on `n_jobs` processes (see
+            `partitioned_fit`) and written to `pipeline_to/<partition>/pipeline.pickle`, with merged
+            `partition_scores.csv` and `partition_coefficients.csv` tables in `table_to`.
+
+    Returns:
+        sklearn.pipeline.Pipeline: The fitted Logistic Regression pipeline, or None with `partition_column`.
+    """
     os.makedirs(pipeline_to, exist_ok=True)
     os.makedirs(plot_to, exist_ok=True)
     os.makedirs(table_to, exist_ok=True)
     np.random.seed(seed)
 
-    # Load the dataset
-    heart_failure_train = pd.read_csv(training_data)
-    
     numeric_columns = ['age', 'creatinine_phosphokinase', 'ejection_fraction', 'platelets', 'serum_creatinine', 'serum_sodium', 'time']
     binary_columns = ['anaemia', 'diabetes', 'high_blood_pressure', 'sex', 'smoking']
+    if partition_column:
+        # The partition column is constant within a partition, so it is not a feature
+        numeric_columns = [column for column in numeric_columns if column != partition_column]
+        binary_columns = [column for column in binary_columns if column != partition_column]
     
     heart_failure_preprocessor = make_column_transformer(
         (StandardScaler(), numeric_columns),
@@ -46,44 +107,116 @@ def main(training_data, pipeline_to, plot_to, table_to, seed):
     )
 
 
-    # ----- Decision Tree Pipeline -----
-    dt_pipeline = make_pipeline(
-        heart_failure_preprocessor, 
-        DecisionTreeClassifier(random_state=seed)
-    )
-    dt_scores = cross_validate(
-        dt_pipeline, 
-        heart_failure_train.drop(columns=['DEATH_EVENT']), 
-        heart_failure_train['DEATH_EVENT'], 
-        return_train_score=True
-    )
-    dt_scores = pd.DataFrame(dt_scores).sort_values('test_score', ascending=False)
+    knn_param_grid = {"kneighborsclassifier__n_neighbors": range(1, 100, 3)}
+    lr_param_grid = {"logisticregression__C": 10.0 ** np.arange(-5, 5, 1)}
 
+    if partition_column:
+        # ----- One Logistic Regression pipeline per partition -----
+        partition_scores, partition_coefficients, schedule = partitioned_fit(
+            heart_failure_train,
+            partition_column,
+            LogisticRegression(random_state=123, max_iter=2000, class_weight="balanced"),
+            heart_failure_preprocessor,
+            lr_param_grid,
+            pipeline_to,
+            search=lr_search,
+            n_jobs=n_jobs
+        )
+        partition_scores.to_csv(os.path.join(table_to, "partition_scores.csv"), index=False)
+        partition_coefficients.to_csv(os.path.join(table_to, "partition_coefficients.csv"), index=False)
+        print(partition_scores.to_string(index=False))
+        print(f"Trained {len(partition_scores)} partitions in {schedule['wall_time']:.1f}s on "
+              f"{schedule['workers']} workers, {schedule['utilisation']:.0%} utilisation.")
+        return None
 
-    # ----- K-Nearest Neighbors Pipeline -----
-    knn_param_grid = {"kneighborsclassifier__n_neighbors": range(1, 100, 3)}
+    if shared_pool:
+        # ----- All three models in one worker pool -----
+        results = tune_models({
+            'decision_tree': {'model': DecisionTreeClassifier(random_state=seed),
+                              'preprocessor': heart_failure_preprocessor, 'grid': None, 'cv': 5},
+            'knn': {'model': KNeighborsClassifier(),
+                    'preprocessor': heart_failure_preprocessor, 'grid': knn_param_grid},
+            'logistic_regression': {'model': LogisticRegression(random_state=123, max_iter=2000, class_weight="balanced"),
+                                    'preprocessor': heart_failure_preprocessor, 'grid': lr_param_grid},
+        }, heart_failure_train, n_jobs=n_jobs, cache_dir=cache_dir, backend=backend)
+        dt_scores = pd.DataFrame(results['decision_tree']).sort_values('test_score', ascending=False)
+        knn_best_model, knn_grid_search = results['knn'].best_estimator_, results['knn']
+        lr_best_model, lr_grid_search = results['logistic_regression'].best_estimator_, results['logistic_regression']
+        schedule = results['_schedule']
+        print(f"Tuned all models in {schedule['wall_time']:.1f}s on {schedule['workers']} workers, "
+              f"{schedule['utilisation']:.0%} utilisation.")
+    else:
+        # ----- Decision Tree Pipeline -----
+        X_train = heart_failure_train.drop(columns=['DEATH_EVENT'])
+        y_train = heart_failure_train['DEATH_EVENT']
+        if dt_search == "cv":
+            dt_pipeline = make_pipeline(
+                heart_failure_preprocessor, 
+                DecisionTreeClassifier(random_state=seed)
+            )
+            with execution_backend(backend, n_jobs, scatter=[X_train, y_train]):
+                dt_scores = cross_validate(
+                    dt_pipeline, 
+                    X_train, 
+                    y_train, 
+                    return_train_score=True,
+                    n_jobs=n_jobs if backend else None
+                )
+            dt_scores = pd.DataFrame(dt_scores).sort_values('test_score', ascending=False)
+        else:
+            # Candidates are the effective alphas of the full training set's pruning path
+            dt_model = DecisionTreeClassifier(random_state=seed)
+            ccp_alphas = dt_model.cost_complexity_pruning_path(
+                clone(heart_failure_preprocessor).fit_transform(X_train), y_train
+            ).ccp_alphas
+            _, dt_grid_search = model_fit(
+                dt_model,
+                heart_failure_preprocessor,
+                {"decisiontreeclassifier__ccp_alpha": ccp_alphas},
+                heart_failure_train,
+                search=dt_search,
+                # The path searches run in this process
+                n_jobs=n_jobs if dt_search != "path" else None,
+                cache_dir=cache_dir if dt_search == "grid" else None,
+                backend=backend if dt_search != "path" else None
+            )
+            dt_scores = final_round_scores(dt_grid_search).sort_values('rank_test_score')
+            print("Best Decision Tree ccp_alpha:", dt_grid_search.best_params_["decisiontreeclassifier__ccp_alpha"],
+                  f"(cross-validation accuracy {dt_grid_search.best_score_:.3f})")
 
-    #--- ABSTRACT FUNCTION ---
-    # Hyperparameter tuning and model fitting 
-    knn_best_model, knn_grid_search = model_fit(
-        KNeighborsClassifier(),
-        heart_failure_preprocessor,
-        knn_param_grid,
-        heart_failure_train
-    )
 
+        # ----- K-Nearest Neighbors Pipeline -----
+
+        #--- ABSTRACT FUNCTION ---
+        # Hyperparameter tuning and model fitting 
+        knn_best_model, knn_grid_search = model_fit(
+            KNeighborsClassifier(),
+            heart_failure_preprocessor,
+            knn_param_grid,
+            heart_failure_train,
+            search=knn_search,
+            # The path searches run in this process
+            n_jobs=n_jobs if knn_search != "path" else None,
+            cache_dir=cache_dir if knn_search == "grid" else None,
+            backend=backend if knn_search != "path" else None
+        )
 
-    # ----- Logistic Regression Pipeline -----
-    lr_param_grid = {"logisticregression__C": 10.0 ** np.arange(-5, 5, 1)}
 
-    #--- ABSTRACT FUNCTION ---
-    # Hyperparameter tuning and model fitting 
-    lr_best_model, lr_grid_search = model_fit(
-    LogisticRegression(random_state=123, max_iter=2000, class_weight="balanced"),
-    heart_failure_preprocessor,
-    lr_param_grid,
-    heart_failure_train
-)
+        # ----- Logistic Regression Pipeline -----
+
+        #--- ABSTRACT FUNCTION ---
+        # Hyperparameter tuning and model fitting 
+        lr_best_model, lr_grid_search = model_fit(
+            LogisticRegression(random_state=123, max_iter=2000, class_weight="balanced"),
+            heart_failure_preprocessor,
+            lr_param_grid,
+            heart_failure_train,
+            search=lr_search,
+            # The path searches run in this process
+            n_jobs=n_jobs if lr_search != "path" else None,
+            cache_dir=cache_dir if lr_search == "grid" else None,
+            backend=backend if lr_search != "path" else None
+        )
 
     print("Best Logistic Regression Model:", lr_best_model)
 
@@ -93,7 +226,7 @@ def main(training_data, pipeline_to, plot_to, table_to, seed):
         pickle.dump(lr_best_model, f)
 
     # ----- Visualizing Logistic Regression Scores -----
-    lr_scores = pd.DataFrame(lr_grid_search.cv_results_).sort_values(
+    lr_scores = final_round_scores(lr_grid_search).sort_values(
     'mean_test_score', ascending=False
 )[['param_logisticregression__C', 'mean_test_score', 'mean_train_score']]
 
@@ -125,5 +258,20 @@ def main(training_data, pipeline_to, plot_to, table_to, seed):
     coefficients.to_csv(os.path.join(table_to, "logistic_regression_coefficients.csv"), index=False)
     print("Logistic Regression Coefficients:", coefficients)
 
+    return lr_best_model
+
+
+def final_round_scores(search):
+    """
+    The cross-validation results of a search as a DataFrame with one row per candidate.
+
+    A successive-halving search scores the surviving candidates again in every
+    round, on more samples, so only the rows of its final round are kept.
+    """
+    scores = pd.DataFrame(search.cv_results_)
+    if 'iter' in scores:
+        scores = scores[scores['iter'] == scores['iter'].max()]
+    return scores
+
 if __name__ == '__main__':
     main()
@@ -13,14 +13,16 @@ from pandera import Check, Column, DataFrameSchema
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.split_data import split_data
+from src.dataset_io import read_dataset
+from src.stream_split_data import stream_split_data
+from src.chunked_validation import validate_in_chunks
 
 
-def validate_data(file_path):
+def heart_failure_schema():
     """
-    Validate the dataset against a predefined schema to ensure data integrity.
+    The pandera schema the heart failure dataset must satisfy.
     """
-    # Define the schema
-    schema = pa.DataFrameSchema(
+    return pa.DataFrameSchema(
         {
             "age": Column(float, Check.between(1, 120), nullable=True),
             "anaemia": Column(bool),
@@ -42,8 +44,35 @@ def validate_data(file_path):
         ]
     )
 
+
+def validate_data(file_path, chunksize=None):
+    """
+    Validate the dataset against a predefined schema to ensure data integrity.
+
+    `file_path` may also be an already loaded DataFrame, which is validated
+    without reading anything from disk.
+
+    With `chunksize`, the dataset is validated in chunks of that many rows
+    by `validate_in_chunks` instead of pandera, without loading it all. Any
+    failures are printed as a report with a count and sample rows per check
+    and a ValueError is raised. Nothing is returned in this mode.
+    """
+    schema = heart_failure_schema()
+
+    if chunksize:
+        report = validate_in_chunks(file_path, schema, chunksize=chunksize, unique_rows=True, no_empty_rows=True)
+        if not report.empty:
+            print(report.to_string(index=False))
+            raise ValueError(f"Dataset validation failed: {len(report)} checks with "
+                             f"{report['failure_count'].sum()} failures.")
+        print("Dataset validation successful!")
+        return None
+
     # Load the dataset
-    heart_failure_data = pd.read_csv(file_path)
+    if isinstance(file_path, pd.DataFrame):
+        heart_failure_data = file_path
+    else:
+        heart_failure_data = read_dataset(file_path)
 
     # Validate the dataset
     schema.validate(heart_failure_data, lazy=True)
@@ -80,16 +109,35 @@ def explore_data(data):
 
 
 @click.command()
-@click.option('--file_path', type=click.Path(exists=True, dir_okay=False), help="Path to the dataset CSV file.")
+@click.option('--file_path', type=click.Path(exists=True, dir_okay=False), help="Path to the dataset CSV, Parquet or Feather file.")
 @click.option('--output_dir', default="../data/processed", help="Directory to save the split datasets.")
-def main(file_path, output_dir):
+@click.option('--file_format', type=click.Choice(["csv", "parquet", "feather"]), default="csv", help="Format of the split datasets (default is 'csv').")
+@click.option('--indices_only', is_flag=True, help="Save only the train/test row indices of the dataset instead of copies of the split data.")
+@click.option('--chunksize', type=int, default=None, help="Validate and split the dataset in chunks of this many rows without loading it into memory (CSV output only).")
+def main(file_path, output_dir, file_format, indices_only, chunksize):
     """
     Validate, analyze, and split a dataset.
     """
+    if chunksize and file_format != "csv":
+        raise click.UsageError("--chunksize writes CSV splits only; it cannot be used with --file_format.")
+    if chunksize and indices_only:
+        raise click.UsageError("--chunksize writes the split data itself; it cannot be used with --indices_only.")
+
     try:
         # Ensure the output directory exists
         os.makedirs(output_dir, exist_ok=True)
 
+        if chunksize:
+            # Out-of-core mode: the dataset is never fully loaded, so it is
+            # validated chunk by chunk and the in-memory EDA step is skipped
+            print("Validating dataset in chunks...")
+            validate_data(file_path, chunksize=chunksize)
+
+            print("Splitting the dataset in chunks...")
+            counts = stream_split_data(file_path, output_dir, train_size=0.8, random_state=522, chunksize=chunksize)
+            print(f"Rows per class: {counts}")
+            return
+
         # Step 1: Validate the dataset
         print("Validating dataset...")
         data = validate_data(file_path)
@@ -100,7 +148,8 @@ def main(file_path, output_dir):
 
         # Step 3: Split the dataset
         print("\nSplitting the dataset...")
-        split_data(data, output_dir, train_size=0.8, random_state=522)
+        split_data(data, output_dir, train_size=0.8, random_state=522, file_format=file_format,
+                   indices_only=indices_only)
 
     except Exception as e:
         print(f"An error occurred: {e}")
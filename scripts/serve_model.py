@@ -0,0 +1,132 @@
+# serve_model.py
+# author: agent
+# date: 2026-10-18
+
+import json
+import os
+import pickle
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import click
+import pandas as pd
+from sklearn import set_config
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.micro_batcher import MicroBatcher
+
+
+def make_server(pipeline, host="127.0.0.1", port=8000, max_batch_size=64, max_wait_ms=5.0):
+    """
+    Create an HTTP scoring server around an already loaded pipeline.
+
+    The server accepts POST requests on `/predict` whose JSON body is either a
+    single patient record (an object), a list of records, or an object with an
+    `instances` list. Concurrent requests are combined into micro-batches
+    before `predict_proba` is called. GET `/stats` returns latency and
+    throughput statistics and GET `/health` can be used as a liveness check.
+
+    Parameters
+    ----------
+    pipeline : sklearn estimator
+        A fitted classifier or pipeline with `predict_proba` and `classes_`.
+    host : str, optional (default="127.0.0.1")
+        Address to bind the server to.
+    port : int, optional (default=8000)
+        Port to listen on. Use 0 to pick a free port.
+    max_batch_size : int, optional (default=64)
+        Maximum number of rows scored in one `predict_proba` call.
+    max_wait_ms : float, optional (default=5.0)
+        Maximum time in milliseconds to wait for a batch to fill up.
+
+    Returns
+    -------
+    http.server.ThreadingHTTPServer
+        The server, with the micro-batcher attached as `server.batcher`.
+    """
+    batcher = MicroBatcher(pipeline.predict_proba, max_batch_size=max_batch_size, max_wait=max_wait_ms / 1000)
+    classes = list(pipeline.classes_)
+
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif self.path == "/stats":
+                self._send_json(200, batcher.stats())
+            else:
+                self._send_json(404, {"error": f"Unknown path '{self.path}'."})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": f"Unknown path '{self.path}'."})
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if isinstance(payload, dict) and "instances" in payload:
+                    payload = payload["instances"]
+                records = pd.DataFrame([payload] if isinstance(payload, dict) else payload)
+                if records.empty:
+                    raise ValueError("The request must contain at least one record.")
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+
+            try:
+                probabilities = batcher.submit(records)
+            except Exception as e:
+                self._send_json(422, {"error": str(e)})
+                return
+
+            predictions = [classes[i] for i in probabilities.argmax(axis=1)]
+            self._send_json(200, {
+                "predictions": [_to_json(p) for p in predictions],
+                "probabilities": probabilities[:, -1].tolist()
+            })
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), ScoringHandler)
+    server.daemon_threads = True
+    server.batcher = batcher
+    return server
+
+
+def _to_json(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+@click.command()
+@click.option('--pipeline-from', type=str, help="Path to the fitted pipeline pickle")
+@click.option('--host', type=str, default="127.0.0.1", help="Address to bind the scoring service to")
+@click.option('--port', type=int, default=8000, help="Port to listen on")
+@click.option('--max-batch-size', type=int, default=64, help="Maximum number of rows per micro-batch")
+@click.option('--max-wait-ms', type=float, default=5.0, help="Maximum time in milliseconds to wait for a micro-batch to fill")
+def main(pipeline_from, host, port, max_batch_size, max_wait_ms):
+    '''Serves the fitted heart failure pipeline over HTTP, loading it once
+    and micro-batching concurrent requests.'''
+    set_config(transform_output="pandas")
+
+    with open(pipeline_from, 'rb') as f:
+        heart_failure_fit = pickle.load(f)
+
+    server = make_server(heart_failure_fit, host, port, max_batch_size, max_wait_ms)
+    print(f"Serving {pipeline_from} on http://{host}:{server.server_address[1]}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+        print("Scoring statistics:", json.dumps(server.batcher.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
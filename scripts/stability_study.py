@@ -0,0 +1,55 @@
+# stability_study.py
+# date: 2026-10-18
+
+import os
+import sys
+import click
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.linear_model import LogisticRegression
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.stability_study import stability_study, stability_summary
+from src.dataset_io import read_dataset
+
+
+@click.command()
+@click.option('--data', type=str, default="data/raw/heart_failure_clinical_records_dataset_converted.csv", help="Path to the full (unsplit) dataset")
+@click.option('--table-to', type=str, help="Path to directory where the tables will be written to")
+@click.option('--n-seeds', type=int, default=100, help="Number of train/test splits to run")
+@click.option('--first-seed', type=int, default=0, help="Seed of the first split; the others follow consecutively")
+@click.option('--search', type=click.Choice(['grid', 'halving', 'path']), default='path', help="Search strategy used to tune Logistic Regression on each split")
+@click.option('--n-jobs', type=int, default=-1, help="Number of splits run at the same time; -1 uses all cores")
+@click.option('--level', type=float, default=0.95, help="Coverage of the summary intervals")
+def main(data, table_to, n_seeds, first_seed, search, n_jobs, level):
+    '''Repeats the split, Logistic Regression tuning and test evaluation for
+    many random seeds and writes the per-seed test scores and their summary.'''
+    heart_failure_data = read_dataset(data)
+
+    numeric_columns = ['age', 'creatinine_phosphokinase', 'ejection_fraction', 'platelets', 'serum_creatinine', 'serum_sodium', 'time']
+    binary_columns = ['anaemia', 'diabetes', 'high_blood_pressure', 'sex', 'smoking']
+    heart_failure_preprocessor = make_column_transformer(
+        (StandardScaler(), numeric_columns),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), binary_columns),
+        remainder='passthrough'
+    )
+    lr_param_grid = {"logisticregression__C": 10.0 ** np.arange(-5, 5, 1)}
+
+    os.makedirs(table_to, exist_ok=True)
+    scores = stability_study(
+        heart_failure_data,
+        heart_failure_preprocessor,
+        LogisticRegression(random_state=123, max_iter=2000, class_weight="balanced"),
+        lr_param_grid,
+        range(first_seed, first_seed + n_seeds),
+        search=search,
+        n_jobs=n_jobs,
+        output_file=os.path.join(table_to, "stability_scores.csv")
+    )
+    summary = stability_summary(scores, level=level)
+    summary.to_csv(os.path.join(table_to, "stability_summary.csv"), index=False)
+    print(summary.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# stream_train.py
+# date: 2026-10-18
+
+import os
+import sys
+import pickle
+import click
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.stream_fit import stream_fit
+
+
+@click.command()
+@click.option('--training-data', type=str, help="Path to training data (CSV, Parquet or Feather)")
+@click.option('--pipeline-to', type=str, help="Path to directory where the final pipeline object will be written to")
+@click.option('--chunksize', type=int, default=100_000, help="Number of rows read at a time")
+@click.option('--epochs', type=int, default=10, help="Number of passes over the training data")
+@click.option('--alpha', type=float, default=1e-4, help="Regularization strength of the linear model")
+@click.option('--seed', type=int, help="Random seed", default=522)
+def main(training_data, pipeline_to, chunksize, epochs, alpha, seed):
+    '''Trains a logistic-loss linear model on training data read in chunks and
+    saves it as pipeline.pickle, for training sets too large to load at once.'''
+    numeric_columns = ['age', 'creatinine_phosphokinase', 'ejection_fraction', 'platelets', 'serum_creatinine', 'serum_sodium', 'time']
+    binary_columns = ['anaemia', 'diabetes', 'high_blood_pressure', 'sex', 'smoking']
+    heart_failure_preprocessor = make_column_transformer(
+        (StandardScaler(), numeric_columns),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), binary_columns),
+        remainder='passthrough'
+    )
+
+    pipeline, stats = stream_fit(training_data, heart_failure_preprocessor, chunksize=chunksize,
+                                 epochs=epochs, random_state=seed, alpha=alpha)
+    peak_rss = _peak_rss_mb()
+    print(f"Trained on {stats['rows']:,} rows x {stats['epochs']} epochs in {stats['seconds']:.1f}s "
+          f"({stats['rows_per_second']:,.0f} rows/s, largest chunk {stats['max_chunk_rows']:,} rows"
+          + (f", peak memory {peak_rss:.0f} MB)." if peak_rss is not None else ")."))
+
+    os.makedirs(pipeline_to, exist_ok=True)
+    with open(os.path.join(pipeline_to, "pipeline.pickle"), 'wb') as f:
+        pickle.dump(pipeline, f)
+
+
+def _peak_rss_mb():
+    """Return this process's peak resident set size in MB from /proc, or None where it is not available."""
+    if not os.path.exists('/proc/self/status'):
+        return None
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+if __name__ == '__main__':
+    main()
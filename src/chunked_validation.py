@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+from src.dataset_io import iter_dataset_chunks
+
+# Vectorized versions of pandera's built-in column checks, keyed by check name.
+# Each returns a boolean mask of the values that pass, given the check's statistics.
+_CHECKS = {
+    'in_range': lambda values, s: (
+        (values >= s['min_value'] if s['include_min'] else values > s['min_value'])
+        & (values <= s['max_value'] if s['include_max'] else values < s['max_value'])
+    ),
+    'greater_than': lambda values, s: values > s['min_value'],
+    'greater_than_or_equal_to': lambda values, s: values >= s['min_value'],
+    'less_than': lambda values, s: values < s['max_value'],
+    'less_than_or_equal_to': lambda values, s: values <= s['max_value'],
+    'equal_to': lambda values, s: values == s['value'],
+    'not_equal_to': lambda values, s: values != s['value'],
+    'isin': lambda values, s: np.isin(values, list(s['allowed_values'])),
+    'notin': lambda values, s: ~np.isin(values, list(s['forbidden_values'])),
+}
+
+REPORT_COLUMNS = ['schema_context', 'column', 'check', 'failure_count', 'sample_index', 'sample_failure_case']
+
+
+class _Failures:
+    """Running failure counts and the first few failing rows of each check, in the order checks first fail."""
+
+    def __init__(self, n_samples):
+        self.n_samples = n_samples
+        self.checks = {}
+
+    def add(self, schema_context, column, check, index, failure_cases):
+        """Record failing rows at positions `index` with values `failure_cases`."""
+        entry = self.checks.setdefault((schema_context, column, check), [0, [], []])
+        entry[0] += len(index)
+        room = self.n_samples - len(entry[1])
+        if room > 0:
+            entry[1].extend(np.asarray(index)[:room].tolist())
+            entry[2].extend(np.asarray(failure_cases, dtype=object)[:room].tolist())
+
+    def add_chunk(self, schema_context, column, check, failure_case):
+        """Record a failure of a whole chunk, which has no row index; distinct failure cases are kept."""
+        entry = self.checks.setdefault((schema_context, column, check), [0, [], []])
+        entry[0] += 1
+        if failure_case not in entry[2] and len(entry[2]) < self.n_samples:
+            entry[1].append(None)
+            entry[2].append(failure_case)
+
+    def report(self):
+        return pd.DataFrame([[*key, count, index, cases] for key, (count, index, cases) in self.checks.items()],
+                            columns=REPORT_COLUMNS)
+
+
+def _chunks(data, chunksize):
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start + chunksize]
+    else:
+        yield from iter_dataset_chunks(data, chunksize)
+
+
+def validate_in_chunks(data, schema, chunksize=100_000, unique_rows=False, no_empty_rows=False, n_samples=5):
+    """
+    Validate a dataset against a pandera `DataFrameSchema` one chunk at a time.
+
+    The column specifications of the schema (presence, dtype, nullability
+    and the built-in checks such as `Check.between`) are turned into
+    vectorized NumPy masks and evaluated chunk by chunk, so only one chunk
+    is in memory at a time. Like pandera's lazy validation every check runs
+    to the end, and the failures are reported together.
+
+    DataFrame-wide checks written as functions cannot be evaluated on a
+    chunk and are not run; the two the project uses are built in instead.
+    Duplicate rows are found across chunks from a 64-bit hash of each row
+    (`pandas.util.hash_pandas_object`), keeping 8 bytes per distinct row
+    rather than the rows themselves. As with `DataFrame.duplicated`, the
+    first occurrence of a row is not a failure.
+
+    Parameters
+    ----------
+    data : str or pandas.DataFrame
+        Path to a CSV, Parquet or Feather dataset, or a loaded DataFrame.
+    schema : pandera.DataFrameSchema
+        The schema to validate against.
+    chunksize : int, optional (default=100_000)
+        Number of rows validated at a time.
+    unique_rows : bool, optional (default=False)
+        Report duplicate rows, as "Duplicate rows found.".
+    no_empty_rows : bool, optional (default=False)
+        Report rows where every value is missing, as "Empty rows found.".
+    n_samples : int, optional (default=5)
+        Number of failing row indices and values kept for each check.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per failed check, with the `schema_context`, `column` and
+        `check` names pandera uses, the `failure_count` (the number of
+        failing values, or of chunks with another dtype for dtype checks),
+        and the positions (`sample_index`) and values (`sample_failure_case`)
+        of the first failures. Empty if the data is valid.
+
+    Raises
+    ------
+    ValueError
+        If the schema has a column check that cannot be vectorized.
+    """
+    for name, column in schema.columns.items():
+        for check in column.checks:
+            if check.name not in _CHECKS:
+                raise ValueError(f"Check '{check.name}' of column '{name}' cannot be vectorized.")
+
+    failures = _Failures(n_samples)
+    seen_hashes = np.empty(0, dtype=np.uint64)
+    offset = 0
+    for chunk in _chunks(data, chunksize):
+        positions = np.arange(offset, offset + len(chunk))
+        first_chunk = offset == 0
+        offset += len(chunk)
+
+        for name, column in schema.columns.items():
+            if name not in chunk.columns:
+                # Every chunk has the same columns, so a missing one is reported once
+                if column.required and first_chunk:
+                    failures.add_chunk('DataFrameSchema', None, 'column_in_dataframe', name)
+                continue
+            series = chunk[name]
+            if column.dtype is not None and str(series.dtype) != str(column.dtype):
+                failures.add_chunk('Column', name, f"dtype('{column.dtype}')", str(series.dtype))
+
+            missing = series.isna().to_numpy()
+            if not column.nullable and missing.any():
+                failures.add('Column', name, 'not_nullable', positions[missing], series.to_numpy()[missing])
+
+            # Like pandera, missing values are not checked against the column's checks
+            values = series.to_numpy()[~missing]
+            for check in column.checks:
+                try:
+                    passed = np.asarray(_CHECKS[check.name](values, check.statistics), dtype=bool)
+                except TypeError:
+                    passed = np.zeros(len(values), dtype=bool)
+                if not passed.all():
+                    failures.add('Column', name, check.error or check.name,
+                                 positions[~missing][~passed], values[~passed])
+
+        if no_empty_rows:
+            empty = chunk.isna().all(axis=1).to_numpy()
+            if empty.any():
+                failures.add('DataFrameSchema', None, 'Empty rows found.', positions[empty], [None] * empty.sum())
+
+        if unique_rows:
+            hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+            duplicated = pd.Series(hashes).duplicated().to_numpy()
+            if len(seen_hashes):
+                found = np.searchsorted(seen_hashes, hashes).clip(max=len(seen_hashes) - 1)
+                duplicated |= seen_hashes[found] == hashes
+            if duplicated.any():
+                failures.add('DataFrameSchema', None, 'Duplicate rows found.', positions[duplicated],
+                             [None] * duplicated.sum())
+            new_hashes = np.unique(hashes[~duplicated])
+            seen_hashes = np.insert(seen_hashes, np.searchsorted(seen_hashes, new_hashes), new_hashes)
+
+    return failures.report()
@@ -0,0 +1,250 @@
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class Stage:
+    """
+    A pipeline stage: a shell command with declared input and output files.
+
+    Parameters
+    ----------
+    name : str
+        Unique name of the stage.
+    command : str
+        Shell command that runs the stage.
+    inputs : list of str, optional
+        Files or directories the stage reads. Stages that produce one of these
+        paths as an output run first.
+    outputs : list of str, optional
+        Files the stage writes.
+    """
+
+    def __init__(self, name, command, inputs=(), outputs=()):
+        self.name = name
+        self.command = command
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+def hash_path(path, block_size=1 << 20):
+    """
+    Return the SHA-256 hex digest of a file's contents, or of every file under a directory.
+
+    A missing path hashes to a fixed marker so that its later creation changes the hash.
+    """
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                digest.update(hash_path(file_path, block_size).encode())
+    elif os.path.exists(path):
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+    else:
+        digest.update(b'<missing>')
+    return digest.hexdigest()
+
+
+def local_imports(path, root=".", packages=("src", "scripts")):
+    """
+    List the repository modules a Python file imports, directly or through other such modules.
+
+    Imports are read from the source with `ast`, without running it, so a
+    stage can declare every module it uses as an input.
+
+    Parameters
+    ----------
+    path : str
+        The Python file, e.g. a pipeline script.
+    root : str, optional (default=".")
+        The directory the `packages` are in.
+    packages : tuple of str, optional (default=("src", "scripts"))
+        Top-level packages whose modules are followed.
+
+    Returns
+    -------
+    list of str
+        Sorted paths, relative to `root`, of the imported modules.
+    """
+    found = set()
+    pending = [path]
+    while pending:
+        with open(pending.pop()) as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            for name in names:
+                parts = name.split(".")
+                module = os.path.join(*parts) + ".py"
+                if parts[0] in packages and len(parts) > 1 and os.path.exists(os.path.join(root, module)) \
+                        and module not in found:
+                    found.add(module)
+                    pending.append(os.path.join(root, module))
+    return sorted(found)
+
+
+def stage_fingerprint(stage):
+    """Hash a stage's command together with the contents of all of its inputs."""
+    digest = hashlib.sha256(stage.command.encode())
+    for path in sorted(stage.inputs):
+        digest.update(path.encode())
+        digest.update(hash_path(path).encode())
+    return digest.hexdigest()
+
+
+def stage_dependencies(stages):
+    """
+    Work out which stages each stage depends on from their inputs and outputs.
+
+    Returns
+    -------
+    dict
+        Mapping of stage name to the set of names of the stages it depends on.
+
+    Raises
+    ------
+    ValueError
+        If stage names or outputs are duplicated, or the stages contain a cycle.
+    """
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Stage names must be unique.")
+
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            output = os.path.normpath(output)
+            if output in producers:
+                raise ValueError(f"Output '{output}' is produced by more than one stage.")
+            producers[output] = stage.name
+
+    dependencies = {
+        stage.name: {producers[os.path.normpath(p)] for p in stage.inputs
+                     if os.path.normpath(p) in producers} - {stage.name}
+        for stage in stages
+    }
+
+    # Check for cycles by repeatedly removing stages without unresolved dependencies
+    remaining = {name: set(deps) for name, deps in dependencies.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"The stages contain a dependency cycle: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    return dependencies
+
+
+def run_stages(stages, state_file=".run_all_state.json", max_workers=None, force=False):
+    """
+    Run stages in dependency order, in parallel where possible, skipping up-to-date stages.
+
+    A stage is skipped when its outputs exist and the hash of its command and
+    input contents matches the one recorded in `state_file` after its last
+    successful run. The state file is updated after every successful stage,
+    so an interrupted run resumes from where it stopped.
+
+    Parameters
+    ----------
+    stages : list of Stage
+        The stages to run.
+    state_file : str, optional (default=".run_all_state.json")
+        JSON file storing the fingerprint of each stage's last successful run.
+    max_workers : int, optional
+        Maximum number of stages run at the same time (default: number of stages).
+    force : bool, optional (default=False)
+        Run every stage even if it is up to date.
+
+    Returns
+    -------
+    list of dict
+        One entry per stage with its `name`, `status` ('ran', 'skipped',
+        'failed' or 'not run') and `seconds` taken, in the order stages finished.
+    """
+    dependencies = stage_dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+
+    state = {}
+    if os.path.exists(state_file):
+        with open(state_file) as f:
+            state = json.load(f)
+
+    def save_state():
+        tmp_file = f"{state_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, state_file)
+
+    def run_stage(stage):
+        start = time.perf_counter()
+        fingerprint = stage_fingerprint(stage)
+        outputs_exist = all(os.path.exists(output) for output in stage.outputs)
+        if not force and outputs_exist and state.get(stage.name) == fingerprint:
+            return 'skipped', fingerprint, time.perf_counter() - start
+
+        print(f"Running stage '{stage.name}'...", flush=True)
+        result = subprocess.run(stage.command, shell=True)
+        status = 'ran' if result.returncode == 0 else 'failed'
+        return status, fingerprint, time.perf_counter() - start
+
+    summary = []
+    done = set()
+    failed = False
+    pending = dict(dependencies)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(stages) or 1) as executor:
+        while pending or running:
+            if not failed:
+                for name in [n for n, deps in pending.items() if deps <= done]:
+                    del pending[name]
+                    running[executor.submit(run_stage, by_name[name])] = name
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                status, fingerprint, seconds = future.result()
+                summary.append({'name': name, 'status': status, 'seconds': seconds})
+                if status == 'failed':
+                    failed = True
+                    print(f"Stage '{name}' failed.", flush=True)
+                    continue
+                if status == 'ran':
+                    state[name] = fingerprint
+                    save_state()
+                done.add(name)
+
+    summary.extend({'name': name, 'status': 'not run', 'seconds': 0.0} for name in pending)
+    return summary
+
+
+def format_summary(summary):
+    """Format the summary returned by `run_stages` as a timing table."""
+    width = max([len('Stage')] + [len(entry['name']) for entry in summary])
+    lines = [f"{'Stage':<{width}}  {'Status':<8}  {'Seconds':>8}"]
+    for entry in summary:
+        lines.append(f"{entry['name']:<{width}}  {entry['status']:<8}  {entry['seconds']:>8.2f}")
+    lines.append(f"{'Sum':<{width}}  {'':<8}  {sum(e['seconds'] for e in summary):>8.2f}")
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import tempfile
+import requests
+
+
+def _load_index(cache_dir):
+    path = os.path.join(cache_dir, "index.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(path, content):
+    """Write `content` as JSON to `path` atomically, so a crash never leaves a half-written file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        json.dump(content, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def download_file(url, cache_dir, sha256=None, chunk_size=1 << 16, verify=True, timeout=60):
+    """
+    Download a file into a local content-addressed cache and return its cached path.
+
+    The response is streamed to disk in chunks of `chunk_size` bytes while
+    its SHA-256 is computed, so the file is never held in memory. Finished
+    files are stored as `<cache_dir>/objects/<sha256>` and recorded in
+    `<cache_dir>/index.json` with the server's `ETag` and `Last-Modified`
+    headers. On later calls the server is asked with `If-None-Match` and
+    `If-Modified-Since` whether the file changed, and a 304 Not Modified
+    answer reuses the cached copy without downloading anything. A transfer
+    that is interrupted leaves a partial file, which the next call resumes
+    with an HTTP `Range` request (guarded by `If-Range`, so a file that
+    changed in the meantime is downloaded again from the start). A partial
+    answer for any other range than the one asked for is discarded and the
+    file is downloaded again with a plain GET.
+
+    Parameters
+    ----------
+    url : str
+        The URL to download.
+    cache_dir : str
+        Directory of the download cache. It is created if it does not exist.
+    sha256 : str, optional
+        Expected SHA-256 hex digest of the file. The download fails if the
+        content, or the cached copy the server reports as unchanged, does not
+        match.
+    chunk_size : int, optional (default=1 << 16)
+        Number of bytes written at a time. An interrupted read loses at most
+        one chunk, so this is also the granularity of resuming.
+    verify : bool, optional (default=True)
+        Verify the server's TLS certificate.
+    timeout : float, optional (default=60)
+        Seconds to wait for the server to respond or send more data.
+
+    Returns
+    -------
+    str
+        Path of the downloaded file in the cache.
+
+    Raises
+    ------
+    ValueError
+        If the URL cannot be downloaded or the content does not match `sha256`.
+    """
+    objects_dir = os.path.join(cache_dir, "objects")
+    partial_dir = os.path.join(cache_dir, "partial")
+    os.makedirs(objects_dir, exist_ok=True)
+    os.makedirs(partial_dir, exist_ok=True)
+
+    index = _load_index(cache_dir)
+    entry = index.get(url)
+    cached_file = os.path.join(objects_dir, entry['sha256']) if entry else None
+    if cached_file and not os.path.exists(cached_file):
+        entry = cached_file = None
+
+    url_key = hashlib.sha256(url.encode()).hexdigest()[:16]
+    partial_file = os.path.join(partial_dir, url_key)
+    partial_meta_file = partial_file + ".json"
+    partial_meta = {}
+    if os.path.exists(partial_file) and os.path.exists(partial_meta_file):
+        with open(partial_meta_file) as f:
+            partial_meta = json.load(f)
+    offset = os.path.getsize(partial_file) if partial_meta else 0
+
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    if offset:
+        headers['Range'] = f"bytes={offset}-"
+        validator = partial_meta.get('etag') or partial_meta.get('last_modified')
+        if validator:
+            headers['If-Range'] = validator
+
+    with requests.get(url, headers=headers, stream=True, verify=verify, timeout=timeout) as response:
+        if response.status_code == 304 and cached_file:
+            if sha256 and entry['sha256'] != sha256.lower():
+                raise ValueError(f"The cached copy of '{url}' has SHA-256 {entry['sha256']}, expected {sha256}.")
+            print(f"'{url}' is unchanged; using the cached copy.")
+            return cached_file
+        if response.status_code not in (200, 206, 416):
+            raise ValueError(f"The URL '{url}' does not exist or is inaccessible.")
+
+        resumed = (response.status_code == 206
+                   and response.headers.get('Content-Range', '').startswith(f"bytes {offset}-"))
+        if response.status_code == 416 or (response.status_code == 206 and not resumed):
+            if not offset:
+                raise ValueError(f"The server sent a range of '{url}' that was not requested.")
+            # The partial file is no longer a prefix of the remote file, or the server
+            # sent another range than the one asked for: start again with a plain GET
+            os.remove(partial_file)
+            os.remove(partial_meta_file)
+            return download_file(url, cache_dir, sha256=sha256, chunk_size=chunk_size, verify=verify, timeout=timeout)
+
+        digest = hashlib.sha256()
+        if resumed:
+            with open(partial_file, 'rb') as f:
+                for block in iter(lambda: f.read(chunk_size), b''):
+                    digest.update(block)
+        else:
+            offset = 0
+        _write_json(partial_meta_file, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        })
+
+        with open(partial_file, 'ab' if resumed else 'wb') as f:
+            for block in response.iter_content(chunk_size=chunk_size):
+                f.write(block)
+                digest.update(block)
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+    content_hash = digest.hexdigest()
+    if sha256 and content_hash != sha256.lower():
+        os.remove(partial_file)
+        os.remove(partial_meta_file)
+        raise ValueError(f"The content of '{url}' has SHA-256 {content_hash}, expected {sha256}.")
+
+    object_file = os.path.join(objects_dir, content_hash)
+    os.replace(partial_file, object_file)
+    os.remove(partial_meta_file)
+    index[url] = {'sha256': content_hash, 'etag': etag, 'last_modified': last_modified}
+    _write_json(os.path.join(cache_dir, "index.json"), index)
+    print(f"Downloaded '{url}'" + (f" (resumed at byte {offset})." if resumed else "."))
+    return object_file
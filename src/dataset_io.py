@@ -0,0 +1,199 @@
+import os
+import zipfile
+from typing import NamedTuple
+import pandas as pd
+
+FILE_FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+
+
+class ZipMember(NamedTuple):
+    """A CSV file inside a ZIP archive, read by `read_dataset` and `iter_dataset_chunks` without extracting it."""
+    archive: str
+    member: str
+
+    def __str__(self):
+        return f"{self.archive}:{self.member}"
+
+
+def zip_members(archive):
+    """
+    List the files in a ZIP archive, in the order of its central directory.
+
+    Parameters
+    ----------
+    archive : str
+        Path to the ZIP file.
+
+    Returns
+    -------
+    list of str
+        The member names, without directory entries.
+    """
+    with zipfile.ZipFile(archive) as zip_ref:
+        return [info.filename for info in zip_ref.infolist() if not info.is_dir()]
+
+
+def dataset_format(path):
+    """
+    Infer the storage format of a dataset from its file extension.
+
+    Parameters
+    ----------
+    path : str or ZipMember
+        Path to the dataset.
+
+    Returns
+    -------
+    str
+        One of 'csv', 'parquet' or 'feather'.
+
+    Raises
+    ------
+    ValueError
+        If the extension is not a supported format.
+    """
+    extension = os.path.splitext(path.member if isinstance(path, ZipMember) else str(path))[1].lower()
+    for file_format, format_extension in FILE_FORMATS.items():
+        if extension == format_extension:
+            return file_format
+    if extension in (".arrow", ".ipc"):
+        return "feather"
+    raise ValueError(f"Unsupported dataset format '{extension}'. Use one of {list(FILE_FORMATS.values())}.")
+
+
+def _open_zip_member(path):
+    """Open a CSV member of a ZIP archive as a binary stream that is decompressed as it is read."""
+    if dataset_format(path) != "csv":
+        raise ValueError(f"Only CSV files can be read from a ZIP archive, not '{path.member}'.")
+    zip_ref = zipfile.ZipFile(path.archive)
+    try:
+        return zip_ref, zip_ref.open(path.member)
+    except KeyError:
+        zip_ref.close()
+        raise ValueError(f"'{path.archive}' has no member '{path.member}'. Members: {zip_members(path.archive)}")
+
+
+def with_format(path, file_format):
+    """Return `path` with its extension replaced by the one for `file_format`."""
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"file_format must be one of {list(FILE_FORMATS)}.")
+    return os.path.splitext(str(path))[0] + FILE_FORMATS[file_format]
+
+
+def read_dataset(path, columns=None):
+    """
+    Read a CSV, Parquet or Feather (Arrow IPC) dataset into a DataFrame.
+
+    Parquet and Feather keep the column dtypes (including booleans) and only
+    read the requested columns from disk. Parquet and Feather need `pyarrow`.
+    A `ZipMember` is parsed from the archive as it is decompressed, without
+    extracting it to disk.
+
+    Parameters
+    ----------
+    path : str or ZipMember
+        Path to the dataset; the format is inferred from the extension.
+    columns : list of str, optional
+        Columns to read. All columns are read if None.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The dataset.
+    """
+    if isinstance(path, ZipMember):
+        zip_ref, source = _open_zip_member(path)
+        with zip_ref, source:
+            return pd.read_csv(source, usecols=columns)
+    file_format = dataset_format(path)
+    if file_format == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    if file_format == "feather":
+        return pd.read_feather(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+def iter_dataset_chunks(path, chunksize, columns=None):
+    """
+    Read a dataset in chunks of at most `chunksize` rows.
+
+    CSV files are parsed incrementally, and Parquet and Feather files are read
+    one row group or record batch at a time, so only one chunk is materialised
+    as a DataFrame at once. A `ZipMember` is decompressed and parsed as it
+    is read, so the archive is neither extracted nor loaded whole.
+
+    Parameters
+    ----------
+    path : str or ZipMember
+        Path to the dataset; the format is inferred from the extension.
+    chunksize : int
+        Maximum number of rows per chunk.
+    columns : list of str, optional
+        Columns to read. All columns are read if None.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Consecutive chunks of the dataset.
+    """
+    if chunksize is None or chunksize < 1:
+        raise ValueError("chunksize must be a positive integer.")
+
+    if isinstance(path, ZipMember):
+        zip_ref, source = _open_zip_member(path)
+        with zip_ref, source, pd.read_csv(source, chunksize=chunksize, usecols=columns) as reader:
+            yield from reader
+        return
+
+    file_format = dataset_format(path)
+    if file_format == "csv":
+        with pd.read_csv(path, chunksize=chunksize, usecols=columns) as reader:
+            yield from reader
+    elif file_format == "parquet":
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        import pyarrow as pa
+        import pyarrow.ipc
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for offset in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(offset, chunksize).to_pandas()
+
+
+def write_dataset(data, path):
+    """
+    Write a DataFrame as CSV, Parquet or Feather depending on the extension of `path`.
+
+    The DataFrame index is not written. Parquet and Feather need `pyarrow`.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The dataset to write.
+    path : str
+        Destination path; its directory must exist.
+
+    Returns
+    -------
+    str
+        The path written to.
+    """
+    file_format = dataset_format(path)
+    if file_format == "parquet":
+        data.to_parquet(path, index=False)
+    elif file_format == "feather":
+        data.reset_index(drop=True).to_feather(path)
+    else:
+        data.to_csv(path, index=False)
+    return path
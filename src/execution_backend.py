@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from joblib import effective_n_jobs, parallel_config
+
+JOBLIB_BACKENDS = ("loky", "threading", "multiprocessing")
+
+
+@contextmanager
+def execution_backend(backend=None, n_jobs=-1, scatter=()):
+    """
+    Run the joblib parallel work inside the block on a chosen execution backend.
+
+    scikit-learn's searches and `cross_validate` dispatch their fold fits
+    through joblib, so they run on whichever backend is active, without
+    other changes.
+
+    Parameters
+    ----------
+    backend : str, optional
+        None for joblib's default process pool; "loky", "threading" or
+        "multiprocessing" for a joblib backend; "dask" to start a Dask
+        cluster of `n_jobs` single-threaded worker processes on localhost
+        for the duration of the block; or the address of a running Dask
+        scheduler ("tcp://host:8786") to send the fits to its workers.
+        Dask needs the optional `dask[distributed]` package.
+    n_jobs : int, optional (default=-1)
+        Number of parallel jobs, and of workers of a local Dask cluster.
+        -1 uses all cores.
+    scatter : sequence, optional
+        Objects passed to every task, such as the training data. On Dask
+        they are sent to the workers once, and each task gets a reference
+        instead of a copy.
+
+    Raises
+    ------
+    ImportError
+        If a Dask backend is requested and `dask.distributed` is not installed.
+    ValueError
+        If the backend is not recognised.
+    """
+    if backend is None:
+        yield
+        return
+    if backend in JOBLIB_BACKENDS:
+        with parallel_config(backend=backend, n_jobs=n_jobs):
+            yield
+        return
+
+    if backend != "dask" and "://" not in backend:
+        raise ValueError(f"Unknown execution backend '{backend}'. Use one of {JOBLIB_BACKENDS}, "
+                         "'dask' or a Dask scheduler address.")
+    try:
+        from dask.distributed import Client, LocalCluster
+    except ImportError as e:
+        raise ImportError("The Dask execution backend needs the 'dask[distributed]' package.") from e
+
+    cluster = None
+    if backend == "dask":
+        cluster = LocalCluster(n_workers=effective_n_jobs(n_jobs), threads_per_worker=1, processes=True,
+                               host="127.0.0.1", dashboard_address=None)
+        client = Client(cluster)
+    else:
+        client = Client(backend)
+    try:
+        with parallel_config(backend="dask", n_jobs=n_jobs, scatter=list(scatter) or None):
+            yield
+    finally:
+        client.close()
+        if cluster is not None:
+            cluster.close()
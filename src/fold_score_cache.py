@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+import sklearn
+
+
+def _config(value):
+    """
+    Describe an estimator or parameter value as JSON-serialisable data.
+
+    Estimators are described by their class and all their constructor
+    parameters, recursively, so two pipelines with the same configuration
+    give the same description regardless of how they were built. numpy
+    scalars are converted to Python ones, so `np.float64(10.0)` and `10.0`
+    describe the same value.
+    """
+    if hasattr(value, 'get_params') and not isinstance(value, type):
+        params = value.get_params(deep=False)
+        return {'class': f"{type(value).__module__}.{type(value).__qualname__}",
+                'params': {name: _config(params[name]) for name in sorted(params)}}
+    if isinstance(value, (list, tuple)):
+        return [_config(item) for item in value]
+    if isinstance(value, dict):
+        return {str(name): _config(value[name]) for name in sorted(value)}
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, np.ndarray):
+        return {'array': value.tolist(), 'dtype': str(value.dtype)}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+class FoldScoreCache:
+    """
+    A content-addressed on-disk store of cross-validation fold results.
+
+    Each entry holds the test score, training score, fit time and score
+    time of one candidate on one fold. It is keyed by a hash of the
+    training data, the full pipeline configuration, the candidate's
+    parameters, the fold's test rows and the scikit-learn version. Each
+    entry is its own small JSON file, written atomically as soon as the fit
+    finishes. An interrupted search therefore keeps every finished cell. A
+    repeated or extended search only computes the cells it has not seen.
+    Parallel workers can write to the same store safely.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the store. It is created if it does not exist.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, data_hash, pipeline, params, test):
+        """Return the hex key of one candidate (`params` set on `pipeline`) on the fold with `test` rows."""
+        description = json.dumps({
+            'data': data_hash,
+            'pipeline': _config(pipeline),
+            'params': _config(params),
+            'test_rows': hashlib.sha256(np.asarray(test, dtype=np.int64).tobytes()).hexdigest(),
+            'sklearn': sklearn.__version__,
+        }, sort_keys=True)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def _path(self, key):
+        # Two-character subdirectories keep the number of files per directory small
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Return the stored result dict for `key`, or None if there is none (or it is unreadable)."""
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, result):
+        """Store the result dict for `key`, replacing any previous entry."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and rename it, so readers never see half an entry
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def __len__(self):
+        return sum(name.endswith(".json") for _, _, names in os.walk(self.directory) for name in names)
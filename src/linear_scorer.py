@@ -0,0 +1,175 @@
+import numpy as np
+
+
+class LinearScorer:
+    """
+    A logistic regression scorer folded into a single weight vector and bias.
+
+    Only NumPy is needed to load and use a scorer, so it can be used where
+    sklearn and pandas are not available. Inputs are float arrays whose
+    columns follow `feature_names`; binary columns are given as 0/1.
+
+    Parameters
+    ----------
+    feature_names : array-like of str
+        Names of the input columns, in the order expected by the scorer.
+    coef : numpy.ndarray
+        One weight per input column.
+    intercept : float
+        The bias term.
+    classes : numpy.ndarray
+        The two class labels, negative class first.
+    """
+
+    def __init__(self, feature_names, coef, intercept, classes):
+        self.feature_names = [str(name) for name in feature_names]
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.classes = np.asarray(classes)
+
+    def decision_function(self, X):
+        """Return the log-odds of the positive class for each row of `X`."""
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+    def predict_proba(self, X):
+        """Return the probabilities of the negative and positive class for each row of `X`."""
+        p = 1 / (1 + np.exp(-self.decision_function(X)))
+        return np.stack([1 - p, p], axis=-1)
+
+    def predict(self, X):
+        """Return the predicted class label for each row of `X`."""
+        return self.classes[(self.decision_function(X) > 0).astype(int)]
+
+    def save(self, path):
+        """Save the scorer as a NumPy `.npz` file."""
+        classes = self.classes.astype(str) if self.classes.dtype == object else self.classes
+        np.savez(path, feature_names=np.array(self.feature_names, dtype=str), coef=self.coef,
+                 intercept=np.float64(self.intercept), classes=classes)
+
+
+def load_linear_scorer(path):
+    """
+    Load a scorer saved by `export_linear_scorer`.
+
+    Parameters
+    ----------
+    path : str
+        Path to the `.npz` artifact.
+
+    Returns
+    -------
+    LinearScorer
+        The loaded scorer.
+    """
+    with np.load(path, allow_pickle=False) as artifact:
+        return LinearScorer(artifact['feature_names'], artifact['coef'],
+                            artifact['intercept'], artifact['classes'])
+
+
+def export_linear_scorer(pipeline, output_file=None):
+    """
+    Fold a fitted preprocessing + logistic regression pipeline into a `LinearScorer`.
+
+    The pipeline must have two steps: a ColumnTransformer whose transformers are
+    StandardScaler, OneHotEncoder (on columns with at most two categories),
+    'passthrough' or 'drop', followed by a binary linear classifier with
+    `coef_` and `intercept_`. The scaler means and scales and the encoder
+    mapping are folded into the classifier weights, so the scorer needs one
+    matrix-vector product per batch.
+
+    One-hot columns are only linear in their input while the input takes one
+    of the categories seen during fit, so unseen categories (which the
+    pipeline ignores via `handle_unknown="ignore"`) are not reproduced.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline
+        The fitted pipeline, e.g. the one saved by `scripts/modelling.py`.
+    output_file : str, optional
+        If given, the scorer is also saved to this `.npz` file.
+
+    Returns
+    -------
+    LinearScorer
+        The fused scorer.
+
+    Raises
+    ------
+    ValueError
+        If the pipeline cannot be expressed as a single linear function of its inputs.
+    """
+    if len(pipeline.steps) != 2:
+        raise ValueError("The pipeline must consist of a ColumnTransformer followed by a linear classifier.")
+    column_transformer = pipeline.steps[0][1]
+    classifier = pipeline.steps[-1][1]
+
+    if not hasattr(classifier, "coef_") or classifier.coef_.shape[0] != 1:
+        raise ValueError("The final step must be a fitted binary linear classifier.")
+    if not hasattr(column_transformer, "output_indices_"):
+        raise ValueError("The first step must be a fitted ColumnTransformer.")
+
+    feature_names = list(column_transformer.feature_names_in_)
+    position = {name: i for i, name in enumerate(feature_names)}
+    output_coef = classifier.coef_[0]
+    coef = np.zeros(len(feature_names))
+    intercept = float(classifier.intercept_[0])
+
+    for name, transformer in column_transformer.named_transformers_.items():
+        output_slice = column_transformer.output_indices_[name]
+        if isinstance(transformer, str) or output_slice.start == output_slice.stop:
+            continue
+        indices = [position[c] for c in transformer.feature_names_in_]
+        offset = output_slice.start
+
+        if _is_passthrough(transformer):
+            coef[indices] += output_coef[offset:offset + len(indices)]
+
+        elif type(transformer).__name__ == 'StandardScaler':
+            w = output_coef[offset:offset + len(indices)]
+            mean = transformer.mean_ if transformer.mean_ is not None else np.zeros(len(indices))
+            scale = transformer.scale_ if transformer.scale_ is not None else np.ones(len(indices))
+            coef[indices] += w / scale
+            intercept -= float(np.sum(w * mean / scale))
+
+        elif type(transformer).__name__ == 'OneHotEncoder':
+            drop_idx = transformer.drop_idx_ if transformer.drop_idx_ is not None else [None] * len(indices)
+            for index, categories, dropped in zip(indices, transformer.categories_, drop_idx):
+                kept = [i for i in range(len(categories)) if dropped is None or i != dropped]
+                values = np.asarray(categories, dtype=np.float64)
+                if len(categories) == 1:
+                    # drop='if_binary' keeps the single category as a constant indicator (drop_idx_ is
+                    # None), assuming the input always takes the seen value; drop='first' drops it and
+                    # outputs no column, so there is no weight to fold
+                    if kept:
+                        intercept += float(output_coef[offset])
+                elif len(categories) == 2:
+                    # On {c0, c1}: 1[x == c1] = (x - c0) / (c1 - c0) and 1[x == c0] = (c1 - x) / (c1 - c0)
+                    c0, c1 = values
+                    for k, i in enumerate(kept):
+                        w = output_coef[offset + k]
+                        if i == 1:
+                            coef[index] += w / (c1 - c0)
+                            intercept -= w * c0 / (c1 - c0)
+                        else:
+                            coef[index] -= w / (c1 - c0)
+                            intercept += w * c1 / (c1 - c0)
+                else:
+                    raise ValueError(f"Column '{feature_names[index]}' has more than two categories "
+                                     "and cannot be folded into a linear scorer.")
+                offset += len(kept)
+
+        else:
+            raise ValueError(f"Transformer '{name}' ({type(transformer).__name__}) is not supported.")
+
+    if max(s.stop for s in column_transformer.output_indices_.values()) != len(output_coef):
+        raise ValueError("The classifier coefficients do not match the transformed features.")
+
+    scorer = LinearScorer(feature_names, coef, intercept, classifier.classes_)
+    if output_file:
+        scorer.save(output_file)
+    return scorer
+
+
+def _is_passthrough(transformer):
+    # Fitted ColumnTransformers store 'passthrough' columns as an identity FunctionTransformer
+    return type(transformer).__name__ == 'FunctionTransformer' and transformer.func is None
@@ -0,0 +1,178 @@
+from collections import deque
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Combine concurrent scoring requests into micro-batches.
+
+    Requests submitted from many threads are queued and scored together by a
+    single worker thread, which waits at most `max_wait` seconds for a batch
+    to fill up to `max_batch_size` rows before calling `predict_fn` once for
+    the whole batch.
+
+    Parameters
+    ----------
+    predict_fn : callable
+        Function taking a pandas DataFrame and returning an array with one row
+        of results per input row (e.g. `pipeline.predict_proba`).
+    max_batch_size : int, optional (default=64)
+        Maximum number of rows scored in one call to `predict_fn`. A single
+        request larger than this is scored on its own.
+    max_wait : float, optional (default=0.005)
+        Maximum time in seconds to wait for more requests once the first
+        request of a batch has arrived.
+    latency_window : int, optional (default=10_000)
+        Number of most recent request latencies kept for `stats`, so memory
+        stays bounded in a long-running service.
+
+    Raises
+    ------
+    ValueError
+        If `max_batch_size` is not positive or `max_wait` is negative.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait=0.005, latency_window=10_000):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+        if max_wait < 0:
+            raise ValueError("max_wait must be non-negative.")
+
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._n_requests = 0
+        self._n_rows = 0
+        self._n_batches = 0
+        self._started = time.perf_counter()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, records):
+        """
+        Score a DataFrame of records, blocking until its batch has been scored.
+
+        Parameters
+        ----------
+        records : pandas.DataFrame
+            One or more rows to score.
+
+        Returns
+        -------
+        numpy.ndarray
+            The rows of `predict_fn` output corresponding to `records`.
+        """
+        start = time.perf_counter()
+        request = {'records': records, 'done': threading.Event(), 'result': None, 'error': None}
+        # Checked and queued under the lock, so no request can be queued behind the stop marker
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher has been closed.")
+            self._queue.put(request)
+        request['done'].wait()
+
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+            self._n_requests += 1
+
+        if request['error'] is not None:
+            raise request['error']
+        return request['result']
+
+    def stats(self):
+        """
+        Summarise request latency and throughput since the batcher started.
+
+        Returns
+        -------
+        dict
+            Number of requests, rows and batches, p50 and p99 latency in
+            milliseconds over the last `latency_window` requests and
+            throughput in rows per second.
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            n_requests = self._n_requests
+            n_rows = self._n_rows
+            n_batches = self._n_batches
+        elapsed = time.perf_counter() - self._started
+
+        return {
+            'requests': n_requests,
+            'rows': n_rows,
+            'batches': n_batches,
+            'p50_latency_ms': float(np.percentile(latencies, 50) * 1000) if len(latencies) else None,
+            'p99_latency_ms': float(np.percentile(latencies, 99) * 1000) if len(latencies) else None,
+            'throughput_rows_per_s': n_rows / elapsed if elapsed > 0 else 0.0
+        }
+
+    def close(self):
+        """Stop the worker thread once the queued requests have been scored."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        self._worker.join()
+
+    def _run(self):
+        pending = None
+        while True:
+            first = pending if pending is not None else self._queue.get()
+            pending = None
+            if first is _STOP:
+                return
+
+            batch = [first]
+            n_rows = len(first['records'])
+            deadline = time.perf_counter() + self.max_wait
+            while n_rows < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    if remaining > 0:
+                        request = self._queue.get(timeout=remaining)
+                    else:
+                        request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is _STOP or n_rows + len(request['records']) > self.max_batch_size:
+                    # Leave it for the next batch (or shut down after this one)
+                    pending = request
+                    break
+                batch.append(request)
+                n_rows += len(request['records'])
+
+            self._score(batch)
+
+    def _score(self, batch):
+        try:
+            results = np.asarray(self.predict_fn(pd.concat([r['records'] for r in batch], ignore_index=True)))
+        except Exception as error:
+            if len(batch) > 1:
+                # Score requests one by one so a bad payload only fails its own request
+                for request in batch:
+                    self._score([request])
+                return
+            batch[0]['error'] = error
+        else:
+            offset = 0
+            for request in batch:
+                n = len(request['records'])
+                request['result'] = results[offset:offset + n]
+                offset += n
+            with self._lock:
+                self._n_rows += offset
+                self._n_batches += 1
+
+        for request in batch:
+            request['done'].set()
@@ -1,7 +1,23 @@
-from sklearn.model_selection import cross_validate, GridSearchCV
+import os
+import shutil
+import tempfile
+import time
+from joblib import Memory
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import cross_validate, check_cv, GridSearchCV, HalvingGridSearchCV
+from sklearn.base import clone
 from sklearn.pipeline import make_pipeline
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from src.path_search import knn_path_search, lr_path_search, tree_path_search
+from src.shared_design_matrix import shared_design_matrix
+from src.tuning_scheduler import tune_models
+from src.execution_backend import execution_backend, JOBLIB_BACKENDS
 
-def model_fit(model, preprocessor, grid, heart_failure_train):
+def model_fit(model, preprocessor, grid, heart_failure_train, cache_transformers=True, search="grid",
+              halving_factor=3, min_resources="exhaust", shared_data=False, n_jobs=None,
+              cache_dir=None, backend=None):
     """
     Create a pipeline, tune hyperparameters using GridSearchCV with 10-fold cross-validation,
     and return the best-fitted model.
@@ -16,11 +32,64 @@ def model_fit(model, preprocessor, grid, heart_failure_train):
         Hyperparameter grid for tuning (e.g., {"logisticregression__C": [0.1, 1, 10]}).
     heart_failure_train : pandas DataFrame
         The training dataset including the target column 'DEATH_EVENT'.
+    cache_transformers : bool, optional (default=True)
+        Cache the fitted preprocessor for each fold in a temporary directory, so it
+        is fitted once per fold (plus once for the final refit) instead of once per
+        candidate and fold. The cache holds one entry per fold, is shared by the
+        parallel workers and is deleted before returning.
+    search : {"grid", "halving", "path"}, optional (default="grid")
+        "grid" runs an exhaustive GridSearchCV. "halving" runs a successive-halving
+        search (HalvingGridSearchCV): every candidate is first scored on a small
+        sample of the training data and only the best `1 / halving_factor` of
+        them go on to the next round, which uses `halving_factor` times more
+        samples. "path" evaluates the whole grid
+        from one fit per fold where the model supports it: a KNN `n_neighbors`
+        grid is scored from a single neighbour query per fold, a logistic
+        regression `C` grid is fitted along a warm-started regularization path
+        and a decision tree `ccp_alpha` grid is scored from one unpruned tree
+        per fold (see `src.path_search`). Other models raise a ValueError.
+    halving_factor : int, optional (default=3)
+        Proportion of candidates kept, and growth of the number of samples,
+        between successive-halving rounds. Only used with search="halving".
+    min_resources : int or {"exhaust", "smallest"}, optional (default="exhaust")
+        Number of training samples each candidate gets in the first
+        successive-halving round. "exhaust" picks it so that the last round
+        uses all the training data. Only used with search="halving".
+    shared_data : bool, optional (default=False)
+        Write the training features once into a float64 memory-mapped file
+        (see `src.shared_design_matrix`) that the parallel workers open and
+        slice by row index, instead of each receiving a copy of the
+        DataFrame. The preprocessor is fitted once per fold before the
+        search and reused by every candidate, so `grid` may not tune the
+        preprocessor, and the best pipeline is refitted on the DataFrame, so
+        it accepts DataFrames as before. Only used with search="grid".
+    n_jobs : int, optional
+        Number of parallel workers for the grid and halving searches; None
+        uses all cores. The path searches run in this process, so they only
+        accept None or 1.
+    cache_dir : str, optional
+        Directory of a persistent fold-score store (see `src.fold_score_cache`).
+        The grid search then stores every (candidate, fold) result as soon as
+        it is computed and reuses the results already stored for the same
+        data, preprocessor and parameters, so an interrupted search resumes
+        where it stopped and adding values to the grid only computes the new
+        ones. Only used with search="grid"; `cache_transformers` and
+        `shared_data` do not apply.
+    backend : str, optional
+        Where the grid and halving searches run their fold fits (see
+        `src.execution_backend`): None for the local joblib pool, another
+        joblib backend, "dask" for a local Dask cluster of `n_jobs` workers,
+        or the address of a Dask scheduler. The training data is sent to
+        Dask workers once rather than with every fit. On Dask the
+        preprocessor is not cached, since the workers may not share a disk,
+        and `shared_data` cannot be used.
 
     Returns
     -------
     sklearn.pipeline.Pipeline
         A fitted pipeline with the best hyperparameters and the input model.
+    GridSearchCV or PathSearchResult
+        The search object, exposing `cv_results_` and `best_params_`.
     """
     # Input Checks
     if model is None or not hasattr(model, "fit"):
@@ -32,22 +101,121 @@ def model_fit(model, preprocessor, grid, heart_failure_train):
     if 'DEATH_EVENT' not in heart_failure_train.columns:
         raise KeyError("'DEATH_EVENT' column is missing in the input data.")
 
+    if cache_dir and search != "grid":
+        raise ValueError("cache_dir can only be used with search='grid'.")
 
-    pipeline = make_pipeline(
-        preprocessor, 
-        model
-    )
-
-    grid_search = GridSearchCV(
-         pipeline,
-         grid,
-         cv=10,
-         n_jobs=-1,
-         return_train_score=True
-         )
-    grid_search.fit(
-         heart_failure_train.drop(columns=['DEATH_EVENT']), 
-         heart_failure_train['DEATH_EVENT']
-         )
-     
-    return grid_search.best_estimator_, grid_search
\ No newline at end of file
+    if shared_data and search == "halving":
+        raise ValueError("shared_data can only be used with search='grid'.")
+
+    on_cluster = backend is not None and backend not in JOBLIB_BACKENDS
+    if on_cluster and shared_data:
+        raise ValueError("shared_data cannot be used with a Dask backend.")
+
+    if search == "path":
+        if shared_data:
+            raise ValueError("shared_data can only be used with search='grid'.")
+        if backend is not None:
+            raise ValueError("search='path' runs in this process and cannot be used with a backend.")
+        if n_jobs not in (None, 1):
+            raise ValueError("search='path' runs in this process, so n_jobs must be None or 1.")
+        if isinstance(model, LogisticRegression):
+            path_search = lr_path_search(model, preprocessor, grid, heart_failure_train)
+        elif isinstance(model, DecisionTreeClassifier):
+            path_search = tree_path_search(model, preprocessor, grid, heart_failure_train)
+        elif isinstance(model, KNeighborsClassifier):
+            path_search = knn_path_search(model, preprocessor, grid, heart_failure_train)
+        else:
+            raise ValueError("search='path' supports KNeighborsClassifier, LogisticRegression and "
+                             f"DecisionTreeClassifier, not {type(model).__name__}.")
+        return path_search.best_estimator_, path_search
+    if search not in ("grid", "halving"):
+        raise ValueError("search must be 'grid', 'halving' or 'path'.")
+    if n_jobs is None:
+        n_jobs = -1
+
+    if cache_dir:
+        name = type(model).__name__.lower()
+        results = tune_models({name: {'model': model, 'preprocessor': preprocessor, 'grid': grid}},
+                              heart_failure_train, n_jobs=n_jobs, cache_dir=cache_dir, backend=backend)
+        schedule = results['_schedule']
+        print(f"Fold scores: {schedule['reused']} reused from {cache_dir}, {schedule['computed']} computed.")
+        return results[name].best_estimator_, results[name]
+
+    X = heart_failure_train.drop(columns=['DEATH_EVENT'])
+    y = heart_failure_train['DEATH_EVENT']
+    # With shared data the preprocessor is fitted once per fold outside the search, so there is nothing to cache
+    transformer_cache_dir = (tempfile.mkdtemp(prefix="model_fit_cache_")
+                             if cache_transformers and not on_cluster and not shared_data else None)
+    data_dir = tempfile.mkdtemp(prefix="model_fit_data_") if shared_data else None
+    try:
+        search_X, search_y, cv = X, y, 10
+        if data_dir:
+            cv = list(check_cv(10, y, classifier=True).split(X, y))
+            search_X, fold_preprocessor = shared_design_matrix(preprocessor, X, cv,
+                                                               os.path.join(data_dir, "design_matrix.npy"))
+            pipeline = make_pipeline(fold_preprocessor, model)
+        else:
+            pipeline = make_pipeline(
+                preprocessor, 
+                model,
+                memory=Memory(transformer_cache_dir, verbose=0) if transformer_cache_dir else None
+            )
+
+        if search == "halving":
+            grid_search = HalvingGridSearchCV(
+                 pipeline,
+                 grid,
+                 factor=halving_factor,
+                 min_resources=min_resources,
+                 cv=cv,
+                 n_jobs=n_jobs,
+                 refit=not shared_data,
+                 return_train_score=True
+                 )
+        else:
+            grid_search = GridSearchCV(
+                 pipeline,
+                 grid,
+                 cv=cv,
+                 n_jobs=n_jobs,
+                 refit=not shared_data,
+                 return_train_score=True
+                 )
+        with execution_backend(backend, n_jobs, scatter=[search_X, search_y]):
+            grid_search.fit(search_X, search_y)
+
+        if data_dir:
+            # Refit on the DataFrame, so the returned pipeline selects columns by name
+            start = time.perf_counter()
+            grid_search.best_estimator_ = make_pipeline(clone(preprocessor), clone(model))
+            grid_search.best_estimator_.set_params(**grid_search.best_params_).fit(X, y)
+            grid_search.refit_time_ = time.perf_counter() - start
+
+        # One row of cv_results_ per candidate evaluated (per round, when halving)
+        grid_search.n_fits_ = len(grid_search.cv_results_['params']) * grid_search.n_splits_
+        if search == "halving":
+            print(f"Successive halving: {grid_search.n_candidates_} candidates per round on "
+                  f"{grid_search.n_resources_} samples, {grid_search.n_fits_} fits.")
+
+        if transformer_cache_dir:
+            # Every candidate and fold, plus the refit, would otherwise fit the preprocessor
+            n_requested = grid_search.n_fits_ + 1
+            n_fitted = _count_cached_fits(transformer_cache_dir)
+            grid_search.n_transformer_fits_saved_ = n_requested - n_fitted
+            print(f"Transformer fits: {n_fitted} performed, {n_requested - n_fitted} saved by caching.")
+            # Don't keep a reference to the deleted cache in the returned pipeline
+            grid_search.best_estimator_.set_params(memory=None)
+    finally:
+        for temp_dir in (transformer_cache_dir, data_dir):
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return grid_search.best_estimator_, grid_search
+
+
+def _count_cached_fits(cache_dir):
+    """Count the distinct transformer fits stored in a Pipeline memory cache."""
+    for root, dirs, _ in os.walk(cache_dir):
+        if os.path.basename(root) == "_fit_transform_one":
+            return len(dirs)
+    return 0
\ No newline at end of file
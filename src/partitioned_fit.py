@@ -0,0 +1,157 @@
+import heapq
+import os
+import pickle
+import time
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from src.model_fit import model_fit
+
+
+def pack_partitions(sizes, n_workers):
+    """
+    Pack partitions onto workers so the largest total load is small.
+
+    Uses the longest-processing-time-first rule: partitions are taken from
+    the largest to the smallest and each goes to the worker with the least
+    load so far. Small partitions therefore fill the gaps left by large
+    ones instead of each occupying a worker on their own.
+
+    Parameters
+    ----------
+    sizes : dict
+        Maps a partition name to its estimated cost, such as its number of rows.
+    n_workers : int
+        Number of workers.
+
+    Returns
+    -------
+    list of list
+        The partition names given to each worker that received any.
+    """
+    loads = [(0, worker) for worker in range(n_workers)]
+    bins = [[] for _ in range(n_workers)]
+    for name in sorted(sizes, key=lambda name: sizes[name], reverse=True):
+        load, worker = heapq.heappop(loads)
+        bins[worker].append(name)
+        heapq.heappush(loads, (load + sizes[name], worker))
+    return [names for names in bins if names]
+
+
+def _fit_partitions(partitions, model, preprocessor, grid, search, pipeline_dir):
+    """Tune and save the pipeline of each partition given to one worker; return their score and coefficient rows."""
+    scores, coefficients = [], []
+    for name, heart_failure_train in partitions:
+        start = time.perf_counter()
+        best_model, search_result = model_fit(model, preprocessor, grid, heart_failure_train, search=search, n_jobs=1)
+        fit_time = time.perf_counter() - start
+
+        partition_dir = os.path.join(pipeline_dir, str(name).replace(os.sep, "_"))
+        os.makedirs(partition_dir, exist_ok=True)
+        with open(os.path.join(partition_dir, "pipeline.pickle"), 'wb') as f:
+            pickle.dump(best_model, f)
+
+        row = {'partition': name, 'n_rows': len(heart_failure_train), 'worker': os.getpid()}
+        row.update({f"best_{param.split('__')[-1]}": value for param, value in search_result.best_params_.items()})
+        row['cv_score'] = search_result.best_score_
+        row['fit_time'] = fit_time
+        scores.append(row)
+
+        estimator = best_model[-1]
+        if hasattr(estimator, 'coef_'):
+            coefficients.append(pd.DataFrame({
+                'partition': name,
+                'Feature': best_model[:-1].get_feature_names_out(),
+                'Coefficient': estimator.coef_[0],
+                'Absolute_Coefficient': abs(estimator.coef_[0])
+            }))
+    return scores, coefficients
+
+
+def partitioned_fit(data, partition_column, model, preprocessor, grid, pipeline_dir, search="path", n_jobs=-1,
+                    cv=10):
+    """
+    Train one pipeline per partition of a dataset in a process pool.
+
+    The rows are grouped by `partition_column` (for example the site a
+    cohort comes from) and each group is tuned with `model_fit` without that
+    column. Partitions are packed onto the `n_jobs` workers by their number
+    of rows with `pack_partitions`, and each worker trains its partitions
+    one after another, so the interpreter start-up and imports are paid
+    once per worker rather than once per partition.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The dataset, including the `DEATH_EVENT` column and `partition_column`.
+    partition_column : str
+        The column whose values define the partitions.
+    model : sklearn estimator
+        The model to tune for every partition.
+    preprocessor : sklearn ColumnTransformer
+        The (unfitted) preprocessing pipeline. It must not use `partition_column`.
+    grid : dict
+        Hyperparameter grid for `model_fit`.
+    pipeline_dir : str
+        Directory where each partition's pipeline is written to, as
+        `<pipeline_dir>/<partition>/pipeline.pickle`.
+    search : str, optional (default="path")
+        Search strategy passed to `model_fit`.
+    n_jobs : int, optional (default=-1)
+        Number of worker processes. -1 uses all cores.
+    cv : int, optional (default=10)
+        Number of cross-validation folds `model_fit` uses, to check each
+        partition has enough rows of each class.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per partition: `n_rows`, the `worker` process id, the best
+        hyperparameters, the cross-validation score and the `fit_time`.
+    pandas.DataFrame
+        The coefficients of every partition's model, when the model has
+        `coef_`, in the layout of `logistic_regression_coefficients.csv`
+        with a `partition` column.
+    dict
+        The total `wall_time`, the `busy_time` summed over partitions, the
+        number of `workers` used and their `utilisation`.
+
+    Raises
+    ------
+    ValueError
+        If a column is missing or a partition has fewer than `cv` rows of a class.
+    """
+    for column in (partition_column, 'DEATH_EVENT'):
+        if column not in data.columns:
+            raise ValueError(f"The input data must contain the '{column}' column.")
+
+    partitions = {name: group.drop(columns=[partition_column])
+                  for name, group in data.groupby(partition_column, sort=True)}
+    too_small = [name for name, group in partitions.items()
+                 if group['DEATH_EVENT'].nunique() < 2 or group['DEATH_EVENT'].value_counts().min() < cv]
+    if too_small:
+        raise ValueError(f"Partitions {too_small} have fewer than {cv} rows of a class for {cv}-fold cross-validation.")
+
+    workers = min(effective_n_jobs(n_jobs), len(partitions))
+    bins = pack_partitions({name: len(group) for name, group in partitions.items()}, workers)
+
+    start = time.perf_counter()
+    # One task per worker, holding only that worker's partitions
+    outcomes = Parallel(n_jobs=workers)(
+        delayed(_fit_partitions)([(name, partitions[name]) for name in names], model, preprocessor, grid,
+                                 search, pipeline_dir)
+        for names in bins
+    )
+    wall_time = time.perf_counter() - start
+
+    scores = pd.DataFrame([row for rows, _ in outcomes for row in rows]).sort_values('partition', ignore_index=True)
+    frames = [frame for _, frames in outcomes for frame in frames]
+    coefficients = (pd.concat(frames).sort_values('partition', kind='stable', ignore_index=True)
+                    if frames else pd.DataFrame())
+    busy_time = float(scores['fit_time'].sum())
+    schedule = {
+        'wall_time': wall_time,
+        'busy_time': busy_time,
+        'workers': workers,
+        'utilisation': busy_time / (wall_time * workers),
+    }
+    return scores, coefficients, schedule
@@ -0,0 +1,451 @@
+import time
+import numpy as np
+from scipy.stats import rankdata
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.pipeline import make_pipeline
+
+
+class PathSearchResult:
+    """
+    The outcome of a path-based hyperparameter search.
+
+    Exposes the attributes of a fitted `GridSearchCV` that the modelling
+    scripts use: `cv_results_`, `best_params_`, `best_score_`, `best_index_`,
+    `best_estimator_`, `n_splits_`, `n_fits_` and `refit_time_`.
+    """
+
+    def __init__(self, cv_results, best_estimator, n_splits, n_fits, refit_time):
+        self.cv_results_ = cv_results
+        self.best_index_ = int(cv_results['rank_test_score'].argmin())
+        self.best_params_ = cv_results['params'][self.best_index_]
+        self.best_score_ = float(cv_results['mean_test_score'][self.best_index_])
+        self.best_estimator_ = best_estimator
+        self.n_splits_ = n_splits
+        self.n_fits_ = n_fits
+        self.refit_time_ = refit_time
+
+
+def build_cv_results(params, test_scores, train_scores, fit_times, score_times):
+    """
+    Assemble a `GridSearchCV`-style `cv_results_` dict.
+
+    `params` holds the parameter dict of each candidate. `test_scores`,
+    `train_scores`, `fit_times` and `score_times` are arrays of shape
+    (n_candidates, n_splits). `train_scores` may be None.
+    """
+    params = list(params)
+    test_scores = np.asarray(test_scores, dtype=float)
+    cv_results = {
+        'mean_fit_time': np.mean(fit_times, axis=1),
+        'std_fit_time': np.std(fit_times, axis=1),
+        'mean_score_time': np.mean(score_times, axis=1),
+        'std_score_time': np.std(score_times, axis=1),
+    }
+    for name in sorted({name for candidate in params for name in candidate}):
+        # Masked where a candidate does not set the parameter, as in GridSearchCV
+        cv_results[f'param_{name}'] = np.ma.MaskedArray(
+            np.array([candidate.get(name) for candidate in params], dtype=object),
+            mask=[name not in candidate for candidate in params]
+        )
+    cv_results['params'] = params
+    for i in range(test_scores.shape[1]):
+        cv_results[f'split{i}_test_score'] = test_scores[:, i]
+    cv_results['mean_test_score'] = test_scores.mean(axis=1)
+    cv_results['std_test_score'] = test_scores.std(axis=1)
+    cv_results['rank_test_score'] = rankdata(-cv_results['mean_test_score'], method='min').astype(np.int32)
+    if train_scores is not None:
+        train_scores = np.asarray(train_scores, dtype=float)
+        for i in range(train_scores.shape[1]):
+            cv_results[f'split{i}_train_score'] = train_scores[:, i]
+        cv_results['mean_train_score'] = train_scores.mean(axis=1)
+        cv_results['std_train_score'] = train_scores.std(axis=1)
+    return cv_results
+
+
+def _knn_path_accuracy(neighbour_labels, y_true, n_neighbors, n_classes):
+    """
+    Accuracy of a uniform-weight KNN vote for every k in `n_neighbors`.
+
+    `neighbour_labels` holds the encoded labels of each sample's neighbours,
+    nearest first. Votes are accumulated along the neighbour axis, so the
+    vote counts for any k are one slice of the running sum. Ties go to the
+    first class, as in `KNeighborsClassifier.predict`.
+    """
+    votes = np.cumsum(neighbour_labels[:, :, None] == np.arange(n_classes), axis=1)
+    return np.array([np.mean(votes[:, k - 1, :].argmax(axis=1) == y_true) for k in n_neighbors])
+
+
+def knn_path_search(model, preprocessor, grid, heart_failure_train, cv=10, return_train_score=True):
+    """
+    Tune `n_neighbors` of a KNN classifier with one neighbour query per fold.
+
+    For every fold the preprocessor and the neighbour index are fitted once,
+    and the held-out rows' neighbours are found up to the largest `k` in the
+    grid. Each `k` is then scored from the running count of neighbour labels,
+    rather than repeating the fit and the neighbour search per candidate as
+    `GridSearchCV` does. Folds are the same as `GridSearchCV(cv=10)` uses, so
+    the scores and the chosen `k` match it, apart from how neighbours at
+    exactly equal distances are ordered.
+
+    Parameters
+    ----------
+    model : sklearn.neighbors.KNeighborsClassifier
+        The KNN model to tune. Its other parameters (metric, algorithm, ...)
+        are kept; `weights` must be 'uniform'.
+    preprocessor : sklearn ColumnTransformer
+        The preprocessing pipeline to be applied to the data.
+    grid : dict
+        Hyperparameter grid with the single key `kneighborsclassifier__n_neighbors`.
+    heart_failure_train : pandas DataFrame
+        The training dataset including the target column 'DEATH_EVENT'.
+    cv : int, optional (default=10)
+        Number of stratified folds.
+    return_train_score : bool, optional (default=True)
+        Also score every `k` on the training folds. This costs a second
+        neighbour query per fold, over the training rows.
+
+    Returns
+    -------
+    PathSearchResult
+        The search results, with the pipeline refitted on all the training
+        data with the best `k` as `best_estimator_`.
+
+    Raises
+    ------
+    ValueError
+        If the model, the grid or the number of neighbours is not supported.
+    """
+    if not isinstance(model, KNeighborsClassifier) or model.weights != 'uniform':
+        raise ValueError("The path search needs a KNeighborsClassifier with weights='uniform'.")
+    param_name = 'kneighborsclassifier__n_neighbors'
+    if set(grid) != {param_name}:
+        raise ValueError(f"The KNN path search only tunes '{param_name}'.")
+
+    n_neighbors = [int(k) for k in grid[param_name]]
+    k_max = max(n_neighbors)
+    X = heart_failure_train.drop(columns=['DEATH_EVENT'])
+    classes, y = np.unique(heart_failure_train['DEATH_EVENT'], return_inverse=True)
+
+    folds = list(StratifiedKFold(n_splits=cv).split(X, y))
+    if k_max > min(len(train) for train, _ in folds):
+        raise ValueError(f"n_neighbors={k_max} is larger than the smallest training fold.")
+
+    shape = (len(n_neighbors), cv)
+    test_scores, fit_times, score_times = np.empty(shape), np.empty(shape), np.empty(shape)
+    train_scores = np.empty(shape) if return_train_score else None
+
+    for i, (train, test) in enumerate(folds):
+        start = time.perf_counter()
+        fold_preprocessor = clone(preprocessor)
+        X_train = fold_preprocessor.fit_transform(X.iloc[train])
+        knn = clone(model).set_params(n_neighbors=k_max).fit(X_train, y[train])
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        neighbours = knn.kneighbors(fold_preprocessor.transform(X.iloc[test]), return_distance=False)
+        test_scores[:, i] = _knn_path_accuracy(y[train][neighbours], y[test], n_neighbors, len(classes))
+        score_time = time.perf_counter() - start
+
+        if return_train_score:
+            # Passing the training rows explicitly keeps each row as its own neighbour, as predict does
+            neighbours = knn.kneighbors(X_train, return_distance=False)
+            train_scores[:, i] = _knn_path_accuracy(y[train][neighbours], y[train], n_neighbors, len(classes))
+
+        # The shared fit and query are spread evenly over the candidates
+        fit_times[:, i] = fit_time / len(n_neighbors)
+        score_times[:, i] = score_time / len(n_neighbors)
+
+    cv_results = build_cv_results([{param_name: k} for k in n_neighbors], test_scores, train_scores,
+                                  fit_times, score_times)
+    best_k = n_neighbors[int(cv_results['rank_test_score'].argmin())]
+
+    start = time.perf_counter()
+    best_estimator = make_pipeline(clone(preprocessor), clone(model).set_params(n_neighbors=best_k))
+    best_estimator.fit(X, heart_failure_train['DEATH_EVENT'])
+    refit_time = time.perf_counter() - start
+
+    # One neighbour index per fold serves every candidate
+    return PathSearchResult(cv_results, best_estimator, cv, cv, refit_time)
+
+
+def lr_path_search(model, preprocessor, grid, heart_failure_train, cv=10, return_train_score=True,
+                   warm_start=True):
+    """
+    Tune `C` of a logistic regression along a warm-started regularization path.
+
+    For every fold the preprocessor is fitted once and the `C` values are
+    visited from the strongest to the weakest regularization, each fit
+    starting from the previous coefficients. Neighbouring solutions on the
+    path are close, so the solver needs far fewer iterations than when
+    `GridSearchCV` starts every candidate from zero. The folds are the same
+    as `GridSearchCV(cv=10)` uses; the scores agree with it up to the
+    solver tolerance. The best model is refitted from a cold start, exactly
+    as `GridSearchCV` refits it.
+
+    Parameters
+    ----------
+    model : sklearn.linear_model.LogisticRegression
+        The model to tune. Its solver must support `warm_start` (not liblinear).
+    preprocessor : sklearn ColumnTransformer
+        The preprocessing pipeline to be applied to the data.
+    grid : dict
+        Hyperparameter grid with the single key `logisticregression__C`.
+    heart_failure_train : pandas DataFrame
+        The training dataset including the target column 'DEATH_EVENT'.
+    cv : int, optional (default=10)
+        Number of stratified folds.
+    return_train_score : bool, optional (default=True)
+        Also score every `C` on the training folds.
+    warm_start : bool, optional (default=True)
+        Start each fit from the previous `C`'s coefficients. With False every
+        candidate is fitted from a cold start, which is useful as a baseline.
+
+    Returns
+    -------
+    PathSearchResult
+        The search results. `cv_results_` also holds the solver iterations
+        per candidate (`split{i}_n_iter`, `mean_n_iter`) and `n_iter_` their
+        total over all candidates and folds.
+
+    Raises
+    ------
+    ValueError
+        If the model or the grid is not supported.
+    """
+    if not isinstance(model, LogisticRegression) or model.solver == 'liblinear':
+        raise ValueError("The path search needs a LogisticRegression with a solver that supports warm_start.")
+    param_name = 'logisticregression__C'
+    if set(grid) != {param_name}:
+        raise ValueError(f"The logistic regression path search only tunes '{param_name}'.")
+
+    values = list(grid[param_name])
+    # Smallest C is the strongest regularization and the easiest fit to start from
+    order = np.argsort(values, kind='stable')
+    X = heart_failure_train.drop(columns=['DEATH_EVENT'])
+    y = heart_failure_train['DEATH_EVENT']
+    folds = list(StratifiedKFold(n_splits=cv).split(X, y))
+
+    shape = (len(values), cv)
+    test_scores, fit_times, score_times = np.empty(shape), np.empty(shape), np.empty(shape)
+    train_scores = np.empty(shape) if return_train_score else None
+    n_iter = np.empty(shape, dtype=int)
+
+    for i, (train, test) in enumerate(folds):
+        start = time.perf_counter()
+        fold_preprocessor = clone(preprocessor)
+        X_train = fold_preprocessor.fit_transform(X.iloc[train])
+        X_test = fold_preprocessor.transform(X.iloc[test])
+        # The preprocessor is fitted once per fold, so its cost is spread evenly over the candidates
+        preprocess_time = (time.perf_counter() - start) / len(values)
+
+        lr = clone(model).set_params(warm_start=warm_start)
+        for j in order:
+            start = time.perf_counter()
+            lr.set_params(C=values[j]).fit(X_train, y.iloc[train])
+            fit_times[j, i] = time.perf_counter() - start + preprocess_time
+            n_iter[j, i] = lr.n_iter_.max()
+
+            start = time.perf_counter()
+            test_scores[j, i] = lr.score(X_test, y.iloc[test])
+            score_times[j, i] = time.perf_counter() - start
+            if return_train_score:
+                train_scores[j, i] = lr.score(X_train, y.iloc[train])
+
+    cv_results = build_cv_results([{param_name: C} for C in values], test_scores, train_scores,
+                                  fit_times, score_times)
+    for i in range(cv):
+        cv_results[f'split{i}_n_iter'] = n_iter[:, i]
+    cv_results['mean_n_iter'] = n_iter.mean(axis=1)
+    best_C = values[int(cv_results['rank_test_score'].argmin())]
+
+    start = time.perf_counter()
+    best_estimator = make_pipeline(clone(preprocessor), clone(model).set_params(C=best_C))
+    best_estimator.fit(X, y)
+    refit_time = time.perf_counter() - start
+
+    result = PathSearchResult(cv_results, best_estimator, cv, len(values) * cv, refit_time)
+    result.n_iter_ = int(n_iter.sum())
+    return result
+
+
+def _pruning_sequence(tree):
+    """
+    The internal nodes of a fitted tree in the order minimal cost-complexity pruning collapses them.
+
+    Follows the weakest-link loop of scikit-learn's `_cost_complexity_prune`
+    step by step, including the order of the floating-point sums, so the
+    returned effective alphas equal `cost_complexity_pruning_path(...).ccp_alphas[1:]`.
+    Pruning with `ccp_alpha` collapses the nodes of every step up to the
+    first one whose alpha is larger than `ccp_alpha`.
+    """
+    children_left, children_right = tree.children_left, tree.children_right
+    n_nodes = tree.node_count
+    r_node = tree.weighted_n_node_samples * tree.impurity / tree.weighted_n_node_samples[0]
+    parent = np.full(n_nodes, -1)
+    internal = children_left != -1
+    parent[children_left[internal]] = np.flatnonzero(internal)
+    parent[children_right[internal]] = np.flatnonzero(internal)
+
+    r_branch = np.where(internal, 0.0, r_node)
+    n_leaves = np.zeros(n_nodes, dtype=int)
+    for leaf in np.flatnonzero(~internal):
+        node = leaf
+        while node != 0:
+            node = parent[node]
+            r_branch[node] += r_node[leaf]
+            n_leaves[node] += 1
+
+    candidates = internal.copy()
+    nodes, alphas = [], []
+    while candidates[0]:
+        index = np.flatnonzero(candidates)
+        subtree_alpha = (r_node[index] - r_branch[index]) / (n_leaves[index] - 1)
+        # argmin keeps the lowest node index among ties, like the strict < of the original loop
+        pruned = int(index[subtree_alpha.argmin()])
+        nodes.append(pruned)
+        alphas.append(float(subtree_alpha.min()))
+
+        stack = [pruned]
+        while stack:
+            node = stack.pop()
+            candidates[node] = False
+            if internal[node]:
+                stack.extend([children_left[node], children_right[node]])
+
+        n_pruned_leaves = n_leaves[pruned] - 1
+        n_leaves[pruned] = 0
+        r_diff = r_node[pruned] - r_branch[pruned]
+        r_branch[pruned] = r_node[pruned]
+        node = parent[pruned]
+        while node != -1:
+            n_leaves[node] -= n_pruned_leaves
+            r_branch[node] += r_diff
+            node = parent[node]
+    return np.array(nodes, dtype=int), np.array(alphas)
+
+
+def _pruned_leaf_map(tree, collapsed):
+    """
+    Map every node of a full tree to the node that is its leaf once the `collapsed` nodes are pruned.
+
+    Nodes are visited in index order, in which parents come before their children.
+    """
+    is_collapsed = np.zeros(tree.node_count, dtype=bool)
+    is_collapsed[collapsed] = True
+    leaf_of = np.arange(tree.node_count)
+    for node in np.flatnonzero(tree.children_left != -1):
+        # A collapsed node, or a node below one, hands its leaf down to its children
+        if is_collapsed[node] or leaf_of[node] != node:
+            leaf_of[tree.children_left[node]] = leaf_of[tree.children_right[node]] = leaf_of[node]
+    return leaf_of
+
+
+def tree_path_search(model, preprocessor, grid, heart_failure_train, cv=10, return_train_score=True):
+    """
+    Tune `ccp_alpha` of a decision tree from one full tree per fold.
+
+    Cost-complexity pruning does not change how a tree is grown, only which
+    of its branches are cut back afterwards, and the subtrees along the
+    pruning path are nested. For every fold the preprocessor and the full
+    (unpruned) tree are therefore fitted once, the weakest-link pruning
+    sequence is computed from the tree, and each candidate `ccp_alpha` is
+    scored by mapping the rows' leaves in the full tree to their leaves in
+    the pruned one. A grid search instead grows a new tree for every
+    candidate. The folds are the same as `GridSearchCV(cv=10)` uses and the
+    pruning replicates scikit-learn's, so the scores and the chosen alpha
+    match it.
+
+    Parameters
+    ----------
+    model : sklearn.tree.DecisionTreeClassifier
+        The tree to tune. Its other parameters (max_depth, random_state, ...)
+        are kept.
+    preprocessor : sklearn ColumnTransformer
+        The preprocessing pipeline to be applied to the data.
+    grid : dict or None
+        Hyperparameter grid with the single key `decisiontreeclassifier__ccp_alpha`.
+        None scores every subtree on every fold's pruning path, using the
+        sorted union of the folds' `ccp_alphas` as candidates.
+    heart_failure_train : pandas DataFrame
+        The training dataset including the target column 'DEATH_EVENT'.
+    cv : int, optional (default=10)
+        Number of stratified folds.
+    return_train_score : bool, optional (default=True)
+        Also score every `ccp_alpha` on the training folds.
+
+    Returns
+    -------
+    PathSearchResult
+        The search results, with the pipeline refitted on all the training
+        data with the best `ccp_alpha` as `best_estimator_`.
+
+    Raises
+    ------
+    ValueError
+        If the model or the grid is not supported.
+    """
+    if not isinstance(model, DecisionTreeClassifier):
+        raise ValueError("The path search needs a DecisionTreeClassifier.")
+    param_name = 'decisiontreeclassifier__ccp_alpha'
+    if grid is not None and set(grid) != {param_name}:
+        raise ValueError(f"The decision tree path search only tunes '{param_name}'.")
+
+    X = heart_failure_train.drop(columns=['DEATH_EVENT'])
+    y = heart_failure_train['DEATH_EVENT']
+    folds = list(StratifiedKFold(n_splits=cv).split(X, y))
+
+    # Grow the full tree of every fold once
+    fold_fits = []
+    for train, test in folds:
+        start = time.perf_counter()
+        fold_preprocessor = clone(preprocessor)
+        X_train = fold_preprocessor.fit_transform(X.iloc[train])
+        tree = clone(model).set_params(ccp_alpha=0.0).fit(X_train, y.iloc[train])
+        fit_time = time.perf_counter() - start
+        fold_fits.append((fold_preprocessor, X_train, tree, _pruning_sequence(tree.tree_), fit_time))
+
+    if grid is None:
+        values = np.unique(np.concatenate([[0.0]] + [alphas for _, _, _, (_, alphas), _ in fold_fits])).tolist()
+    else:
+        values = [float(alpha) for alpha in grid[param_name]]
+
+    shape = (len(values), cv)
+    test_scores, fit_times, score_times = np.empty(shape), np.empty(shape), np.empty(shape)
+    train_scores = np.empty(shape) if return_train_score else None
+
+    for i, ((train, test), (fold_preprocessor, X_train, tree, (nodes, alphas), fit_time)) in enumerate(
+            zip(folds, fold_fits)):
+        start = time.perf_counter()
+        test_leaves = tree.apply(fold_preprocessor.transform(X.iloc[test]))
+        train_leaves = tree.apply(X_train) if return_train_score else None
+        # Class of every node's training samples, used once the node becomes a leaf
+        node_class = tree.classes_[tree.tree_.value[:, 0, :].argmax(axis=1)]
+        for j, alpha in enumerate(values):
+            # Pruning stops at the first step whose effective alpha exceeds ccp_alpha
+            exceeded = np.flatnonzero(alphas > alpha)
+            n_steps = exceeded[0] if len(exceeded) else len(alphas)
+            leaf_of = _pruned_leaf_map(tree.tree_, nodes[:n_steps])
+            test_scores[j, i] = np.mean(node_class[leaf_of[test_leaves]] == y.iloc[test].to_numpy())
+            if return_train_score:
+                train_scores[j, i] = np.mean(node_class[leaf_of[train_leaves]] == y.iloc[train].to_numpy())
+        score_time = time.perf_counter() - start
+
+        # The shared growth and leaf lookup are spread evenly over the candidates
+        fit_times[:, i] = fit_time / len(values)
+        score_times[:, i] = score_time / len(values)
+
+    cv_results = build_cv_results([{param_name: alpha} for alpha in values], test_scores, train_scores,
+                                  fit_times, score_times)
+    best_alpha = values[int(cv_results['rank_test_score'].argmin())]
+
+    start = time.perf_counter()
+    best_estimator = make_pipeline(clone(preprocessor), clone(model).set_params(ccp_alpha=best_alpha))
+    best_estimator.fit(X, y)
+    refit_time = time.perf_counter() - start
+
+    # One full tree per fold serves every candidate
+    return PathSearchResult(cv_results, best_estimator, cv, cv, refit_time)
@@ -0,0 +1,129 @@
+import os
+import time
+import pandas as pd
+from src.dataset_io import iter_dataset_chunks
+
+
+def score_in_chunks(pipeline, file_path, chunksize=100_000, target='DEATH_EVENT', predictions_to=None):
+    """
+    Score a dataset file with a fitted pipeline one chunk at a time.
+
+    Only one chunk is held in memory at once. The confusion matrix is kept as
+    running counts, and predictions can be appended to an output file as each
+    chunk is scored, so memory stays flat regardless of the input size.
+
+    Parameters
+    ----------
+    pipeline : sklearn estimator
+        A fitted classifier or pipeline with a `predict` method. If it has
+        `predict_proba`, the pipeline is run once per chunk and each row is
+        predicted as the class with the highest probability.
+    file_path : str
+        Path to the CSV, Parquet or Feather file to score. It must contain the
+        `target` column.
+    chunksize : int, optional (default=100_000)
+        Number of rows read and scored per chunk.
+    target : str, optional (default='DEATH_EVENT')
+        Name of the column holding the true labels.
+    predictions_to : str, optional
+        Path of a CSV file to write the predictions to. If the pipeline has a
+        `predict_proba` method, the probability of the positive class is
+        written alongside each prediction.
+
+    Returns
+    -------
+    pandas.DataFrame, int, float
+        The confusion matrix (actual labels as rows, predicted labels as
+        columns), the number of rows scored and the elapsed time in seconds.
+
+    Raises
+    ------
+    ValueError
+        If `chunksize` is not a positive integer.
+    KeyError
+        If the `target` column is missing from the input file.
+    """
+    if chunksize is None or chunksize < 1:
+        raise ValueError("chunksize must be a positive integer.")
+
+    if predictions_to:
+        output_dir = os.path.dirname(predictions_to)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    confusion = pd.DataFrame(dtype='int64')
+    n_rows = 0
+    start = time.perf_counter()
+
+    for chunk in iter_dataset_chunks(file_path, chunksize):
+        if target not in chunk.columns:
+            raise KeyError(f"'{target}' column is missing in the input data.")
+
+        if hasattr(pipeline, 'predict_proba'):
+            # One pass through the pipeline gives the probabilities, and the prediction is the likeliest class
+            probabilities = pipeline.predict_proba(chunk)
+            predicted = pipeline.classes_[probabilities.argmax(axis=1)]
+        else:
+            probabilities = None
+            predicted = pipeline.predict(chunk)
+        chunk_counts = pd.crosstab(chunk[target].to_numpy(), predicted)
+        confusion = confusion.add(chunk_counts, fill_value=0)
+
+        if predictions_to:
+            predictions = pd.DataFrame({
+                'row': range(n_rows, n_rows + len(chunk)),
+                target: chunk[target].to_numpy(),
+                'predicted': predicted
+            })
+            if probabilities is not None:
+                predictions['probability'] = probabilities[:, -1]
+            predictions.to_csv(predictions_to, mode='w' if n_rows == 0 else 'a',
+                               header=(n_rows == 0), index=False)
+
+        n_rows += len(chunk)
+
+    elapsed = time.perf_counter() - start
+
+    confusion = confusion.fillna(0).astype('int64')
+    confusion.index.name = 'Actual'
+    confusion.columns.name = 'Predicted'
+
+    return confusion, n_rows, elapsed
+
+
+def scores_from_confusion(confusion, pos_label=1):
+    """
+    Compute accuracy, precision, recall and F1 from confusion matrix counts.
+
+    Parameters
+    ----------
+    confusion : pandas.DataFrame
+        Confusion matrix counts with actual labels as rows and predicted labels
+        as columns, as returned by `score_in_chunks`.
+    pos_label : int or bool, optional (default=1)
+        The label of the positive class.
+
+    Returns
+    -------
+    dict
+        The accuracy, precision, recall and f1 scores. Scores with a zero
+        denominator are reported as 0, as sklearn does.
+    """
+    labels = confusion.index.union(confusion.columns)
+    counts = confusion.reindex(index=labels, columns=labels, fill_value=0).to_numpy()
+
+    # Match by equality so that a pos_label of 1 also finds True in boolean labels
+    positive = [i for i, label in enumerate(labels) if label == pos_label]
+
+    total = counts.sum()
+    correct = counts.trace()
+    tp = sum(counts[i, i] for i in positive)
+    predicted_pos = counts[:, positive].sum()
+    actual_pos = counts[positive, :].sum()
+
+    accuracy = correct / total if total else 0.0
+    precision = tp / predicted_pos if predicted_pos else 0.0
+    recall = tp / actual_pos if actual_pos else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) else 0.0
+
+    return {'accuracy': accuracy, 'precision': precision, 'recall': recall, 'f1': f1}
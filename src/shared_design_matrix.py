@@ -0,0 +1,108 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+
+
+def shared_design_matrix(preprocessor, X, folds, output_file):
+    """
+    Encode the training features once into a float64 memory-mapped `.npy` file.
+
+    Parallel workers handed the returned array open the same file instead of
+    receiving a pickled copy of the DataFrame, and every fold is sliced by
+    row index out of that one copy. Column 0 holds each row's position in
+    `X`, the other columns hold the features in the order of `X`.
+
+    The preprocessor is fitted once per fold on the fold's training rows,
+    and the returned `FoldPreprocessor` reuses that fit whenever a search
+    fits it on those rows, so scores are the same as with the preprocessor
+    in the pipeline but it is never refitted per candidate. Each fit still
+    transforms its rows, as the fold matrices are not stored.
+
+    Parameters
+    ----------
+    preprocessor : sklearn ColumnTransformer
+        The (unfitted) preprocessing pipeline to be applied to the data. Its
+        transformers must select columns by name.
+    X : pandas DataFrame
+        The training features. Every column must be numeric or boolean.
+    folds : list of (numpy.ndarray, numpy.ndarray)
+        The training and test row positions of each fold.
+    output_file : str
+        Path of the `.npy` file to write.
+
+    Returns
+    -------
+    numpy.memmap
+        A read-only, C-contiguous float64 array of shape `(len(X), X.shape[1] + 1)`.
+    FoldPreprocessor
+        The preprocessor to put in front of the model in the search pipeline.
+
+    Raises
+    ------
+    ValueError
+        If a column is not numeric or the preprocessor does not select columns by name.
+    """
+    non_numeric = [column for column in X.columns
+                   if not (pd.api.types.is_numeric_dtype(X[column]) or pd.api.types.is_bool_dtype(X[column]))]
+    if non_numeric:
+        raise ValueError(f"Only numeric and boolean columns can be encoded, got {non_numeric}.")
+
+    matrix = np.lib.format.open_memmap(output_file, mode='w+', dtype=np.float64,
+                                       shape=(len(X), X.shape[1] + 1))
+    matrix[:, 0] = np.arange(len(X))
+    # Column by column, so no second full-size copy of the data is made
+    for i, column in enumerate(X.columns, start=1):
+        matrix[:, i] = X[column].to_numpy(dtype=np.float64)
+    matrix.flush()
+    del matrix
+    matrix = np.load(output_file, mmap_mode='r')
+
+    positions = {column: i for i, column in enumerate(X.columns)}
+    transformers = []
+    for name, transformer, columns in preprocessor.transformers:
+        if isinstance(columns, str):
+            columns = [columns]
+        if not all(isinstance(column, str) for column in columns):
+            raise ValueError("The preprocessor must select columns by name.")
+        transformers.append((name, transformer, [positions[column] for column in columns]))
+    positional_preprocessor = clone(preprocessor).set_params(transformers=transformers)
+
+    fitted = {_rows_key(matrix[train, 0]): clone(positional_preprocessor).fit(matrix[train, 1:])
+              for train, _ in folds}
+    return matrix, FoldPreprocessor(fitted)
+
+
+class FoldPreprocessor(TransformerMixin, BaseEstimator):
+    """
+    Apply the preprocessor fitted on the training rows of a fold to a `shared_design_matrix`.
+
+    Parameters
+    ----------
+    fitted : dict
+        Fitted preprocessors, keyed by the training rows they were fitted on.
+    """
+
+    def __init__(self, fitted):
+        self.fitted = fitted
+
+    def __sklearn_clone__(self):
+        # clone() would also clone the fitted preprocessors, and so unfit them
+        return FoldPreprocessor(self.fitted)
+
+    def fit(self, X, y=None):
+        """Look up the preprocessor fitted on the rows of `X`."""
+        key = _rows_key(X[:, 0])
+        if key not in self.fitted:
+            raise ValueError("The rows do not match the training rows of any fold.")
+        self.preprocessor_ = self.fitted[key]
+        return self
+
+    def transform(self, X):
+        """Transform the feature columns of `X`."""
+        return self.preprocessor_.transform(X[:, 1:])
+
+
+def _rows_key(row_ids):
+    """Hash a set of row positions, whatever their order."""
+    return hashlib.sha256(np.sort(np.asarray(row_ids, dtype=np.int64)).tobytes()).hexdigest()
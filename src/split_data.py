@@ -1,14 +1,16 @@
 import os
 import pandas as pd
-from sklearn.model_selection import train_test_split
+from src.dataset_io import write_dataset, with_format
+from src.split_indices import split_indices, save_base
 
-def split_data(data, output_dir, train_size=0.8, random_state=522):
+def split_data(data, output_dir, train_size=0.8, random_state=522, file_format="csv", indices_only=False):
     """
     Split the dataset into training and testing sets and save them as CSV files.
 
     This function splits the input dataset into training and testing subsets, 
     ensuring the `DEATH_EVENT` column is stratified to maintain class distribution 
-    in both sets. The resulting subsets are saved as CSV files in the specified directory.
+    in both sets. The resulting subsets are saved as CSV files in the specified directory
+    and returned, so callers can keep working with them in memory.
 
     Parameters:
     ----------
@@ -16,9 +18,9 @@ def split_data(data, output_dir, train_size=0.8, random_state=522):
         The input dataset as a pandas DataFrame. It must contain the `DEATH_EVENT` column 
         for stratified splitting.
 
-    output_dir : str
+    output_dir : str or None
         The directory where the split CSV files will be saved. If the directory does 
-        not exist, it will be created.
+        not exist, it will be created. If None, nothing is written.
 
     train_size : float, optional (default=0.8)
         The proportion of the data to include in the training set. The remaining 
@@ -27,14 +29,30 @@ def split_data(data, output_dir, train_size=0.8, random_state=522):
     random_state : int, optional (default=522)
         The random seed for reproducibility of the split.
 
+    file_format : str, optional (default="csv")
+        Format of the saved splits: "csv", "parquet" or "feather". Parquet and
+        Feather keep the column dtypes and need `pyarrow`.
+
+    indices_only : bool, optional (default=False)
+        If True, the train and test row indices (with the seed and a fingerprint
+        of `data`, see `src.split_indices`) and one shared copy of `data` are
+        saved instead of the two splits, and no split is copied in memory.
+        Downstream stages then slice the base dataset with `load_split`.
+
     Returns:
     -------
-    None
+    pd.DataFrame, pd.DataFrame
+        The training and testing datasets, or their row positions in `data`
+        when `indices_only` is True.
 
     Saves:
     ------
     - `heart_failure_train.csv`: The training dataset.
     - `heart_failure_test.csv`: The testing dataset.
+    (with a `.parquet` or `.feather` extension for the other formats)
+    - `heart_failure_split_indices.npz` and `heart_failure_base.npy`: The row
+      indices and the shared base dataset, instead of the two datasets above,
+      when `indices_only` is True.
 
     Raises:
     ------
@@ -56,21 +74,32 @@ def split_data(data, output_dir, train_size=0.8, random_state=522):
     if 'DEATH_EVENT' not in data.columns:
         raise ValueError("The input data must contain the 'DEATH_EVENT' column for stratified splitting.")
 
-    # Split the data
-    train_data, test_data = train_test_split(
-        data,
-        train_size=train_size,
-        stratify=data['DEATH_EVENT'],
-        random_state=random_state
-    )
+    # Split the row positions; the rows themselves are only copied when the splits are needed
+    indices_path = None
+    if output_dir is not None and indices_only:
+        indices_path = os.path.join(output_dir, "heart_failure_split_indices.npz")
+    [(train_rows, test_rows)] = split_indices(data, indices_path, train_size=train_size, random_state=random_state)
+
+    if indices_only:
+        if output_dir is not None:
+            base_path = save_base(data, os.path.join(output_dir, "heart_failure_base.npy"))
+            print(f"Split indices saved to: {indices_path}")
+            print(f"Base dataset saved to: {base_path}")
+        return train_rows, test_rows
+
+    train_data, test_data = data.iloc[train_rows], data.iloc[test_rows]
+    if output_dir is None:
+        return train_data, test_data
 
     # Save the splits
     os.makedirs(output_dir, exist_ok=True)
-    train_path = os.path.join(output_dir, "heart_failure_train.csv")
-    test_path = os.path.join(output_dir, "heart_failure_test.csv")
+    train_path = with_format(os.path.join(output_dir, "heart_failure_train.csv"), file_format)
+    test_path = with_format(os.path.join(output_dir, "heart_failure_test.csv"), file_format)
 
-    train_data.to_csv(train_path, index=False)
-    test_data.to_csv(test_path, index=False)
+    write_dataset(train_data, train_path)
+    write_dataset(test_data, test_path)
 
     print(f"Training data saved to: {train_path}")
     print(f"Test data saved to: {test_path}")
+
+    return train_data, test_data
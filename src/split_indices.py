@@ -0,0 +1,171 @@
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split, RepeatedStratifiedKFold
+
+
+def dataset_fingerprint(data):
+    """Return a SHA-256 hex digest of a DataFrame's rows, used to check indices match their base dataset."""
+    row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+def split_indices(data, output_file=None, train_size=0.8, random_state=522, n_splits=None, n_repeats=1):
+    """
+    Create stratified train/test row indices without copying the data.
+
+    With `n_splits=None` a single stratified hold-out split is made, selecting
+    exactly the same rows as `split_data` for the same `train_size` and
+    `random_state`. Otherwise `n_repeats` repetitions of stratified
+    `n_splits`-fold cross-validation are made. Only the row positions, the
+    seed and a fingerprint of the base dataset are stored, so many splits
+    cost kilobytes rather than copies of the data.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The base dataset. It must contain the `DEATH_EVENT` column.
+    output_file : str, optional
+        Path of a `.npz` file to save the indices to.
+    train_size : float, optional (default=0.8)
+        Proportion of rows in the training set of a hold-out split. Ignored
+        for k-fold splits.
+    random_state : int, optional (default=522)
+        The random seed for reproducibility of the split.
+    n_splits : int, optional
+        Number of folds for k-fold splits. If None, a hold-out split is made.
+    n_repeats : int, optional (default=1)
+        Number of times k-fold splitting is repeated with different shuffles.
+
+    Returns
+    -------
+    list of (numpy.ndarray, numpy.ndarray)
+        The train and test row positions of each split.
+
+    Raises
+    ------
+    ValueError
+        If `train_size` is not between 0 and 1 or `DEATH_EVENT` is missing.
+    """
+    if not (0 < train_size < 1):
+        raise ValueError("train_size must be between 0 and 1.")
+    if 'DEATH_EVENT' not in data.columns:
+        raise ValueError("The input data must contain the 'DEATH_EVENT' column for stratified splitting.")
+
+    # The smallest integer type keeps the index files small
+    index_dtype = np.int32 if len(data) < np.iinfo(np.int32).max else np.int64
+    positions = np.arange(len(data), dtype=index_dtype)
+    stratify = data['DEATH_EVENT'].to_numpy()
+
+    if n_splits is None:
+        train, test = train_test_split(positions, train_size=train_size, stratify=stratify,
+                                       random_state=random_state)
+        splits = [(train, test)]
+    else:
+        folds = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+        splits = [(train.astype(index_dtype), test.astype(index_dtype))
+                  for train, test in folds.split(positions, stratify)]
+
+    if output_file:
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        arrays = {}
+        for i, (train, test) in enumerate(splits):
+            arrays[f"train_{i}"] = train
+            arrays[f"test_{i}"] = test
+        np.savez_compressed(
+            output_file,
+            n_splits=len(splits),
+            n_rows=len(data),
+            random_state=random_state,
+            data_fingerprint=dataset_fingerprint(data),
+            **arrays
+        )
+
+    return splits
+
+
+def save_base(data, output_file):
+    """
+    Save a DataFrame once as the shared base dataset that stored splits are sliced from.
+
+    The rows are written as a structured `.npy` array, which keeps the column
+    names and dtypes and can be memory-mapped by `load_split`, so each stage
+    only reads the rows of its own split.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The base dataset, with numeric or boolean columns.
+    output_file : str
+        Path of the `.npy` file.
+
+    Returns
+    -------
+    str
+        The path written to.
+
+    Raises
+    ------
+    ValueError
+        If a column is not numeric or boolean and cannot be memory-mapped.
+    """
+    records = data.to_records(index=False)
+    if any(records.dtype[name].hasobject for name in records.dtype.names):
+        raise ValueError("Only numeric and boolean columns can be saved in the base dataset.")
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    np.save(output_file, records, allow_pickle=False)
+    return output_file
+
+
+def load_split(data, indices_file, split=0, check_fingerprint=True):
+    """
+    Slice the train and test sets of one stored split out of a shared base dataset.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame, numpy.ndarray or str
+        The base dataset the indices were made from. A path to a `.npy` file
+        is memory-mapped, so only the selected rows are read; a base written
+        by `save_base` is returned as DataFrames.
+    indices_file : str
+        The `.npz` file written by `split_indices`.
+    split : int, optional (default=0)
+        Which split to load.
+    check_fingerprint : bool, optional (default=True)
+        Check that a DataFrame base dataset is the one the indices were made from.
+
+    Returns
+    -------
+    (train, test)
+        The training and test rows, of the same type as `data` (DataFrames
+        for a `save_base` file).
+
+    Raises
+    ------
+    ValueError
+        If the base dataset does not match the stored indices or `split` is out of range.
+    """
+    if isinstance(data, str):
+        data = np.load(data, mmap_mode='r')
+
+    with np.load(indices_file, allow_pickle=False) as indices:
+        if len(data) != int(indices['n_rows']):
+            raise ValueError("The base dataset does not have the number of rows the indices were made from.")
+        if not 0 <= split < int(indices['n_splits']):
+            raise ValueError(f"split must be between 0 and {int(indices['n_splits']) - 1}.")
+        if check_fingerprint and isinstance(data, pd.DataFrame) \
+                and dataset_fingerprint(data) != str(indices['data_fingerprint']):
+            raise ValueError("The base dataset does not match the one the indices were made from.")
+        train, test = indices[f"train_{split}"], indices[f"test_{split}"]
+
+    if isinstance(data, pd.DataFrame):
+        return data.iloc[train], data.iloc[test]
+    if data.dtype.names:
+        # A structured base from save_base holds a table: rebuild its columns
+        return pd.DataFrame(np.asarray(data[train])), pd.DataFrame(np.asarray(data[test]))
+    return data[train], data[test]
@@ -0,0 +1,143 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy.stats import norm
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from src.split_indices import split_indices
+from src.model_fit import model_fit
+
+# Test-set metrics reported for every seed, as in scripts/model_evaluation.py
+METRICS = ('accuracy', 'precision', 'recall', 'f1')
+
+
+def _run_seed(data, preprocessor, model, grid, seed, train_size, search):
+    """Split, tune and evaluate for one seed and return its results row; the fitted model is discarded."""
+    start = time.perf_counter()
+    (train, test), = split_indices(data, train_size=train_size, random_state=seed)
+    heart_failure_train, heart_failure_test = data.iloc[train], data.iloc[test]
+    # Seeds already run in parallel, so each search stays in its own process
+    best_model, search_result = model_fit(model, preprocessor, grid, heart_failure_train, search=search, n_jobs=1)
+
+    y_true = heart_failure_test['DEATH_EVENT']
+    y_pred = best_model.predict(heart_failure_test.drop(columns=['DEATH_EVENT']))
+    row = {'seed': seed}
+    row.update({f"best_{name.split('__')[-1]}": value for name, value in search_result.best_params_.items()})
+    row['cv_score'] = search_result.best_score_
+    row['accuracy'] = accuracy_score(y_true, y_pred)
+    row['precision'] = precision_score(y_true, y_pred, zero_division=0)
+    row['recall'] = recall_score(y_true, y_pred, zero_division=0)
+    row['f1'] = f1_score(y_true, y_pred, zero_division=0)
+    row['seconds'] = time.perf_counter() - start
+    return row
+
+
+def stability_study(data, preprocessor, model, grid, seeds, train_size=0.8, search="path", n_jobs=-1,
+                    output_file=None):
+    """
+    Repeat the split, tuning and evaluation of a model for many random seeds.
+
+    For every seed the data is split with `split_indices` (the same rows
+    `split_data` selects for that `random_state`), the model is tuned on the
+    training rows with `model_fit` and the best pipeline is scored on the
+    test rows. Seeds run in parallel worker processes and only their results
+    row is sent back, so memory does not grow with the number of seeds. The
+    dataset is loaded once by the caller; joblib memory-maps its large
+    numeric columns, so workers share them instead of receiving a copy per
+    seed.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The full dataset, including the `DEATH_EVENT` column.
+    preprocessor : sklearn ColumnTransformer
+        The (unfitted) preprocessing pipeline; it is fitted on each training split.
+    model : sklearn estimator
+        The model to tune.
+    grid : dict
+        Hyperparameter grid for `model_fit`.
+    seeds : iterable of int
+        The random seeds of the splits.
+    train_size : float, optional (default=0.8)
+        Proportion of rows in each training split.
+    search : str, optional (default="path")
+        Search strategy passed to `model_fit`.
+    n_jobs : int, optional (default=-1)
+        Number of seeds run at the same time; -1 uses all cores.
+    output_file : str, optional
+        Path of a CSV file each results row is appended to as soon as its
+        seed finishes, so the results of a long study survive an interruption.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per seed, sorted by seed: the best hyperparameters, the
+        cross-validation score, the test `accuracy`, `precision`, `recall`
+        and `f1`, and the seconds the seed took.
+    """
+    if output_file:
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        if os.path.exists(output_file):
+            os.remove(output_file)
+
+    rows = []
+    parallel = Parallel(n_jobs=n_jobs, return_as="generator_unordered")
+    for row in parallel(delayed(_run_seed)(data, preprocessor, model, grid, seed, train_size, search)
+                        for seed in seeds):
+        rows.append(row)
+        if output_file:
+            pd.DataFrame([row]).to_csv(output_file, mode='a', header=len(rows) == 1, index=False)
+
+    return pd.DataFrame(rows).sort_values('seed', ignore_index=True)
+
+
+def stability_summary(scores, level=0.95):
+    """
+    Summarise the per-seed test scores of `stability_study`.
+
+    For every metric, returns the mean and standard deviation over seeds,
+    the percentile interval holding the central `level` share of the
+    per-seed scores (the range a single split's score can be expected to
+    fall in) and a normal-approximation confidence interval for the mean.
+
+    Parameters
+    ----------
+    scores : pandas.DataFrame
+        The table returned by `stability_study`.
+    level : float, optional (default=0.95)
+        Coverage of the intervals.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per metric.
+
+    Raises
+    ------
+    ValueError
+        If `level` is not between 0 and 1.
+    """
+    if not (0 < level < 1):
+        raise ValueError("level must be between 0 and 1.")
+    tail = (1 - level) / 2
+    # Two-sided normal quantile, e.g. 1.96 for level=0.95
+    z = norm.ppf(1 - tail)
+    rows = []
+    for metric in ('cv_score',) + METRICS:
+        values = scores[metric].to_numpy(dtype=float)
+        std = values.std(ddof=1) if len(values) > 1 else 0.0
+        half_width = z * std / np.sqrt(len(values))
+        rows.append({
+            'metric': metric,
+            'n_seeds': len(values),
+            'mean': values.mean(),
+            'std': std,
+            'lower': np.quantile(values, tail),
+            'upper': np.quantile(values, 1 - tail),
+            'mean_lower': values.mean() - half_width,
+            'mean_upper': values.mean() + half_width,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,128 @@
+import os
+import numpy as np
+from src.dataset_io import dataset_format, iter_dataset_chunks
+
+
+def _common_dtype(first, second):
+    """The dtype pandas gives a column whose chunks have dtypes `first` and `second` when read at once."""
+    if first == second:
+        return first
+    if first.kind in 'biuf' and second.kind in 'biuf' and 'b' not in (first.kind, second.kind):
+        return np.result_type(first, second)
+    return np.dtype(object)
+
+
+class _ChunkWriter:
+    """Append DataFrame chunks to one CSV, Parquet or Feather file, keeping the schema of the first chunk."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file_format = dataset_format(path)
+        self.writer = None
+        self.schema = None
+
+    def write(self, chunk):
+        if self.file_format == "csv":
+            chunk.to_csv(self.path, mode='w' if self.writer is None else 'a', header=self.writer is None, index=False)
+            self.writer = True
+            return
+        import pyarrow as pa
+        table = pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False)
+        if self.writer is None:
+            self.schema = table.schema
+            if self.file_format == "parquet":
+                import pyarrow.parquet as pq
+                self.writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                import pyarrow.ipc
+                self.writer = pa.ipc.new_file(self.path, self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer not in (None, True):
+            self.writer.close()
+
+
+def stream_convert_binary_columns(file_path, output_file, chunksize=100_000):
+    """
+    Detect binary columns and convert them to booleans without loading the whole dataset.
+
+    A first pass over chunks of `chunksize` rows keeps, for every column that
+    may still be binary, the set of distinct non-missing values seen so far.
+    A column is dropped as soon as a third value appears, so high-cardinality
+    columns stop costing anything after their first chunk. The pass also
+    records the dtype each column has over the whole file (an integer column
+    with a missing value in a later chunk is float, as when it is read at
+    once). A second pass converts the binary columns with `astype(bool)`,
+    as `binary_columns_to_bool` does, and appends each chunk to the output.
+    When the file fits in one chunk, the chunk from the first pass is kept
+    and the file is not read again.
+
+    Memory is one chunk plus at most two values per column, and the output
+    booleans are stored bit-packed in Parquet and Feather (one byte per
+    value in pandas, one bit on disk).
+
+    Parameters
+    ----------
+    file_path : str
+        The CSV, Parquet or Feather dataset to convert.
+    output_file : str
+        Path of the converted dataset; the format is inferred from the
+        extension. Parquet and Feather need `pyarrow`.
+    chunksize : int, optional (default=100_000)
+        Number of rows read at a time.
+
+    Returns
+    -------
+    list of str
+        The names of the detected binary columns, in column order.
+
+    Raises
+    ------
+    ValueError
+        If the dataset has no rows.
+    """
+    columns = None
+    distinct = {}
+    dtypes = {}
+    n_chunks = 0
+    first_chunk = None
+
+    # ----- Pass 1: binary candidates and whole-file dtypes -----
+    for chunk in iter_dataset_chunks(file_path, chunksize):
+        if columns is None:
+            columns = list(chunk.columns)
+            distinct = {column: set() for column in columns}
+            first_chunk = chunk
+        n_chunks += 1
+        if n_chunks == 2:
+            # More than one chunk: the file is read again in the second pass
+            first_chunk = None
+        for column in columns:
+            dtype = chunk[column].dtype
+            dtypes[column] = dtype if column not in dtypes else _common_dtype(dtypes[column], dtype)
+            if column in distinct:
+                seen = distinct[column]
+                seen.update(chunk[column].dropna().unique().tolist())
+                if len(seen) > 2:
+                    del distinct[column]
+
+    if columns is None:
+        raise ValueError(f"'{file_path}' contains no rows.")
+    binary_columns = [column for column in columns if len(distinct.get(column, ())) == 2]
+
+    # ----- Pass 2: convert and write chunk by chunk -----
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    chunks = [first_chunk] if n_chunks == 1 else iter_dataset_chunks(file_path, chunksize)
+    writer = _ChunkWriter(output_file)
+    try:
+        for chunk in chunks:
+            chunk = chunk.astype({column: dtypes[column] for column in columns if chunk[column].dtype != dtypes[column]})
+            chunk[binary_columns] = chunk[binary_columns].astype(bool)
+            writer.write(chunk)
+    finally:
+        writer.close()
+
+    return binary_columns
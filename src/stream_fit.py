@@ -0,0 +1,195 @@
+import time
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from src.dataset_io import iter_dataset_chunks
+
+
+def _column_list(columns):
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+def _summary_frame(template, preprocessor, scalers, categories):
+    """
+    Build a small frame on which fitting `preprocessor` gives the streamed statistics.
+
+    Every `OneHotEncoder` column cycles through all the categories seen in the
+    data, and every `StandardScaler` column alternates between mean + std and
+    mean - std, which has exactly the streamed mean and (population) variance
+    since the frame has an even number of rows. Other columns keep values of
+    `template`, so their dtypes are those of the data.
+    """
+    n = max([2] + [len(values) for seen in categories.values() for values in seen])
+    n += n % 2
+    frame = template.iloc[np.arange(n) % len(template)].reset_index(drop=True)
+    signs = np.where(np.arange(n) % 2 == 0, 1.0, -1.0)
+    for name, transformer, columns in preprocessor.transformers:
+        columns = _column_list(columns)
+        if name in scalers and scalers[name].mean_ is not None:
+            scaler = scalers[name]
+            # var_ is None for a scaler without with_std, which only centres
+            variances = scaler.var_ if scaler.var_ is not None else np.zeros(len(columns))
+            for column, mean, var in zip(columns, scaler.mean_, variances):
+                frame[column] = mean + np.sqrt(var) * signs
+        elif name in categories:
+            for column, values in zip(columns, categories[name]):
+                values = sorted(values)
+                frame[column] = [values[i % len(values)] for i in range(n)]
+    return frame
+
+
+def fit_preprocessor_in_chunks(chunks, preprocessor):
+    """
+    Fit a preprocessor in one pass over chunks of a dataset too large to load at once.
+
+    The `StandardScaler` statistics are fitted incrementally with
+    `partial_fit` and the categories of every `OneHotEncoder` column are
+    collected, then the preprocessor is fitted once on a small frame with
+    exactly those statistics and every category, including categories that
+    only appear late in the data. Only one chunk is in memory at a time.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas DataFrame
+        The chunks of the data, e.g. from `iter_dataset_chunks`.
+    preprocessor : sklearn ColumnTransformer
+        The (unfitted) preprocessing pipeline. Its transformers must be
+        `StandardScaler`, `OneHotEncoder`, 'passthrough' or 'drop', selecting
+        columns by name.
+
+    Returns
+    -------
+    sklearn ColumnTransformer
+        A fitted clone of `preprocessor`.
+
+    Raises
+    ------
+    ValueError
+        If the preprocessor contains an unsupported transformer or there are no chunks.
+    """
+    for name, transformer, _ in preprocessor.transformers:
+        if not (transformer in ('passthrough', 'drop') or isinstance(transformer, (StandardScaler, OneHotEncoder))):
+            raise ValueError(f"Transformer '{name}' cannot be fitted incrementally.")
+
+    template = None
+    scalers = {}
+    categories = {}
+    for chunk in chunks:
+        if template is None:
+            # One row is enough to give the summary frame the data's columns and dtypes
+            template = chunk.iloc[:1]
+        for name, transformer, columns in preprocessor.transformers:
+            columns = _column_list(columns)
+            if isinstance(transformer, StandardScaler):
+                scalers.setdefault(name, clone(transformer)).partial_fit(chunk[columns])
+            elif isinstance(transformer, OneHotEncoder):
+                seen = categories.setdefault(name, [set() for _ in columns])
+                for values, column in zip(seen, columns):
+                    values.update(chunk[column].dropna().unique().tolist())
+    if template is None:
+        raise ValueError("The data contain no rows.")
+
+    return clone(preprocessor).fit(_summary_frame(template, preprocessor, scalers, categories))
+
+
+def stream_fit(file_path, preprocessor, chunksize=100_000, epochs=10, random_state=522, alpha=1e-4):
+    """
+    Train a logistic-loss linear model on a dataset too large to load at once.
+
+    The training file is read in chunks of `chunksize` rows. A first pass
+    fits the `StandardScaler` statistics incrementally with `partial_fit`,
+    collects the categories of every `OneHotEncoder` column and counts the
+    classes. The preprocessor is then fitted once on a small frame with
+    exactly those statistics and every category, including categories that
+    only appear late in the file. Each of the `epochs` further passes then shuffles every chunk
+    and trains an `SGDClassifier(loss='log_loss')` on it with `partial_fit`.
+    The model keeps the average of its weights over all updates, which makes
+    the result much less sensitive to chunk size and order than the last
+    iterate. Samples are weighted so both classes count equally, like
+    `class_weight="balanced"` in the batch logistic regression. Only one
+    chunk is in memory at a time.
+
+    Parameters
+    ----------
+    file_path : str
+        The CSV, Parquet or Feather training file, including the `DEATH_EVENT` column.
+    preprocessor : sklearn ColumnTransformer
+        The (unfitted) preprocessing pipeline. Its transformers must be
+        `StandardScaler`, `OneHotEncoder`, 'passthrough' or 'drop', selecting
+        columns by name.
+    chunksize : int, optional (default=100_000)
+        Number of rows read at a time.
+    epochs : int, optional (default=10)
+        Number of passes over the data to train the model.
+    random_state : int, optional (default=522)
+        Seed for the shuffling and the model.
+    alpha : float, optional (default=1e-4)
+        Regularization strength of the `SGDClassifier`.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline
+        The fitted preprocessor and model, usable like the `pipeline.pickle`
+        written by `modelling.py`.
+    dict
+        Training statistics: `rows`, `epochs`, `seconds`, `rows_per_second`
+        (over all passes) and `max_chunk_rows`.
+
+    Raises
+    ------
+    ValueError
+        If the preprocessor contains an unsupported transformer, `DEATH_EVENT`
+        is missing or the data has fewer than two classes.
+    """
+    if epochs < 1:
+        raise ValueError("epochs must be a positive integer.")
+    start = time.perf_counter()
+    n_rows = 0
+    max_chunk_rows = 0
+    class_counts = {}
+
+    def training_chunks():
+        nonlocal n_rows, max_chunk_rows
+        for chunk in iter_dataset_chunks(file_path, chunksize):
+            if 'DEATH_EVENT' not in chunk.columns:
+                raise ValueError("The input data must contain the 'DEATH_EVENT' column.")
+            n_rows += len(chunk)
+            max_chunk_rows = max(max_chunk_rows, len(chunk))
+            for label, count in chunk['DEATH_EVENT'].value_counts().items():
+                class_counts[label] = class_counts.get(label, 0) + int(count)
+            yield chunk.drop(columns=['DEATH_EVENT'])
+
+    # ----- Pass 1: preprocessing statistics and class counts -----
+    fitted = fit_preprocessor_in_chunks(training_chunks(), preprocessor)
+
+    if len(class_counts) < 2:
+        raise ValueError("The training data must contain at least two classes.")
+    classes = np.array(sorted(class_counts))
+    # Balanced weights: n_samples / (n_classes * n_samples_in_class)
+    class_weight = {label: n_rows / (len(classes) * count) for label, count in class_counts.items()}
+
+    # ----- Passes 2..: stochastic gradient descent over shuffled chunks -----
+    model = SGDClassifier(loss='log_loss', alpha=alpha, average=True, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    for epoch in range(epochs):
+        epoch_start = time.perf_counter()
+        for chunk in iter_dataset_chunks(file_path, chunksize):
+            chunk = chunk.iloc[rng.permutation(len(chunk))]
+            X = fitted.transform(chunk.drop(columns=['DEATH_EVENT']))
+            model.partial_fit(X, chunk['DEATH_EVENT'].to_numpy(), classes=classes,
+                              sample_weight=chunk['DEATH_EVENT'].map(class_weight).to_numpy())
+        epoch_time = time.perf_counter() - epoch_start
+        print(f"Epoch {epoch + 1}/{epochs}: {n_rows / epoch_time:,.0f} rows/s")
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        'rows': n_rows,
+        'epochs': epochs,
+        'seconds': elapsed,
+        # The statistics pass reads the data once more
+        'rows_per_second': n_rows * (epochs + 1) / elapsed,
+        'max_chunk_rows': max_chunk_rows,
+    }
+    return make_pipeline(fitted, model), stats
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from src.dataset_io import iter_dataset_chunks
+
+
+def _class_key(label):
+    """Map a class label to a stable non-negative integer for seeding, independent of its dtype."""
+    # A label read as 1 in one chunk and 1.0 in another must seed the same way
+    if isinstance(label, (float, np.floating)) and float(label).is_integer():
+        label = int(label)
+    if isinstance(label, (bool, np.bool_, int, np.integer)):
+        return int(label) & 0xFFFFFFFF
+    # Hash the whole label, so labels sharing a prefix stay in separate strata
+    return int.from_bytes(hashlib.sha256(str(label).encode()).digest()[:8], 'little')
+
+
+def stream_split_data(file_path, output_dir, train_size=0.8, random_state=522, chunksize=100_000, block_size=100):
+    """
+    Split a dataset that does not fit in memory into training and testing CSV files.
+
+    The input is read in chunks. Rows of each `DEATH_EVENT` class are grouped
+    into consecutive blocks of `block_size` rows (in file order), and within
+    every block a permutation seeded by `random_state`, the class and the block
+    number picks exactly `round(block_size * train_size)` rows for training.
+    Class proportions therefore match `train_size` to within one block per
+    class, the split is reproducible for a given `random_state` and chunk size
+    does not affect the result. Memory use is bounded by the chunk size.
+
+    Parameters
+    ----------
+    file_path : str
+        The CSV, Parquet or Feather file to split. It must contain the
+        `DEATH_EVENT` column.
+    output_dir : str
+        The directory where `heart_failure_train.csv` and `heart_failure_test.csv`
+        will be written. It is created if it does not exist.
+    train_size : float, optional (default=0.8)
+        The proportion of each class to include in the training set.
+    random_state : int, optional (default=522)
+        The random seed for reproducibility of the split.
+    chunksize : int, optional (default=100_000)
+        Number of rows read at a time.
+    block_size : int, optional (default=100)
+        Number of rows of the same class over which the split is stratified.
+
+    Returns
+    -------
+    dict
+        Number of training and test rows for each class.
+
+    Raises
+    ------
+    ValueError
+        If `train_size` is not between 0 and 1, `block_size` is not positive or
+        `DEATH_EVENT` is missing in the dataset.
+    """
+    if not (0 < train_size < 1):
+        raise ValueError("train_size must be between 0 and 1.")
+    if block_size < 1:
+        raise ValueError("block_size must be a positive integer.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    train_path = os.path.join(output_dir, "heart_failure_train.csv")
+    test_path = os.path.join(output_dir, "heart_failure_test.csv")
+
+    n_train_per_block = int(round(block_size * train_size))
+    seen = {}
+    counts = {}
+    first_chunk = True
+
+    for chunk in iter_dataset_chunks(file_path, chunksize):
+        if 'DEATH_EVENT' not in chunk.columns:
+            raise ValueError("The input data must contain the 'DEATH_EVENT' column for stratified splitting.")
+
+        labels = chunk['DEATH_EVENT'].to_numpy()
+        is_train = np.zeros(len(chunk), dtype=bool)
+
+        for label in pd.unique(labels):
+            rows = np.flatnonzero(labels == label)
+            key = _class_key(label)
+            # Position of each row among all rows of its class seen so far
+            positions = seen.get(key, 0) + np.arange(len(rows))
+            seen[key] = seen.get(key, 0) + len(rows)
+
+            blocks = positions // block_size
+            for block in np.unique(blocks):
+                in_block = blocks == block
+                rng = np.random.default_rng([random_state, key, int(block)])
+                train_slots = rng.permutation(block_size) < n_train_per_block
+                is_train[rows[in_block]] = train_slots[positions[in_block] % block_size]
+
+            n_train = int(is_train[rows].sum())
+            label_counts = counts.setdefault(label.item() if hasattr(label, 'item') else label,
+                                             {'train': 0, 'test': 0})
+            label_counts['train'] += n_train
+            label_counts['test'] += len(rows) - n_train
+
+        mode = 'w' if first_chunk else 'a'
+        chunk[is_train].to_csv(train_path, mode=mode, header=first_chunk, index=False)
+        chunk[~is_train].to_csv(test_path, mode=mode, header=first_chunk, index=False)
+        first_chunk = False
+
+    if first_chunk:
+        raise ValueError("The input data must contain at least one row.")
+
+    print(f"Training data saved to: {train_path}")
+    print(f"Test data saved to: {test_path}")
+
+    return counts
@@ -0,0 +1,303 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from src.dataset_io import iter_dataset_chunks
+
+
+class CorrelationAccumulator:
+    """
+    Running pairwise-complete means and co-moments of a set of columns, from
+    which the covariance and Pearson correlation matrices follow.
+
+    Missing values are handled as in `DataFrame.corr`: every pair of columns
+    is accumulated over the rows where both are present, so `n`, `mean` and
+    `m2` are matrices, entry `[i, j]` describing column `i` over the rows it
+    shares with column `j`. Each chunk is centred on its own means and
+    combined with the running totals with the pairwise update of Chan, Golub
+    and LeVeque (Welford's update for a block of rows), so no large sums of
+    squares are formed. Two accumulators built on different rows combine the
+    same way with `merge`, so chunks can be accumulated by separate workers.
+    Memory is O(columns²) whatever the number of rows.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        shape = (len(self.columns), len(self.columns))
+        self.n = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.comoment = np.zeros(shape)
+
+    def _combine(self, n, mean, m2, comoment):
+        total = self.n + n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(total > 0, n / total, 0.0)
+            factor = np.where(total > 0, self.n * n / total, 0.0)
+        delta = mean - self.mean
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + m2 + delta ** 2 * factor
+        self.comoment = self.comoment + comoment + delta * delta.T * factor
+        self.n = total
+        return self
+
+    def update(self, values):
+        """Add the rows of a 2-D array whose columns are `columns`; NaN marks a missing value."""
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return self
+        present = ~np.isnan(values)
+        if present.all():
+            # Every pair shares all rows: centre once and use a single product
+            mean = values.mean(axis=0)
+            centered = values - mean
+            comoment = centered.T @ centered
+            ones = np.ones_like(comoment)
+            return self._combine(ones * len(values), ones * mean[:, None], ones * np.diag(comoment)[:, None],
+                                 comoment)
+        weights = present.astype(float)
+        # Shift each column by its own mean first, so the sums below stay small
+        counts = weights.sum(axis=0)
+        shift = np.divide(np.where(present, values, 0.0).sum(axis=0), counts,
+                          out=np.zeros(len(counts)), where=counts > 0)
+        shifted = np.where(present, values - shift, 0.0)
+
+        n = weights.T @ weights
+        mean = np.divide(shifted.T @ weights, n, out=np.zeros_like(n), where=n > 0)
+        m2 = (shifted ** 2).T @ weights - n * mean ** 2
+        comoment = shifted.T @ shifted - n * mean * mean.T
+        return self._combine(n, mean + shift[:, None] * (n > 0), m2, comoment)
+
+    def update_pair(self, i, j, x, y):
+        """Add the values `x` of column `i` and `y` of column `j` on the rows where both are present."""
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        if len(x) == 0:
+            return self
+        shape = self.n.shape
+        n, mean, m2, comoment = np.zeros(shape), np.zeros(shape), np.zeros(shape), np.zeros(shape)
+        dx, dy = x - x.mean(), y - y.mean()
+        n[i, j] = n[j, i] = len(x)
+        mean[i, j], mean[j, i] = x.mean(), y.mean()
+        m2[i, j], m2[j, i] = dx @ dx, dy @ dy
+        comoment[i, j] = comoment[j, i] = dx @ dy
+        return self._combine(n, mean, m2, comoment)
+
+    def merge(self, other):
+        """Add the rows accumulated by another accumulator over the same columns."""
+        if other.columns != self.columns:
+            raise ValueError("Only accumulators over the same columns can be merged.")
+        return self._combine(other.n, other.mean, other.m2, other.comoment)
+
+    def covariance(self, ddof=1):
+        """The pairwise-complete covariance matrix, as a DataFrame."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = np.where(self.n > ddof, self.comoment / (self.n - ddof), np.nan)
+        return pd.DataFrame(covariance, index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        """
+        The Pearson correlation matrix, as a DataFrame; pairs with fewer than two
+        shared rows or a constant column give NaN, as in `DataFrame.corr`.
+        """
+        scale = np.sqrt(self.m2 * self.m2.T)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = np.where(scale > 0, np.clip(self.comoment / scale, -1, 1), np.nan)
+        np.fill_diagonal(correlation, np.where(np.diag(self.m2) > 0, 1.0, np.nan))
+        return pd.DataFrame(correlation, index=self.columns, columns=self.columns)
+
+
+class RankSketch:
+    """
+    Sorted distinct values of a column with their counts, used to rank values
+    without holding the column.
+
+    While a column has at most `max_bins` distinct values the sketch is exact
+    and `ranks` returns the average ranks `Series.rank` gives. Beyond that,
+    neighbouring values are merged into `max_bins` bins of about equal count
+    and ranks are interpolated between them. Sketches of different rows
+    combine with `merge`.
+    """
+
+    def __init__(self, max_bins=4096):
+        self.max_bins = max_bins
+        self.values = np.empty(0)
+        self.counts = np.empty(0)
+        self.exact = True
+
+    def _add(self, values, counts):
+        values, inverse = np.unique(np.concatenate([self.values, values]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]))
+        if len(values) > self.max_bins:
+            cumulative = np.cumsum(counts) - counts
+            bins = np.minimum((cumulative * self.max_bins / counts.sum()).astype(int), self.max_bins - 1)
+            weights = np.bincount(bins, weights=counts)
+            keep = weights > 0
+            values = (np.bincount(bins, weights=values * counts)[keep] / weights[keep])
+            counts = weights[keep]
+            self.exact = False
+        self.values, self.counts = values, counts
+        return self
+
+    def update(self, values):
+        """Add the values of a 1-D array, ignoring NaN."""
+        values = np.asarray(values, dtype=float)
+        values, counts = np.unique(values[~np.isnan(values)], return_counts=True)
+        return self._add(values, counts.astype(float))
+
+    def copy(self):
+        """A sketch with the same counts, which can be updated independently."""
+        sketch = RankSketch(self.max_bins)
+        # _add replaces the arrays rather than modifying them, so they can be shared
+        sketch.values, sketch.counts, sketch.exact = self.values, self.counts, self.exact
+        return sketch
+
+    def merge(self, other):
+        """Add the values counted by another sketch."""
+        self.exact = self.exact and other.exact
+        return self._add(other.values, other.counts)
+
+    def ranks(self, values):
+        """The (average) rank of each value in the column the sketch was built on, starting at 1."""
+        middle = np.cumsum(self.counts) - self.counts + (self.counts + 1) / 2
+        return np.interp(np.asarray(values, dtype=float), self.values, middle)
+
+
+def _chunks(data, chunksize):
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start + chunksize]
+    else:
+        yield from iter_dataset_chunks(data, chunksize)
+
+
+def _features(chunk, transform):
+    """Apply `transform` to a chunk and return its column names and values as a float array."""
+    if transform is not None:
+        chunk = transform(chunk)
+    return list(chunk.columns), np.asarray(chunk, dtype=float)
+
+
+def _sketch_chunk(chunk, transform, max_bins):
+    """
+    Sketch every column over the rows it shares with each other column, since
+    `DataFrame.corr` ranks each pair of columns over their common rows. A
+    pair sketch is None where it would equal the column's own sketch.
+    """
+    columns, values = _features(chunk, transform)
+    present = ~np.isnan(values)
+    # Number of rows where column i is present and column j is not
+    unshared = present.T.astype(float) @ (~present).astype(float)
+    sketches = []
+    for i in range(values.shape[1]):
+        sketches.append([
+            None if unshared[i, j] == 0
+            else RankSketch(max_bins).update(values[present[:, i] & present[:, j], i])
+            for j in range(values.shape[1])
+        ])
+        sketches[i][i] = RankSketch(max_bins).update(values[:, i])
+    return columns, sketches, int((~present).sum())
+
+
+def _merge_sketches(first, second):
+    if first[0] != second[0]:
+        raise ValueError("All chunks must have the same columns.")
+    sketches = []
+    for i, (row, other_row) in enumerate(zip(first[1], second[1])):
+        column, other_column = row[i], other_row[i]
+        # Pair sketches first, while the column sketches still hold the rows of one side each
+        merged = [None if sketch is None and other is None
+                  else (sketch or column.copy()).merge(other or other_column)
+                  for j, (sketch, other) in enumerate(zip(row, other_row)) if j != i]
+        merged.insert(i, column.merge(other_column))
+        sketches.append(merged)
+    return first[0], sketches, first[2] + second[2]
+
+
+def _merge_all(results, merge):
+    """Merge the partial results of all chunks, in the order they finish."""
+    total = None
+    for result in results:
+        total = result if total is None else merge(total, result)
+    if total is None:
+        raise ValueError("The data contain no rows.")
+    return total
+
+
+def _accumulate_chunk(chunk, transform, sketches, complete):
+    columns, values = _features(chunk, transform)
+    accumulator = CorrelationAccumulator(columns)
+    if sketches is None:
+        return accumulator.update(values)
+    if complete:
+        # Without missing values every pair shares all rows, so each column is ranked once
+        return accumulator.update(np.column_stack([sketches[j][j].ranks(values[:, j])
+                                                   for j in range(values.shape[1])]))
+    present = ~np.isnan(values)
+    for i in range(values.shape[1]):
+        for j in range(i + 1):
+            rows = present[:, i] & present[:, j]
+            if not rows.any():
+                continue
+            accumulator.update_pair(i, j, (sketches[i][j] or sketches[i][i]).ranks(values[rows, i]),
+                                    (sketches[j][i] or sketches[j][j]).ranks(values[rows, j]))
+    return accumulator
+
+
+def streaming_correlation(data, chunksize=100_000, method="pearson", transform=None, n_jobs=1, max_bins=4096):
+    """
+    Compute a correlation matrix in one pass over chunks of a dataset.
+
+    Every chunk is reduced to a `CorrelationAccumulator` and the accumulators
+    are merged, so memory is O(features²) rather than O(rows × features) and
+    the chunks can be processed by `n_jobs` workers. `transform` is applied
+    to each chunk, so features such as scaled or one-hot encoded columns are
+    never materialised for the whole dataset.
+
+    Missing values are skipped pairwise, as in `DataFrame.corr`: every pair
+    of features is correlated over the rows where both are present.
+
+    Spearman correlation is the Pearson correlation of the ranks. A first
+    pass builds a `RankSketch` of each feature over the rows it shares with
+    each other feature and a second pass correlates the ranks they give. The
+    result equals `DataFrame.corr(method="spearman")` while every feature
+    has at most `max_bins` distinct values, and is an approximation
+    otherwise.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or str
+        The data, or the path to a CSV, Parquet or Feather dataset.
+    chunksize : int, optional (default=100_000)
+        Number of rows processed at a time.
+    method : str, optional (default="pearson")
+        "pearson" or "spearman".
+    transform : callable, optional
+        Function mapping a chunk to the DataFrame of features to correlate,
+        for example the `transform` of a fitted preprocessor.
+    n_jobs : int, optional (default=1)
+        Number of workers processing chunks. -1 uses all cores.
+    max_bins : int, optional (default=4096)
+        Number of distinct values kept per feature for Spearman correlation.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The correlation matrix, in the layout of `DataFrame.corr`.
+
+    Raises
+    ------
+    ValueError
+        If `method` is not supported or the data are empty.
+    """
+    if method not in ("pearson", "spearman"):
+        raise ValueError("method must be 'pearson' or 'spearman'.")
+
+    def run(task, *args):
+        return Parallel(n_jobs=n_jobs, return_as="generator_unordered")(
+            delayed(task)(chunk, transform, *args) for chunk in _chunks(data, chunksize) if len(chunk)
+        )
+
+    sketches, n_missing = None, 0
+    if method == "spearman":
+        _, sketches, n_missing = _merge_all(run(_sketch_chunk, max_bins), _merge_sketches)
+    accumulator = _merge_all(run(_accumulate_chunk, sketches, n_missing == 0), CorrelationAccumulator.merge)
+    return accumulator.correlation()
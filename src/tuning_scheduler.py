@@ -0,0 +1,168 @@
+import time
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from sklearn.pipeline import make_pipeline
+from src.path_search import PathSearchResult, build_cv_results
+from src.fold_score_cache import FoldScoreCache
+from src.split_indices import dataset_fingerprint
+from src.execution_backend import execution_backend
+
+# Order of the values in a task outcome, and of the fields of a cache entry
+_OUTCOME_FIELDS = ('test_score', 'train_score', 'fit_time', 'score_time', 'task_time')
+
+
+def _fit_and_score(pipeline, params, X, y, train, test, cache=None, key=None):
+    """Fit one candidate on one fold and score it on the test and training rows, storing the result in `cache`."""
+    start = time.perf_counter()
+    pipeline = clone(pipeline).set_params(**params)
+    pipeline.fit(X.iloc[train], y.iloc[train])
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    test_score = pipeline.score(X.iloc[test], y.iloc[test])
+    score_time = time.perf_counter() - start
+    train_score = pipeline.score(X.iloc[train], y.iloc[train])
+    outcome = (test_score, train_score, fit_time, score_time, time.perf_counter() - start + fit_time)
+    if cache is not None:
+        cache.put(key, dict(zip(_OUTCOME_FIELDS, map(float, outcome))))
+    return outcome
+
+
+def _refit(pipeline, params, X, y):
+    """Fit the best candidate on all the training data."""
+    start = time.perf_counter()
+    pipeline = clone(pipeline).set_params(**params).fit(X, y)
+    return pipeline, time.perf_counter() - start
+
+
+def _best_params(cv_results):
+    """Return the parameters of the best-ranked candidate, the first one on ties as in GridSearchCV."""
+    return cv_results['params'][int(cv_results['rank_test_score'].argmin())]
+
+
+def tune_models(models, heart_failure_train, n_jobs=-1, cache_dir=None, backend=None):
+    """
+    Cross-validate several models in one worker pool with a shared CPU budget.
+
+    Every (model, candidate, fold) fit from every model is a separate task
+    in a single joblib pool of `n_jobs` workers, so a small grid finishing
+    early does not leave cores idle while a larger one is still running,
+    and the models never compete for more than `n_jobs` cores between them.
+    joblib limits the BLAS/OpenMP threads of each worker to its share of
+    the cores, which avoids oversubscription.
+
+    Folds are the stratified folds `GridSearchCV` and `cross_validate` use
+    for classifiers, so each model's scores are the same as running them
+    one after another.
+
+    Parameters
+    ----------
+    models : dict
+        Maps a model name to a dict with the keys `model`, `preprocessor`,
+        `grid` (a hyperparameter grid, or None to only cross-validate the
+        model as it is) and optionally `cv` (number of folds, default 10).
+    heart_failure_train : pandas DataFrame
+        The training dataset including the target column 'DEATH_EVENT'.
+    n_jobs : int, optional (default=-1)
+        Number of worker processes shared by all the models. -1 uses all cores.
+    cache_dir : str, optional
+        Directory of a `FoldScoreCache`. Each (model, candidate, fold) result
+        is stored there as soon as it is computed, and results already in it
+        are reused instead of being recomputed, so an interrupted search
+        resumes where it stopped and adding candidates to a grid only
+        computes the new ones.
+    backend : str, optional
+        Where the tasks run (see `src.execution_backend`). The default is
+        the local joblib pool. On Dask the training data is sent to the
+        workers once; a `cache_dir` must then be on a disk all workers share.
+
+    Returns
+    -------
+    dict
+        For each model with a grid, a `PathSearchResult` with the same
+        `cv_results_`, `best_params_` and refitted `best_estimator_` as
+        `GridSearchCV`. For each model without one, a `cross_validate`-style
+        dict of `fit_time`, `score_time`, `test_score` and `train_score`
+        arrays. The key `"_schedule"` holds the total `wall_time`, the
+        `busy_time` summed over all tasks, the number of `workers` and their
+        `utilisation` (busy time over wall time times workers), and the
+        numbers of fold results `computed` and `reused` from the cache.
+    """
+    X = heart_failure_train.drop(columns=['DEATH_EVENT'])
+    y = heart_failure_train['DEATH_EVENT']
+
+    cache = FoldScoreCache(cache_dir) if cache_dir else None
+    data_hash = dataset_fingerprint(heart_failure_train) if cache is not None else None
+
+    plans = {}
+    tasks = []
+    for name, spec in models.items():
+        pipeline = make_pipeline(spec['preprocessor'], spec['model'])
+        candidates = list(ParameterGrid(spec['grid'])) if spec.get('grid') else [{}]
+        folds = list(StratifiedKFold(n_splits=spec.get('cv', 10)).split(X, y))
+        plans[name] = (pipeline, candidates, folds)
+        for candidate in candidates:
+            for train, test in folds:
+                key = cache.key(data_hash, pipeline, candidate, test) if cache is not None else None
+                tasks.append((pipeline, candidate, train, test, key))
+
+    start = time.perf_counter()
+    outcomes = [None] * len(tasks)
+    if cache is not None:
+        for i, (_, _, _, _, key) in enumerate(tasks):
+            entry = cache.get(key)
+            if entry is not None:
+                outcomes[i] = tuple(entry[field] for field in _OUTCOME_FIELDS)
+    to_compute = [i for i, outcome in enumerate(outcomes) if outcome is None]
+
+    with execution_backend(backend, n_jobs, scatter=[X, y]), Parallel(n_jobs=n_jobs) as parallel:
+        computed = parallel(delayed(_fit_and_score)(pipeline, candidate, X, y, train, test, cache, key)
+                            for pipeline, candidate, train, test, key in (tasks[i] for i in to_compute))
+        for i, outcome in zip(to_compute, computed):
+            outcomes[i] = outcome
+        # Reused results cost no time in this run
+        busy_time = float(sum(outcome[4] for outcome in computed))
+        outcomes = iter(outcomes)
+
+        results = {}
+        refits = {}
+        for name, (pipeline, candidates, folds) in plans.items():
+            # Tasks were queued model by model, candidate by candidate, fold by fold
+            scores = np.array([next(outcomes) for _ in range(len(candidates) * len(folds))])
+            scores = scores.reshape(len(candidates), len(folds), -1)
+            if models[name].get('grid'):
+                cv_results = build_cv_results(candidates, scores[..., 0], scores[..., 1],
+                                              scores[..., 2], scores[..., 3])
+                refits[name] = (cv_results, len(folds))
+            else:
+                results[name] = {
+                    'fit_time': scores[0, :, 2],
+                    'score_time': scores[0, :, 3],
+                    'test_score': scores[0, :, 0],
+                    'train_score': scores[0, :, 1],
+                }
+
+        # The best candidates are refitted in the same pool
+        names = list(refits)
+        fitted = parallel(delayed(_refit)(plans[name][0], _best_params(refits[name][0]), X, y)
+                          for name in names)
+    for name, (best_estimator, refit_time) in zip(names, fitted):
+        busy_time += refit_time
+        cv_results, n_splits = refits[name]
+        results[name] = PathSearchResult(cv_results, best_estimator, n_splits,
+                                         len(cv_results['params']) * n_splits, refit_time)
+    wall_time = time.perf_counter() - start
+
+    workers = effective_n_jobs(n_jobs)
+    results['_schedule'] = {
+        'wall_time': wall_time,
+        'busy_time': busy_time,
+        'workers': workers,
+        'utilisation': busy_time / (wall_time * workers),
+        'computed': len(to_compute),
+        'reused': len(tasks) - len(to_compute),
+    }
+    return results
+
@@ -0,0 +1,76 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+import pandera as pa
+from pandera import Check, Column
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.chunked_validation import validate_in_chunks
+
+schema = pa.DataFrameSchema({
+    "age": Column(float, Check.between(1, 120), nullable=True),
+    "ejection_fraction": Column(int, Check.between(5, 90)),
+    "sex": Column(bool),
+    "DEATH_EVENT": Column(bool),
+})
+
+@pytest.fixture
+def valid_data():
+    """Create a mock dataset that satisfies the schema, with one missing age."""
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        "age": rng.uniform(40, 90, 50).round(3),
+        "ejection_fraction": rng.integers(10, 80, 50),
+        "sex": rng.choice([False, True], 50),
+        "DEATH_EVENT": rng.choice([False, True], 50),
+    })
+    data.loc[3, "age"] = np.nan
+    return data
+
+# Test: valid data gives an empty report, from a DataFrame or a file read in chunks
+def test_validate_in_chunks_valid(valid_data, tmp_path):
+    path = tmp_path / "data.csv"
+    valid_data.to_csv(path, index=False)
+    assert validate_in_chunks(valid_data, schema, chunksize=7, unique_rows=True, no_empty_rows=True).empty
+    assert validate_in_chunks(str(path), schema, chunksize=7, unique_rows=True, no_empty_rows=True).empty
+
+# Test: failures are counted per check with the same check names and rows as pandera reports
+def test_validate_in_chunks_matches_pandera(valid_data):
+    data = valid_data.copy()
+    data.loc[[2, 20, 41], "age"] = [0.5, 130.0, 200.0]
+    data.loc[[5, 33], "ejection_fraction"] = [1, 95]
+
+    report = validate_in_chunks(data, schema, chunksize=10).set_index("check")
+    with pytest.raises(pa.errors.SchemaErrors) as errors:
+        schema.validate(data, lazy=True)
+    expected = errors.value.failure_cases.groupby("check")["index"].agg(list)
+
+    assert set(report.index) == set(expected.index)
+    for check, index in expected.items():
+        assert report.loc[check, "failure_count"] == len(index)
+        assert report.loc[check, "sample_index"] == index
+    assert report.loc["in_range(1, 120)", "sample_failure_case"] == [0.5, 130.0, 200.0]
+
+# Test: duplicates are found across chunks, missing columns, wrong dtypes and empty rows are reported
+def test_validate_in_chunks_frame_checks(valid_data):
+    data = pd.concat([valid_data, valid_data.iloc[[1, 48]]], ignore_index=True)
+    data["ejection_fraction"] = data["ejection_fraction"].astype(float)
+    report = validate_in_chunks(data.drop(columns=["sex"]), schema, chunksize=9, unique_rows=True,
+                                no_empty_rows=True).set_index("check")
+
+    assert report.loc["Duplicate rows found.", "sample_index"] == [50, 51]
+    assert report.loc["column_in_dataframe", "sample_failure_case"] == ["sex"]
+    assert report.loc["dtype('int64')", "sample_failure_case"] == ["float64"]
+    assert "Empty rows found." not in report.index
+
+    empty = pd.DataFrame({column: [np.nan] for column in ["age", "ejection_fraction", "sex", "DEATH_EVENT"]})
+    report = validate_in_chunks(empty, schema, no_empty_rows=True)
+    assert report.set_index("check").loc["Empty rows found.", "failure_count"] == 1
+    assert set(report.loc[report["check"] == "not_nullable", "column"]) == {"ejection_fraction", "sex", "DEATH_EVENT"}
+
+# Test: to raise value error for checks that cannot be vectorized
+def test_validate_in_chunks_unsupported_check(valid_data):
+    custom = pa.DataFrameSchema({"age": Column(float, Check(lambda s: s > 0))})
+    with pytest.raises(ValueError, match="cannot be vectorized"):
+        validate_in_chunks(valid_data, custom)
@@ -1,9 +1,12 @@
 import os
 import sys
 import pytest
+import zipfile
 import pandas as pd
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from scripts.download_and_convert import convert_binary_columns
+from scripts.download_and_convert import convert_binary_columns, binary_columns_to_bool, write_converted_data
+from src.stream_convert_binary_columns import stream_convert_binary_columns
+from src.dataset_io import ZipMember
 
 @pytest.fixture
 def tmp_csv_file(tmp_path):
@@ -32,3 +35,54 @@ def test_convert_binary_columns(tmp_csv_file, tmp_path):
 
     # multi_val_col has multiple unique values and should remain unchanged
     assert converted["multi_val_col"].dtype != bool
+
+def test_binary_columns_to_bool_in_memory(tmp_csv_file):
+    data = pd.read_csv(tmp_csv_file)
+    converted, binary_columns = binary_columns_to_bool(data)
+
+    assert binary_columns == ["binary_col"]
+    assert converted["binary_col"].dtype == bool
+    # The input DataFrame is left unchanged
+    assert data["binary_col"].dtype != bool
+
+@pytest.fixture
+def tmp_mixed_csv_file(tmp_path):
+    # Columns whose type or binary status only shows after the first few rows
+    data = pd.DataFrame({
+        "binary_col": [0, 1, 1, 0, 1, 0, 0, 1],
+        "late_third_value": [1, 2, 1, 2, 1, 2, 1, 3],   # binary in the first chunk only
+        "late_missing": [5, 6, 5, 6, 5, 6, None, 5],     # binary, integer until a missing value appears
+        "flag": ["yes", "no", "no", "yes", "yes", "no", "no", "yes"],
+        "multi_val_col": [10, 20, 30, 40, 50, 60, 70, 80],
+    })
+    csv_file = tmp_path / "mixed.csv"
+    data.to_csv(csv_file, index=False)
+    return csv_file
+
+@pytest.mark.parametrize("chunksize", [3, 100])
+def test_convert_binary_columns_chunked(tmp_mixed_csv_file, tmp_path, chunksize):
+    expected, expected_columns = binary_columns_to_bool(pd.read_csv(tmp_mixed_csv_file))
+    output_file = convert_binary_columns(str(tmp_mixed_csv_file), str(tmp_path / "out"), chunksize=chunksize)
+
+    assert stream_convert_binary_columns(str(tmp_mixed_csv_file), str(tmp_path / "again.csv"),
+                                         chunksize=chunksize) == expected_columns
+    pd.testing.assert_frame_equal(pd.read_csv(output_file), pd.read_csv(write_converted_data(expected, str(tmp_path))))
+
+def test_convert_binary_columns_chunked_parquet(tmp_mixed_csv_file, tmp_path):
+    pytest.importorskip("pyarrow")
+    expected, _ = binary_columns_to_bool(pd.read_csv(tmp_mixed_csv_file))
+    output_file = convert_binary_columns(str(tmp_mixed_csv_file), str(tmp_path), file_format="parquet", chunksize=3)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(output_file), expected)
+
+# Test: a CSV file inside a ZIP archive converts the same as the extracted file, in memory and in chunks
+@pytest.mark.parametrize("chunksize", [None, 3])
+def test_convert_binary_columns_from_zip(tmp_mixed_csv_file, tmp_path, chunksize):
+    archive = str(tmp_path / "data.zip")
+    with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.write(tmp_mixed_csv_file, "mixed.csv")
+    expected = convert_binary_columns(str(tmp_mixed_csv_file), str(tmp_path / "expected"), chunksize=chunksize)
+    output_file = convert_binary_columns(ZipMember(archive, "mixed.csv"), str(tmp_path / "out"), chunksize=chunksize)
+
+    with open(output_file) as f, open(expected) as g:
+        assert f.read() == g.read()
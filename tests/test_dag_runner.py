@@ -0,0 +1,97 @@
+import pytest
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.dag_runner import Stage, run_stages, stage_dependencies, local_imports
+
+
+def copy_command(src, dst, log):
+    """Shell command copying `src` to `dst` and appending the stage run to `log`."""
+    return f'{sys.executable} -c "import shutil; shutil.copy(\'{src}\', \'{dst}\'); open(\'{log}\', \'a\').write(\'{dst}\\n\')"'
+
+
+@pytest.fixture
+def chain(tmp_path):
+    """A raw -> split -> (model, correlation) chain of stages."""
+    raw = tmp_path / "raw.csv"
+    raw.write_text("a,b\n1,2\n")
+    split, model, corr = (str(tmp_path / name) for name in ["split.csv", "model.csv", "corr.csv"])
+    log = str(tmp_path / "log.txt")
+    stages = [
+        Stage("split", copy_command(raw, split, log), inputs=[str(raw)], outputs=[split]),
+        Stage("model", copy_command(split, model, log), inputs=[split], outputs=[model]),
+        Stage("corr", copy_command(split, corr, log), inputs=[split], outputs=[corr]),
+    ]
+    return stages, raw, log, str(tmp_path / "state.json")
+
+def ran_stages(summary):
+    return {entry["name"] for entry in summary if entry["status"] == "ran"}
+
+# Test: dependencies are worked out from inputs and outputs
+def test_stage_dependencies(chain):
+    stages, _, _, _ = chain
+    assert stage_dependencies(stages) == {"split": set(), "model": {"split"}, "corr": {"split"}}
+
+# Test: a second run with unchanged inputs skips every stage
+def test_run_stages_skips_unchanged(chain):
+    stages, _, log, state_file = chain
+    first = run_stages(stages, state_file=state_file)
+    second = run_stages(stages, state_file=state_file)
+
+    assert ran_stages(first) == {"split", "model", "corr"}
+    assert ran_stages(second) == set()
+    assert len(open(log).read().split()) == 3
+
+# Test: changing an input reruns the stage and everything downstream of it
+def test_run_stages_reruns_changed(chain):
+    stages, raw, _, state_file = chain
+    run_stages(stages, state_file=state_file)
+    raw.write_text("a,b\n3,4\n")
+
+    assert ran_stages(run_stages(stages, state_file=state_file)) == {"split", "model", "corr"}
+
+# Test: independent stages run in parallel
+def test_run_stages_parallel(tmp_path):
+    sleep = f'{sys.executable} -c "import time; time.sleep(1)"'
+    stages = [Stage(f"sleep_{i}", sleep) for i in range(3)]
+
+    start = time.perf_counter()
+    run_stages(stages, state_file=str(tmp_path / "state.json"))
+    assert time.perf_counter() - start < 2.5
+
+# Test: a failing stage stops its dependants from running
+def test_run_stages_failure(chain):
+    stages, _, _, state_file = chain
+    stages[0].command = f'{sys.executable} -c "raise SystemExit(1)"'
+    summary = {entry["name"]: entry["status"] for entry in run_stages(stages, state_file=state_file)}
+
+    assert summary == {"split": "failed", "model": "not run", "corr": "not run"}
+
+# Test: to raise value error on a dependency cycle
+def test_stage_dependencies_cycle():
+    stages = [Stage("a", "true", inputs=["b.txt"], outputs=["a.txt"]),
+              Stage("b", "true", inputs=["a.txt"], outputs=["b.txt"])]
+    with pytest.raises(ValueError, match="dependency cycle"):
+        stage_dependencies(stages)
+
+# Test: a script's repository imports are found through the modules it imports
+def test_local_imports(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("import os\nfrom src.b import f\n")
+    (tmp_path / "src" / "b.py").write_text("from src import c\n")
+    (tmp_path / "src" / "c.py").write_text("import src.a\n")
+    (tmp_path / "src" / "unused.py").write_text("")
+    (tmp_path / "script.py").write_text("import numpy as np\nfrom src.a import g\n")
+
+    assert local_imports(str(tmp_path / "script.py"), root=str(tmp_path)) == ["src/a.py", "src/b.py", "src/c.py"]
+
+# Test: the Makefile rules list every repository module their script imports
+def test_makefile_prerequisites():
+    root = os.path.join(os.path.dirname(__file__), '..')
+    with open(os.path.join(root, "Makefile")) as f:
+        rules = [line for line in f if ":" in line and "scripts/" in line.split(":", 1)[1]]
+    for rule in rules:
+        prerequisites = rule.split(":", 1)[1].split()
+        script = next(path for path in prerequisites if path.startswith("scripts/"))
+        assert set(local_imports(os.path.join(root, script), root=root)) <= set(prerequisites), script
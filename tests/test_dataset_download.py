@@ -0,0 +1,198 @@
+import pytest
+import os
+import sys
+import io
+import hashlib
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+import requests
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.dataset_download import download_file
+from scripts.download_and_convert import download_and_extract_zip, select_csv_member
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves `server.files` with ETag, Last-Modified, conditional and Range requests, logging each request."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.log.append((self.path, dict(self.headers)))
+        content = self.server.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+        etag = f'"{hashlib.sha256(content).hexdigest()[:12]}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start, partial = 0, False
+        if self.headers.get('Range') and self.headers.get('If-Range', etag) == etag:
+            start, partial = int(self.headers['Range'].split('=')[1].rstrip('-')), True
+            if self.server.wrong_range_next:
+                # Answer with another range than the one asked for, as a misbehaving proxy might
+                start, self.server.wrong_range_next = 100, False
+        body = content[start:]
+        self.send_response(206 if partial else 200)
+        if partial:
+            self.send_header('Content-Range', f"bytes {start}-{len(content) - 1}/{len(content)}")
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', 'Fri, 18 Oct 2024 00:00:00 GMT')
+        self.end_headers()
+        if self.server.truncate_next:
+            # Drop the connection part way through, as a flaky network would
+            body = body[:self.server.truncate_next]
+            self.server.truncate_next = None
+            self.close_connection = True
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.files, server.log, server.truncate_next, server.wrong_range_next = {}, [], None, False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fixture_zip():
+    data = pd.DataFrame({"age": range(1000), "DEATH_EVENT": [0, 1] * 500})
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_ref:
+        zip_ref.writestr("notes.txt", "not a dataset")
+        zip_ref.writestr("heart_failure.csv", data.to_csv(index=False))
+    return buffer.getvalue()
+
+# Test: the file is streamed into the content-addressed cache and its hash checked
+def test_download_file_caches_by_content(server, tmp_path):
+    content = fixture_zip()
+    server.files["/data.zip"] = content
+    path = download_file(f"{server.url}/data.zip", str(tmp_path), chunk_size=100)
+
+    assert os.path.basename(path) == hashlib.sha256(content).hexdigest()
+    with open(path, 'rb') as f:
+        assert f.read() == content
+    assert os.listdir(tmp_path / "partial") == []
+
+# Test: an unchanged file is revalidated with its ETag and not downloaded again
+def test_download_file_revalidates(server, tmp_path):
+    server.files["/data.zip"] = fixture_zip()
+    first = download_file(f"{server.url}/data.zip", str(tmp_path))
+    second = download_file(f"{server.url}/data.zip", str(tmp_path))
+
+    assert first == second
+    assert len(server.log) == 2
+    headers = server.log[1][1]
+    assert headers['If-None-Match'].startswith('"')
+    assert headers['If-Modified-Since'] == 'Fri, 18 Oct 2024 00:00:00 GMT'
+
+    # A changed file is downloaded again
+    server.files["/data.zip"] = b"new content"
+    third = download_file(f"{server.url}/data.zip", str(tmp_path))
+    assert third != first
+    with open(third, 'rb') as f:
+        assert f.read() == b"new content"
+
+# Test: to raise value error if the cached copy of an unchanged file does not match the expected hash
+def test_download_file_revalidates_hash(server, tmp_path):
+    content = fixture_zip()
+    server.files["/data.zip"] = content
+    download_file(f"{server.url}/data.zip", str(tmp_path))
+    path = download_file(f"{server.url}/data.zip", str(tmp_path), sha256=hashlib.sha256(content).hexdigest().upper())
+    assert os.path.basename(path) == hashlib.sha256(content).hexdigest()
+
+    with pytest.raises(ValueError, match="cached copy"):
+        download_file(f"{server.url}/data.zip", str(tmp_path), sha256="0" * 64)
+    assert len(server.log) == 3
+
+# Test: an interrupted download resumes from the partial file with a Range request
+def test_download_file_resumes(server, tmp_path):
+    content = fixture_zip()
+    server.files["/data.zip"] = content
+    server.truncate_next = 500
+    with pytest.raises(requests.exceptions.RequestException):
+        download_file(f"{server.url}/data.zip", str(tmp_path), chunk_size=100)
+
+    path = download_file(f"{server.url}/data.zip", str(tmp_path), chunk_size=100)
+    assert server.log[1][1]['Range'] == "bytes=500-"
+    with open(path, 'rb') as f:
+        assert f.read() == content
+
+# Test: a partial file of a file that changed since is downloaded again from the start
+def test_download_file_restarts_changed_partial(server, tmp_path):
+    server.files["/data.zip"] = b"a" * 1000
+    server.truncate_next = 500
+    with pytest.raises(requests.exceptions.RequestException):
+        download_file(f"{server.url}/data.zip", str(tmp_path), chunk_size=100)
+
+    server.files["/data.zip"] = b"b" * 1000
+    path = download_file(f"{server.url}/data.zip", str(tmp_path), chunk_size=100)
+    assert server.log[1][1]['Range'] == "bytes=500-"
+    with open(path, 'rb') as f:
+        assert f.read() == b"b" * 1000
+
+# Test: a partial answer for another range than the one requested restarts with a plain GET
+def test_download_file_restarts_wrong_range(server, tmp_path):
+    content = fixture_zip()
+    server.files["/data.zip"] = content
+    server.truncate_next = 500
+    with pytest.raises(requests.exceptions.RequestException):
+        download_file(f"{server.url}/data.zip", str(tmp_path), chunk_size=100)
+
+    server.wrong_range_next = True
+    path = download_file(f"{server.url}/data.zip", str(tmp_path), chunk_size=100)
+    assert server.log[1][1]['Range'] == "bytes=500-"
+    assert 'Range' not in server.log[2][1]
+    with open(path, 'rb') as f:
+        assert f.read() == content
+
+# Test: a content hash mismatch or a missing URL raises a ValueError
+def test_download_file_errors(server, tmp_path):
+    server.files["/data.zip"] = fixture_zip()
+    with pytest.raises(ValueError, match="SHA-256"):
+        download_file(f"{server.url}/data.zip", str(tmp_path), sha256="0" * 64)
+    assert not os.path.exists(tmp_path / "index.json")
+
+    with pytest.raises(ValueError, match="does not exist or is inaccessible"):
+        download_file(f"{server.url}/missing.zip", str(tmp_path))
+
+# Test: download_and_extract_zip extracts the CSV of a ZIP served over HTTP, from the cache on a second run
+def test_download_and_extract_zip(server, tmp_path):
+    content = fixture_zip()
+    server.files["/data.zip"] = content
+    url = f"{server.url}/data.zip"
+    sha256 = hashlib.sha256(content).hexdigest()
+
+    extracted_csv = download_and_extract_zip(url, str(tmp_path), sha256=sha256)
+    assert os.path.basename(extracted_csv) == "heart_failure.csv"
+    assert len(pd.read_csv(extracted_csv)) == 1000
+
+    download_and_extract_zip(url, str(tmp_path), sha256=sha256)
+    assert 'If-None-Match' in server.log[1][1]
+
+    with pytest.raises(ValueError, match="does not point to a ZIP file"):
+        download_and_extract_zip(f"{server.url}/data.csv", str(tmp_path))
+
+# Test: the CSV member is chosen from the archive's member list, not the directory listing
+def test_select_csv_member(tmp_path):
+    archive = str(tmp_path / "data.zip")
+    with zipfile.ZipFile(archive, 'w') as zip_ref:
+        zip_ref.writestr("b.csv", "x\n1\n")
+        zip_ref.writestr("a.csv", "x\n2\n")
+    # A CSV file already in the directory is not picked up
+    (tmp_path / "0.csv").write_text("x\n3\n")
+
+    assert select_csv_member(archive) == "b.csv"
+    assert select_csv_member(archive, "a.csv") == "a.csv"
+    with pytest.raises(ValueError, match="no member"):
+        select_csv_member(archive, "0.csv")
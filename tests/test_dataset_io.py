@@ -0,0 +1,74 @@
+import pytest
+import zipfile
+import os
+import sys
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.dataset_io import read_dataset, write_dataset, iter_dataset_chunks, with_format, ZipMember, zip_members
+
+sample_data = pd.DataFrame({
+    "age": [50.0, 60.0, 70.0, 80.0, 55.0],
+    "anaemia": [True, False, False, True, False],
+    "ejection_fraction": [35, 50, 25, 40, 45],
+    "DEATH_EVENT": [True, False, False, True, False],
+})
+
+# Test: datasets round-trip with their dtypes in every format
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_dataset_round_trip(tmp_path, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"data{extension}")
+    write_dataset(sample_data, path)
+
+    pd.testing.assert_frame_equal(read_dataset(path), sample_data)
+
+# Test: only the requested columns are read
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_dataset_column_projection(tmp_path, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"data{extension}")
+    write_dataset(sample_data, path)
+
+    assert list(read_dataset(path, columns=["age", "anaemia"]).columns) == ["age", "anaemia"]
+
+# Test: chunked reads return every row in order
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_iter_dataset_chunks(tmp_path, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"data{extension}")
+    write_dataset(sample_data, path)
+
+    chunks = list(iter_dataset_chunks(path, chunksize=2))
+    assert max(len(chunk) for chunk in chunks) <= 2
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), sample_data)
+
+# Test: to raise value error on an unsupported file extension
+def test_dataset_unsupported_format(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported dataset format"):
+        read_dataset(str(tmp_path / "data.xlsx"))
+    with pytest.raises(ValueError, match="file_format must be one of"):
+        with_format("data.csv", "xlsx")
+
+# Test: a CSV file inside a ZIP archive is read whole and in chunks without extracting it
+def test_zip_member(tmp_path):
+    archive = str(tmp_path / "data.zip")
+    with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.writestr("readme.txt", "not a dataset")
+        zip_ref.writestr("data/heart.csv", sample_data.to_csv(index=False))
+    source = ZipMember(archive, "data/heart.csv")
+
+    assert zip_members(archive) == ["readme.txt", "data/heart.csv"]
+    pd.testing.assert_frame_equal(read_dataset(source), sample_data)
+    pd.testing.assert_frame_equal(read_dataset(source, columns=["age"]), sample_data[["age"]])
+    chunks = list(iter_dataset_chunks(source, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), sample_data)
+    assert os.listdir(tmp_path) == ["data.zip"]
+
+    with pytest.raises(ValueError, match="no member"):
+        read_dataset(ZipMember(archive, "missing.csv"))
+    with pytest.raises(ValueError, match="Unsupported dataset format"):
+        read_dataset(ZipMember(archive, "readme.txt"))
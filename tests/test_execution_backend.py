@@ -0,0 +1,82 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+from dask.distributed import LocalCluster
+from joblib import Parallel, delayed
+from sklearn.linear_model import LogisticRegression
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.execution_backend import execution_backend
+from src.model_fit import model_fit
+from src.tuning_scheduler import tune_models
+
+@pytest.fixture
+def mock_data():
+    """Create a mock dataset with numeric and boolean columns."""
+    rng = np.random.default_rng(123)
+    return pd.DataFrame({
+        "age": rng.uniform(40, 80, 100),
+        "serum_creatinine": rng.uniform(0.5, 2.5, 100),
+        "anaemia": rng.choice([False, True], 100),
+        "DEATH_EVENT": rng.choice([0, 1], 100),
+    })
+
+def make_preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), ["age", "serum_creatinine"]),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), ["anaemia"]),
+        remainder="passthrough"
+    )
+
+grid = {"logisticregression__C": [0.1, 1, 10]}
+
+# Test: a search on another backend gives the same results as the default one
+def test_model_fit_threading_backend(mock_data):
+    model = LogisticRegression(max_iter=1000)
+    _, default = model_fit(model, make_preprocessor(), grid, mock_data)
+    _, threaded = model_fit(model, make_preprocessor(), grid, mock_data, backend="threading", n_jobs=2)
+
+    np.testing.assert_allclose(threaded.cv_results_["mean_test_score"], default.cv_results_["mean_test_score"])
+    assert threaded.best_params_ == default.best_params_
+
+# Test: to raise value error for an unknown backend
+def test_execution_backend_unknown():
+    with pytest.raises(ValueError, match="Unknown execution backend"):
+        with execution_backend("spark"):
+            pass
+
+# Test: to raise value error if shared data is asked for on a cluster
+def test_model_fit_backend_shared_data(mock_data):
+    with pytest.raises(ValueError, match="shared_data"):
+        model_fit(LogisticRegression(), make_preprocessor(), grid, mock_data, shared_data=True, backend="dask")
+
+# Test: the search and the shared pool give the same results on a Dask cluster, with the data scattered once
+def test_dask_backend(mock_data):
+    model = LogisticRegression(max_iter=1000)
+    _, default = model_fit(model, make_preprocessor(), grid, mock_data)
+
+    # An in-process cluster, reached by its address like a remote scheduler
+    with LocalCluster(n_workers=2, threads_per_worker=1, processes=False, dashboard_address=None) as cluster:
+        _, on_dask = model_fit(model, make_preprocessor(), grid, mock_data, backend=cluster.scheduler_address,
+                               n_jobs=2)
+        np.testing.assert_allclose(on_dask.cv_results_["mean_test_score"], default.cv_results_["mean_test_score"])
+        assert on_dask.best_params_ == default.best_params_
+
+        results = tune_models({'lr': {'model': model, 'preprocessor': make_preprocessor(), 'grid': grid}},
+                              mock_data, n_jobs=2, backend=cluster.scheduler_address)
+        np.testing.assert_allclose(results['lr'].cv_results_["mean_test_score"],
+                                   default.cv_results_["mean_test_score"])
+
+    # A local cluster started by the backend itself
+    _, on_local = model_fit(model, make_preprocessor(), grid, mock_data, backend="dask", n_jobs=2)
+    np.testing.assert_allclose(on_local.cv_results_["mean_test_score"], default.cv_results_["mean_test_score"])
+
+# Test: data passed to scatter reaches the tasks as the same values
+def test_execution_backend_scatter(mock_data):
+    with LocalCluster(n_workers=1, threads_per_worker=2, processes=False, dashboard_address=None) as cluster:
+        with execution_backend(cluster.scheduler_address, n_jobs=2, scatter=[mock_data]):
+            sums = Parallel()(delayed(lambda data, i: data["age"].sum() + i)(mock_data, i) for i in range(4))
+    np.testing.assert_allclose(sums, mock_data["age"].sum() + np.arange(4))
@@ -0,0 +1,84 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fold_score_cache import FoldScoreCache
+from src.model_fit import model_fit
+
+@pytest.fixture
+def mock_data():
+    """Create a mock dataset with numeric and boolean columns."""
+    rng = np.random.default_rng(123)
+    return pd.DataFrame({
+        "age": rng.uniform(40, 80, 100),
+        "serum_creatinine": rng.uniform(0.5, 2.5, 100),
+        "anaemia": rng.choice([False, True], 100),
+        "DEATH_EVENT": rng.choice([0, 1], 100),
+    })
+
+def make_preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), ["age", "serum_creatinine"]),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), ["anaemia"]),
+        remainder="passthrough"
+    )
+
+# Test: keys depend on the configuration, not on how the pipeline or values were built
+def test_fold_score_cache_key(tmp_path):
+    cache = FoldScoreCache(str(tmp_path))
+    test = np.arange(10)
+    key = cache.key("data", make_pipeline(make_preprocessor(), LogisticRegression()), {"logisticregression__C": 10.0}, test)
+
+    assert key == cache.key("data", make_pipeline(make_preprocessor(), LogisticRegression()),
+                            {"logisticregression__C": np.float64(10.0)}, test)
+    assert key != cache.key("data", make_pipeline(make_preprocessor(), LogisticRegression(max_iter=50)),
+                            {"logisticregression__C": 10.0}, test)
+    assert key != cache.key("other data", make_pipeline(make_preprocessor(), LogisticRegression()),
+                            {"logisticregression__C": 10.0}, test)
+    assert key != cache.key("data", make_pipeline(make_preprocessor(), LogisticRegression()),
+                            {"logisticregression__C": 10.0}, test + 10)
+
+    assert cache.get(key) is None
+    cache.put(key, {"test_score": 0.5})
+    assert cache.get(key) == {"test_score": 0.5}
+    assert len(cache) == 1
+
+# Test: a repeated search reuses every fold and an extended grid only computes the new candidates
+def test_model_fit_cache_dir_reuse(mock_data, tmp_path, capsys):
+    model = LogisticRegression(max_iter=1000)
+    _, first = model_fit(model, make_preprocessor(), {"logisticregression__C": [0.1, 1]}, mock_data,
+                         cache_dir=str(tmp_path))
+    assert "0 reused" in capsys.readouterr().out
+
+    _, extended = model_fit(model, make_preprocessor(), {"logisticregression__C": [0.1, 1, 10]}, mock_data,
+                            cache_dir=str(tmp_path))
+    assert "20 reused from" in capsys.readouterr().out
+    assert len(FoldScoreCache(str(tmp_path))) == 30
+
+    _, uncached = model_fit(model, make_preprocessor(), {"logisticregression__C": [0.1, 1, 10]}, mock_data)
+    np.testing.assert_allclose(extended.cv_results_["mean_test_score"], uncached.cv_results_["mean_test_score"])
+    np.testing.assert_allclose(extended.cv_results_["split0_test_score"][:2], first.cv_results_["split0_test_score"])
+
+# Test: folds finished before a search fails are kept and reused when it is run again
+def test_model_fit_cache_dir_resume(mock_data, tmp_path, capsys):
+    model = LogisticRegression(max_iter=1000)
+    # C must be positive, so the last candidate fails after the first one has finished
+    with pytest.raises(ValueError):
+        model_fit(model, make_preprocessor(), {"logisticregression__C": [1, -1]}, mock_data,
+                  cache_dir=str(tmp_path), n_jobs=1)
+    assert len(FoldScoreCache(str(tmp_path))) == 10
+
+    model_fit(model, make_preprocessor(), {"logisticregression__C": [1, 10]}, mock_data, cache_dir=str(tmp_path))
+    assert "10 reused from" in capsys.readouterr().out
+
+# Test: to raise value error if a cache is asked for with another search strategy
+def test_model_fit_cache_dir_invalid_search(mock_data, tmp_path):
+    with pytest.raises(ValueError, match="cache_dir"):
+        model_fit(LogisticRegression(), make_preprocessor(), {"logisticregression__C": [1]}, mock_data,
+                  search="path", cache_dir=str(tmp_path))
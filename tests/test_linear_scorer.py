@@ -0,0 +1,82 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.linear_scorer import export_linear_scorer, load_linear_scorer
+
+numeric_columns = ["age", "ejection_fraction", "serum_creatinine"]
+binary_columns = ["anaemia", "sex"]
+
+@pytest.fixture
+def mock_data():
+    """Create a mock dataset with numeric, boolean and passthrough columns."""
+    rng = np.random.default_rng(123)
+    return pd.DataFrame({
+        "age": rng.integers(40, 80, 100).astype(float),
+        "ejection_fraction": rng.integers(10, 60, 100),
+        "serum_creatinine": rng.uniform(0.5, 2.5, 100),
+        "anaemia": rng.choice([False, True], 100),
+        "sex": rng.choice([False, True], 100),
+        "time": rng.integers(0, 300, 100),
+        "DEATH_EVENT": rng.choice([0, 1], 100),
+    })
+
+def fit_pipeline(data, model, drop='if_binary'):
+    preprocessor = make_column_transformer(
+        (StandardScaler(), numeric_columns),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop=drop, dtype=int), binary_columns),
+        remainder='passthrough'
+    )
+    pipeline = make_pipeline(preprocessor, model)
+    return pipeline.fit(data.drop(columns=["DEATH_EVENT"]), data["DEATH_EVENT"])
+
+# Test: the fused scorer matches the original pipeline
+def test_linear_scorer_parity(mock_data):
+    pipeline = fit_pipeline(mock_data, LogisticRegression(C=10, max_iter=2000))
+    scorer = export_linear_scorer(pipeline)
+
+    X = mock_data[scorer.feature_names].to_numpy(dtype=float)
+    np.testing.assert_allclose(scorer.predict_proba(X), pipeline.predict_proba(mock_data), atol=1e-10)
+    np.testing.assert_array_equal(scorer.predict(X), pipeline.predict(mock_data))
+
+# Test: a binary column with a single category in the training data is folded correctly, whatever the drop
+@pytest.mark.parametrize("drop", ["if_binary", "first", None])
+def test_linear_scorer_single_category(mock_data, drop):
+    mock_data["anaemia"] = False
+    pipeline = fit_pipeline(mock_data, LogisticRegression(max_iter=2000), drop=drop)
+    scorer = export_linear_scorer(pipeline)
+
+    X = mock_data[scorer.feature_names].to_numpy(dtype=float)
+    np.testing.assert_allclose(scorer.predict_proba(X), pipeline.predict_proba(mock_data), atol=1e-10)
+
+# Test: a single row can be scored with a 1-D array
+def test_linear_scorer_single_row(mock_data):
+    pipeline = fit_pipeline(mock_data, LogisticRegression(max_iter=2000))
+    scorer = export_linear_scorer(pipeline)
+
+    row = mock_data[scorer.feature_names].to_numpy(dtype=float)[0]
+    assert scorer.predict_proba(row)[1] == pytest.approx(pipeline.predict_proba(mock_data.iloc[[0]])[0, 1])
+
+# Test: the saved artifact round-trips
+def test_linear_scorer_save_and_load(mock_data, tmp_path):
+    pipeline = fit_pipeline(mock_data, LogisticRegression(max_iter=2000))
+    path = tmp_path / "scorer.npz"
+    scorer = export_linear_scorer(pipeline, str(path))
+    loaded = load_linear_scorer(str(path))
+
+    assert loaded.feature_names == scorer.feature_names
+    assert loaded.intercept == pytest.approx(scorer.intercept)
+    np.testing.assert_allclose(loaded.coef, scorer.coef)
+
+# Test: to raise value error if the final step is not a linear classifier
+def test_linear_scorer_non_linear_model(mock_data):
+    pipeline = fit_pipeline(mock_data, KNeighborsClassifier())
+    with pytest.raises(ValueError, match="binary linear classifier"):
+        export_linear_scorer(pipeline)
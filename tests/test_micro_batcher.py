@@ -0,0 +1,138 @@
+import pytest
+import os
+import sys
+import json
+import threading
+import urllib.request
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.micro_batcher import MicroBatcher
+from scripts.serve_model import make_server
+
+
+class RecordingModel:
+    """Fake model that records the size of each batch it scores."""
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_proba(self, X):
+        if X.reindex(columns=["x"])["x"].isna().any():
+            raise ValueError("Missing values in 'x'.")
+        self.batch_sizes.append(len(X))
+        p = 1 / (1 + np.exp(-X["x"].to_numpy()))
+        return np.column_stack([1 - p, p])
+
+
+def submit_concurrently(batcher, n_requests):
+    results = [None] * n_requests
+
+    def worker(i):
+        results[i] = batcher.submit(pd.DataFrame({"x": [float(i)]}))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+# Test: concurrent requests are combined into fewer batches and get their own results back
+def test_micro_batcher_combines_requests():
+    model = RecordingModel()
+    batcher = MicroBatcher(model.predict_proba, max_batch_size=16, max_wait=0.05)
+    results = submit_concurrently(batcher, 40)
+    batcher.close()
+
+    assert sum(model.batch_sizes) == 40
+    assert len(model.batch_sizes) < 40
+    assert max(model.batch_sizes) <= 16
+    for i, result in enumerate(results):
+        np.testing.assert_allclose(result, model.predict_proba(pd.DataFrame({"x": [float(i)]})))
+
+# Test: stats report latency percentiles and throughput
+def test_micro_batcher_stats():
+    batcher = MicroBatcher(RecordingModel().predict_proba, max_batch_size=8, max_wait=0.01)
+    submit_concurrently(batcher, 10)
+    stats = batcher.stats()
+    batcher.close()
+
+    assert stats["requests"] == 10
+    assert stats["rows"] == 10
+    assert stats["p50_latency_ms"] <= stats["p99_latency_ms"]
+    assert stats["throughput_rows_per_s"] > 0
+
+# Test: a failing request does not fail the other requests in its batch
+def test_micro_batcher_isolates_errors():
+    batcher = MicroBatcher(RecordingModel().predict_proba, max_batch_size=8, max_wait=0.05)
+    errors = []
+
+    def bad_request():
+        try:
+            batcher.submit(pd.DataFrame({"y": [1.0]}))
+        except ValueError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=bad_request)
+    thread.start()
+    results = submit_concurrently(batcher, 5)
+    thread.join()
+    batcher.close()
+
+    assert len(errors) == 1
+    assert all(result.shape == (1, 2) for result in results)
+
+# Test: only the most recent latencies are kept, while every request is counted
+def test_micro_batcher_bounded_latencies():
+    batcher = MicroBatcher(RecordingModel().predict_proba, max_wait=0, latency_window=5)
+    for i in range(12):
+        batcher.submit(pd.DataFrame({"x": [float(i)]}))
+    stats = batcher.stats()
+    batcher.close()
+
+    assert len(batcher._latencies) == 5
+    assert stats["requests"] == 12
+
+# Test: a closed batcher rejects new requests instead of leaving them waiting
+def test_micro_batcher_rejects_after_close():
+    batcher = MicroBatcher(RecordingModel().predict_proba)
+    batcher.close()
+    batcher.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(pd.DataFrame({"x": [1.0]}))
+
+# Test: to raise value error if batch size is invalid
+def test_micro_batcher_invalid_batch_size():
+    with pytest.raises(ValueError, match="max_batch_size must be a positive integer."):
+        MicroBatcher(RecordingModel().predict_proba, max_batch_size=0)
+
+# Test: the HTTP service scores single and batch payloads
+def test_serve_model_single_and_batch():
+    X = pd.DataFrame({"x": np.linspace(-3, 3, 20)})
+    pipeline = LogisticRegression().fit(X, (X["x"] > 0).astype(int))
+    server = make_server(pipeline, port=0, max_wait_ms=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def post(payload):
+        request = urllib.request.Request(f"{url}/predict", data=json.dumps(payload).encode(),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    try:
+        single = post({"x": 2.5})
+        batch = post({"instances": [{"x": -2.5}, {"x": 2.5}]})
+        with urllib.request.urlopen(f"{url}/stats") as response:
+            stats = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+
+    assert single["predictions"] == [1]
+    assert batch["predictions"] == [0, 1]
+    assert batch["probabilities"][1] == pytest.approx(pipeline.predict_proba(pd.DataFrame({"x": [2.5]}))[0, 1])
+    assert stats["requests"] == 2
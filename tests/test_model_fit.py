@@ -114,4 +114,30 @@ def test_model_fit_cross_validation_results(mock_data, preprocessor):
     # Assertions for CV results
     expected_keys = ["mean_test_score", "std_test_score", "mean_train_score", "std_train_score"]
     for key in expected_keys:
-        assert key in cv_results
\ No newline at end of file
+        assert key in cv_results
+
+# Test: caching the preprocessor gives the same search results with one transformer fit per fold
+def test_model_fit_cached_transformers(mock_data, preprocessor):
+    param_grid = {"logisticregression__C": [0.1, 1, 10]}
+    model = LogisticRegression(max_iter=1000, random_state=123)
+
+    _, cached = model_fit(model, preprocessor, param_grid, mock_data, cache_transformers=True)
+    _, uncached = model_fit(model, preprocessor, param_grid, mock_data, cache_transformers=False)
+
+    np.testing.assert_allclose(cached.cv_results_["mean_test_score"], uncached.cv_results_["mean_test_score"])
+    # 3 candidates x 10 folds + 1 refit requested, 10 folds + 1 refit fitted
+    assert cached.n_transformer_fits_saved_ == 20
+    assert cached.best_estimator_.memory is None
+
+# Test: successive halving drops candidates between rounds and still returns a fitted best model
+def test_model_fit_halving(mock_data, preprocessor):
+    param_grid = {"logisticregression__C": [0.001, 0.01, 0.1, 1, 10]}
+    model = LogisticRegression(max_iter=1000, random_state=123)
+
+    best_model, search = model_fit(model, preprocessor, param_grid, mock_data, search="halving",
+                                   halving_factor=2, min_resources=40)
+
+    assert "logisticregression" in best_model.named_steps
+    assert search.n_resources_ == [40, 80]
+    assert search.n_candidates_ == [5, 3]
+    assert search.n_fits_ == 8 * 10
@@ -0,0 +1,65 @@
+import pytest
+import os
+import sys
+import pickle
+import pandas as pd
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.partitioned_fit import pack_partitions, partitioned_fit
+from src.model_fit import model_fit
+
+@pytest.fixture
+def mock_data():
+    """Create a mock dataset of three sites of different sizes."""
+    rng = np.random.default_rng(123)
+    n = 260
+    data = pd.DataFrame({
+        "site": np.repeat(["a", "b", "c"], [140, 60, 60]),
+        "age": rng.uniform(40, 80, n),
+        "serum_creatinine": rng.uniform(0.5, 2.5, n),
+        "anaemia": rng.choice([False, True], n),
+    })
+    data["DEATH_EVENT"] = data["serum_creatinine"] + rng.normal(0, 0.5, n) > 1.6
+    return data
+
+def make_preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), ["age", "serum_creatinine"]),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), ["anaemia"]),
+        remainder="passthrough"
+    )
+
+grid = {"logisticregression__C": [0.1, 1, 10]}
+
+# Test: the largest partitions are spread first and small ones fill the least loaded worker
+def test_pack_partitions():
+    bins = pack_partitions({"a": 100, "b": 60, "c": 50, "d": 30, "e": 20}, 2)
+    assert bins == [["a", "d"], ["b", "c", "e"]]
+    assert pack_partitions({"a": 10}, 4) == [["a"]]
+
+# Test: every partition gets its own pipeline, the same as tuning it on its own
+def test_partitioned_fit(mock_data, tmp_path):
+    scores, coefficients, schedule = partitioned_fit(mock_data, "site", LogisticRegression(max_iter=1000),
+                                                     make_preprocessor(), grid, str(tmp_path), n_jobs=2)
+
+    assert list(scores["partition"]) == ["a", "b", "c"]
+    assert list(scores["n_rows"]) == [140, 60, 60]
+    assert set(coefficients["partition"]) == {"a", "b", "c"}
+    assert schedule["workers"] == 2
+
+    with open(tmp_path / "b" / "pipeline.pickle", "rb") as f:
+        pipeline = pickle.load(f)
+    site_b = mock_data[mock_data["site"] == "b"].drop(columns=["site"])
+    expected, _ = model_fit(LogisticRegression(max_iter=1000), make_preprocessor(), grid, site_b, search="path")
+    np.testing.assert_allclose(pipeline[-1].coef_, expected[-1].coef_)
+
+# Test: to raise value error if a partition is too small to cross-validate
+def test_partitioned_fit_too_small(mock_data, tmp_path):
+    data = pd.concat([mock_data, mock_data.head(5).assign(site="d")])
+    with pytest.raises(ValueError, match=r"\['d'\]"):
+        partitioned_fit(data, "site", LogisticRegression(), make_preprocessor(), grid, str(tmp_path))
+    with pytest.raises(ValueError, match="region"):
+        partitioned_fit(mock_data, "region", LogisticRegression(), make_preprocessor(), grid, str(tmp_path))
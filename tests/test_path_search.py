@@ -0,0 +1,150 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.svm import SVC
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.path_search import knn_path_search, lr_path_search, tree_path_search, _pruning_sequence
+from src.model_fit import model_fit
+
+@pytest.fixture
+def mock_data():
+    """Create a mock dataset with continuous and binary features."""
+    rng = np.random.default_rng(123)
+    return pd.DataFrame({
+        "age": rng.uniform(40, 80, 200),
+        "ejection_fraction": rng.uniform(10, 60, 200),
+        "serum_creatinine": rng.uniform(0.5, 2.5, 200),
+        "anaemia": rng.choice([False, True], 200),
+        "sex": rng.choice([False, True], 200),
+        "DEATH_EVENT": rng.choice([0, 1], 200, p=[0.7, 0.3]),
+    })
+
+@pytest.fixture
+def preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), ["age", "ejection_fraction", "serum_creatinine"]),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), ["anaemia", "sex"]),
+        remainder="passthrough"
+    )
+
+# Test: the path search gives the same scores and best k as GridSearchCV
+def test_knn_path_search_matches_grid_search(mock_data, preprocessor):
+    grid = {"kneighborsclassifier__n_neighbors": range(1, 60, 4)}
+    X, y = mock_data.drop(columns=["DEATH_EVENT"]), mock_data["DEATH_EVENT"]
+    grid_search = GridSearchCV(make_pipeline(preprocessor, KNeighborsClassifier()), grid, cv=10,
+                               return_train_score=True).fit(X, y)
+
+    path_search = knn_path_search(KNeighborsClassifier(), preprocessor, grid, mock_data)
+
+    for key in ["mean_test_score", "std_test_score", "split0_test_score", "mean_train_score", "rank_test_score"]:
+        np.testing.assert_allclose(path_search.cv_results_[key], grid_search.cv_results_[key])
+    assert path_search.best_params_ == grid_search.best_params_
+    assert path_search.best_score_ == pytest.approx(grid_search.best_score_)
+    np.testing.assert_array_equal(path_search.best_estimator_.predict(X), grid_search.best_estimator_.predict(X))
+
+# Test: model_fit returns a results table the modelling script can use
+def test_model_fit_path_search(mock_data, preprocessor):
+    grid = {"kneighborsclassifier__n_neighbors": [3, 5, 7]}
+    best_model, search = model_fit(KNeighborsClassifier(), preprocessor, grid, mock_data, search="path")
+
+    assert "kneighborsclassifier" in best_model.named_steps
+    results = pd.DataFrame(search.cv_results_)
+    assert list(results["param_kneighborsclassifier__n_neighbors"]) == [3, 5, 7]
+    assert search.best_params_["kneighborsclassifier__n_neighbors"] in [3, 5, 7]
+
+    # Models without a path search are not sent to the KNN one
+    with pytest.raises(ValueError, match="not SVC"):
+        model_fit(SVC(), preprocessor, {"svc__C": [0.1, 1]}, mock_data, search="path")
+
+# Test: to raise value error for models or grids the KNN path search does not support
+def test_knn_path_search_invalid(mock_data, preprocessor):
+    grid = {"kneighborsclassifier__n_neighbors": [3, 5]}
+    with pytest.raises(ValueError, match="weights='uniform'"):
+        knn_path_search(KNeighborsClassifier(weights="distance"), preprocessor, grid, mock_data)
+    with pytest.raises(ValueError, match="only tunes"):
+        knn_path_search(KNeighborsClassifier(), preprocessor, {"kneighborsclassifier__p": [1, 2]}, mock_data)
+    with pytest.raises(ValueError, match="larger than the smallest training fold"):
+        knn_path_search(KNeighborsClassifier(), preprocessor, {"kneighborsclassifier__n_neighbors": [500]}, mock_data)
+
+# Test: to raise value error for an unknown search strategy
+def test_model_fit_invalid_search(mock_data, preprocessor):
+    with pytest.raises(ValueError, match="search must be"):
+        model_fit(KNeighborsClassifier(), preprocessor, {"kneighborsclassifier__n_neighbors": [3]}, mock_data,
+                  search="random")
+
+# Test: to raise value error for options the path search cannot use
+@pytest.mark.parametrize("options", [{"shared_data": True}, {"backend": "threading"}, {"n_jobs": 2}, {"n_jobs": -1}])
+def test_model_fit_path_unsupported_options(mock_data, preprocessor, options):
+    with pytest.raises(ValueError, match="shared_data|search='path'"):
+        model_fit(KNeighborsClassifier(), preprocessor, {"kneighborsclassifier__n_neighbors": [3]}, mock_data,
+                  search="path", **options)
+
+# Test: the warm-started C path agrees with GridSearchCV and needs fewer solver iterations
+def test_lr_path_search_matches_grid_search(mock_data, preprocessor):
+    grid = {"logisticregression__C": 10.0 ** np.arange(-3, 3)}
+    model = LogisticRegression(max_iter=2000, class_weight="balanced", random_state=123)
+    X, y = mock_data.drop(columns=["DEATH_EVENT"]), mock_data["DEATH_EVENT"]
+    grid_search = GridSearchCV(make_pipeline(preprocessor, model), grid, cv=10, return_train_score=True).fit(X, y)
+
+    warm = lr_path_search(model, preprocessor, grid, mock_data)
+    cold = lr_path_search(model, preprocessor, grid, mock_data, warm_start=False)
+
+    np.testing.assert_allclose(warm.cv_results_["mean_test_score"], grid_search.cv_results_["mean_test_score"], atol=0.01)
+    assert warm.best_params_ == grid_search.best_params_
+    np.testing.assert_allclose(warm.best_estimator_[-1].coef_, grid_search.best_estimator_[-1].coef_)
+    assert warm.n_iter_ < cold.n_iter_
+    assert len(warm.cv_results_["mean_n_iter"]) == len(grid["logisticregression__C"])
+
+# Test: model_fit uses the C path for logistic regression
+def test_model_fit_lr_path_search(mock_data, preprocessor):
+    grid = {"logisticregression__C": [0.1, 1, 10]}
+    best_model, search = model_fit(LogisticRegression(max_iter=1000), preprocessor, grid, mock_data, search="path")
+
+    assert "logisticregression" in best_model.named_steps
+    assert hasattr(search, "n_iter_")
+    with pytest.raises(ValueError, match="warm_start"):
+        lr_path_search(LogisticRegression(solver="liblinear"), preprocessor, grid, mock_data)
+
+# Test: the pruning path search gives the same scores and best ccp_alpha as GridSearchCV
+def test_tree_path_search_matches_grid_search(mock_data, preprocessor):
+    model = DecisionTreeClassifier(random_state=522)
+    X, y = mock_data.drop(columns=["DEATH_EVENT"]), mock_data["DEATH_EVENT"]
+    # Candidates on the folds' pruning-path breakpoints, where an off-by-one step in the pruning would show
+    alphas = tree_path_search(model, preprocessor, None, mock_data).cv_results_["param_decisiontreeclassifier__ccp_alpha"]
+    grid = {"decisiontreeclassifier__ccp_alpha": alphas.data.tolist()[::8]}
+    path_search = tree_path_search(model, preprocessor, grid, mock_data)
+    grid_search = GridSearchCV(make_pipeline(preprocessor, model), grid, cv=10, return_train_score=True).fit(X, y)
+
+    for key in ["mean_test_score", "split3_test_score", "mean_train_score", "rank_test_score"]:
+        np.testing.assert_array_equal(path_search.cv_results_[key], grid_search.cv_results_[key])
+    assert path_search.best_params_ == grid_search.best_params_
+    assert path_search.n_fits_ == 10
+    np.testing.assert_array_equal(path_search.best_estimator_.predict(X), grid_search.best_estimator_.predict(X))
+
+# Test: the pruning sequence has the effective alphas of cost_complexity_pruning_path
+def test_pruning_sequence(mock_data, preprocessor):
+    X = preprocessor.fit_transform(mock_data.drop(columns=["DEATH_EVENT"]))
+    tree = DecisionTreeClassifier(random_state=0).fit(X, mock_data["DEATH_EVENT"])
+    nodes, alphas = _pruning_sequence(tree.tree_)
+
+    np.testing.assert_array_equal(alphas, tree.cost_complexity_pruning_path(X, mock_data["DEATH_EVENT"]).ccp_alphas[1:])
+    assert nodes[-1] == 0
+
+# Test: model_fit uses the pruning path for decision trees
+def test_model_fit_tree_path_search(mock_data, preprocessor):
+    grid = {"decisiontreeclassifier__ccp_alpha": [0.0, 0.01, 0.05]}
+    best_model, search = model_fit(DecisionTreeClassifier(random_state=1), preprocessor, grid, mock_data, search="path")
+
+    assert "decisiontreeclassifier" in best_model.named_steps
+    assert list(pd.DataFrame(search.cv_results_)["param_decisiontreeclassifier__ccp_alpha"]) == [0.0, 0.01, 0.05]
+    with pytest.raises(ValueError, match="only tunes"):
+        tree_path_search(DecisionTreeClassifier(), preprocessor, {"decisiontreeclassifier__max_depth": [2]}, mock_data)
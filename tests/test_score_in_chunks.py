@@ -0,0 +1,94 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.score_in_chunks import score_in_chunks, scores_from_confusion
+
+
+@pytest.fixture
+def scoring_data(tmp_path, request):
+    """Write a small labelled dataset to CSV and fit a classifier on it (labels are bool if parametrized so)."""
+    rng = np.random.default_rng(123)
+    data = pd.DataFrame({
+        "x1": rng.normal(size=50),
+        "x2": rng.normal(size=50),
+    })
+    data["DEATH_EVENT"] = (data["x1"] + rng.normal(scale=0.5, size=50) > 0).astype(getattr(request, "param", int))
+    csv_file = tmp_path / "test.csv"
+    data.to_csv(csv_file, index=False)
+
+    model = LogisticRegression().fit(data[["x1", "x2"]], data["DEATH_EVENT"])
+
+    class ColumnSelector:
+        """Mimic the pipeline, which ignores the target column when predicting."""
+        classes_ = model.classes_
+
+        def __init__(self):
+            self.n_calls = 0
+
+        def predict(self, X):
+            self.n_calls += 1
+            return model.predict(X[["x1", "x2"]])
+
+        def predict_proba(self, X):
+            self.n_calls += 1
+            return model.predict_proba(X[["x1", "x2"]])
+
+    return data, csv_file, ColumnSelector()
+
+# Test: chunked confusion matrix matches scoring the whole file at once
+def test_score_in_chunks_matches_full_scoring(scoring_data):
+    data, csv_file, pipeline = scoring_data
+    confusion, n_rows, elapsed = score_in_chunks(pipeline, str(csv_file), chunksize=7)
+
+    expected = pd.crosstab(data["DEATH_EVENT"], pipeline.predict(data),
+                           rownames=["Actual"], colnames=["Predicted"])
+    assert n_rows == len(data)
+    assert elapsed >= 0
+    pd.testing.assert_frame_equal(confusion, expected, check_dtype=False, check_names=False)
+
+# Test: scores computed from the counts match sklearn's metrics, for integer and boolean labels
+@pytest.mark.parametrize("scoring_data", [int, bool], indirect=True)
+def test_scores_from_confusion_matches_sklearn(scoring_data):
+    data, csv_file, pipeline = scoring_data
+    confusion, _, _ = score_in_chunks(pipeline, str(csv_file), chunksize=10)
+    scores = scores_from_confusion(confusion)
+    y_pred = pipeline.predict(data)
+
+    assert scores["accuracy"] == pytest.approx(accuracy_score(data["DEATH_EVENT"], y_pred))
+    assert scores["precision"] == pytest.approx(precision_score(data["DEATH_EVENT"], y_pred))
+    assert scores["recall"] == pytest.approx(recall_score(data["DEATH_EVENT"], y_pred))
+    assert scores["f1"] == pytest.approx(f1_score(data["DEATH_EVENT"], y_pred))
+    assert scores["precision"] > 0
+
+# Test: predictions and probabilities are written for every row
+def test_score_in_chunks_writes_predictions(scoring_data, tmp_path):
+    data, csv_file, pipeline = scoring_data
+    predictions_file = tmp_path / "out" / "predictions.csv"
+    score_in_chunks(pipeline, str(csv_file), chunksize=8, predictions_to=str(predictions_file))
+    # The pipeline runs once per chunk, giving both the predictions and the probabilities
+    assert pipeline.n_calls == 7
+
+    predictions = pd.read_csv(predictions_file)
+    assert list(predictions.columns) == ["row", "DEATH_EVENT", "predicted", "probability"]
+    assert len(predictions) == len(data)
+    np.testing.assert_array_equal(predictions["predicted"], pipeline.predict(data))
+
+# Test: to raise value error if chunksize is not positive
+def test_score_in_chunks_invalid_chunksize(scoring_data):
+    _, csv_file, pipeline = scoring_data
+    with pytest.raises(ValueError, match="chunksize must be a positive integer."):
+        score_in_chunks(pipeline, str(csv_file), chunksize=0)
+
+
+# Test: boolean labels are scored with True as the positive class
+def test_scores_from_confusion_boolean_labels():
+    confusion = pd.DataFrame([[35, 6], [5, 14]], index=[False, True], columns=[False, True])
+    scores = scores_from_confusion(confusion)
+
+    assert scores["precision"] == pytest.approx(14 / 20)
+    assert scores["recall"] == pytest.approx(14 / 19)
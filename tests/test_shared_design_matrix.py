@@ -0,0 +1,75 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.shared_design_matrix import shared_design_matrix
+from src.model_fit import model_fit
+
+@pytest.fixture
+def mock_data():
+    """Create a mock dataset with numeric, boolean and passthrough columns."""
+    rng = np.random.default_rng(123)
+    return pd.DataFrame({
+        "age": rng.integers(40, 80, 100),
+        "serum_creatinine": rng.uniform(0.5, 2.5, 100),
+        "anaemia": rng.choice([False, True], 100),
+        "sex": rng.choice([False, True], 100),
+        "time": rng.integers(0, 300, 100),
+        "DEATH_EVENT": rng.choice([0, 1], 100),
+    })
+
+@pytest.fixture
+def preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), ["age", "serum_creatinine"]),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), ["anaemia", "sex"]),
+        remainder="passthrough"
+    )
+
+# Test: the memory-mapped matrix holds one copy of the rows, and each fold is transformed by its own fit
+def test_shared_design_matrix_folds(mock_data, preprocessor, tmp_path):
+    X = mock_data.drop(columns=["DEATH_EVENT"])
+    folds = list(StratifiedKFold(5).split(X, mock_data["DEATH_EVENT"]))
+    matrix, fold_preprocessor = shared_design_matrix(preprocessor, X, folds, str(tmp_path / "X.npy"))
+
+    assert isinstance(matrix, np.memmap)
+    assert matrix.dtype == np.float64 and matrix.flags["C_CONTIGUOUS"] and not matrix.flags["WRITEABLE"]
+    assert matrix.shape == (len(X), X.shape[1] + 1)
+    np.testing.assert_array_equal(matrix[:, 1:], X.to_numpy(dtype=float))
+    for train, test in folds:
+        fitted = clone(preprocessor).fit(X.iloc[train])
+        fold = clone(fold_preprocessor).fit(matrix[train])
+        np.testing.assert_allclose(fold.transform(matrix[train]), fitted.transform(X.iloc[train]))
+        np.testing.assert_allclose(fold.transform(matrix[test]), fitted.transform(X.iloc[test]))
+
+# Test: to raise value error for rows that are not the training rows of a fold, or non-numeric columns
+def test_shared_design_matrix_errors(mock_data, preprocessor, tmp_path):
+    X = mock_data.drop(columns=["DEATH_EVENT"])
+    folds = list(StratifiedKFold(5).split(X, mock_data["DEATH_EVENT"]))
+    matrix, fold_preprocessor = shared_design_matrix(preprocessor, X, folds, str(tmp_path / "X.npy"))
+    with pytest.raises(ValueError, match="training rows"):
+        fold_preprocessor.fit(matrix[:10])
+    with pytest.raises(ValueError, match="numeric"):
+        shared_design_matrix(preprocessor, X.assign(sex="F"), folds, str(tmp_path / "Y.npy"))
+
+# Test: model_fit gives the same search results and a DataFrame pipeline with shared data
+def test_model_fit_shared_data(mock_data, preprocessor):
+    param_grid = {"logisticregression__C": [0.1, 1, 10]}
+    model = LogisticRegression(max_iter=1000, random_state=123)
+
+    _, search = model_fit(model, preprocessor, param_grid, mock_data)
+    best_model, shared_search = model_fit(model, preprocessor, param_grid, mock_data, shared_data=True)
+
+    np.testing.assert_allclose(shared_search.cv_results_["mean_test_score"], search.cv_results_["mean_test_score"])
+    X = mock_data.drop(columns=["DEATH_EVENT"])
+    np.testing.assert_allclose(best_model.predict_proba(X), search.best_estimator_.predict_proba(X))
+
+    with pytest.raises(ValueError, match="search='grid'"):
+        model_fit(model, preprocessor, param_grid, mock_data, search="halving", shared_data=True)
@@ -103,3 +103,11 @@ def test_split_data_imbalanced_classes(temp_dir):
     assert train_data['DEATH_EVENT'].mean() == pytest.approx(
         imbalanced_data['DEATH_EVENT'].mean(), abs=0.1
     ), "Stratification failed with imbalanced data."
+
+# Test: splits are returned in memory and nothing is written without an output directory
+def test_split_data_in_memory(temp_dir):
+    train_data, test_data = split_data(valid_data, None, train_size=0.5, random_state=42)
+
+    assert len(train_data) == 3
+    assert len(test_data) == 3
+    assert os.listdir(temp_dir) == []
@@ -0,0 +1,73 @@
+import pytest
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.split_indices import split_indices, load_split, save_base
+from src.split_data import split_data
+
+data = pd.DataFrame({
+    "age": np.arange(40, 60, dtype=float),
+    "ejection_fraction": np.arange(20, 40),
+    "DEATH_EVENT": [0, 1] * 10,
+})
+
+# Test: a hold-out split selects the same rows as split_data
+def test_split_indices_matches_split_data(tmp_path):
+    indices_file = str(tmp_path / "indices.npz")
+    split_indices(data, indices_file, train_size=0.75, random_state=42)
+    train, test = load_split(data, indices_file)
+
+    expected_train, expected_test = split_data(data, None, train_size=0.75, random_state=42)
+    pd.testing.assert_frame_equal(train, expected_train)
+    pd.testing.assert_frame_equal(test, expected_test)
+
+# Test: repeated k-fold splits partition the rows and keep class balance
+def test_split_indices_repeated_kfold(tmp_path):
+    splits = split_indices(data, str(tmp_path / "indices.npz"), n_splits=5, n_repeats=3, random_state=1)
+
+    assert len(splits) == 15
+    for train, test in splits:
+        assert len(np.intersect1d(train, test)) == 0
+        assert len(train) + len(test) == len(data)
+        assert data["DEATH_EVENT"].iloc[test].mean() == pytest.approx(0.5)
+
+# Test: the saved splits can be sliced from a memory-mapped base array
+def test_load_split_memmap(tmp_path):
+    indices_file = str(tmp_path / "indices.npz")
+    base_file = str(tmp_path / "base.npy")
+    np.save(base_file, data.to_numpy(dtype=float))
+    splits = split_indices(data, indices_file, n_splits=4, random_state=0)
+
+    train, test = load_split(base_file, indices_file, split=2)
+    np.testing.assert_array_equal(test, data.to_numpy(dtype=float)[splits[2][1]])
+    assert len(train) == len(splits[2][0])
+
+# Test: to raise value error if the base dataset changed since the indices were made
+def test_load_split_mismatched_data(tmp_path):
+    indices_file = str(tmp_path / "indices.npz")
+    split_indices(data, indices_file)
+    changed = data.assign(age=data["age"] + 1)
+
+    with pytest.raises(ValueError, match="does not match"):
+        load_split(changed, indices_file)
+
+# Test: split_data can save indices and one shared base instead of copies of the splits
+def test_split_data_indices_only(tmp_path):
+    frame = data.assign(anaemia=[True, False] * 10)
+    train_rows, test_rows = split_data(frame, str(tmp_path), indices_only=True)
+
+    assert sorted(os.listdir(tmp_path)) == ["heart_failure_base.npy", "heart_failure_split_indices.npz"]
+    train, test = load_split(str(tmp_path / "heart_failure_base.npy"),
+                             str(tmp_path / "heart_failure_split_indices.npz"))
+    expected_train, expected_test = split_data(frame, None)
+    # The base keeps the column names and dtypes
+    pd.testing.assert_frame_equal(train, expected_train.reset_index(drop=True))
+    pd.testing.assert_frame_equal(test, expected_test.reset_index(drop=True))
+    np.testing.assert_array_equal(test_rows, expected_test.index)
+
+# Test: to raise value error if a column cannot be stored in the base array
+def test_save_base_rejects_text_columns(tmp_path):
+    with pytest.raises(ValueError, match="numeric and boolean"):
+        save_base(data.assign(site="a"), str(tmp_path / "base.npy"))
@@ -0,0 +1,65 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.metrics import accuracy_score
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.stability_study import stability_study, stability_summary
+from src.split_data import split_data
+from src.model_fit import model_fit
+
+@pytest.fixture
+def mock_data():
+    """Create a mock dataset with a signal in one column."""
+    rng = np.random.default_rng(123)
+    data = pd.DataFrame({
+        "age": rng.uniform(40, 80, 150),
+        "serum_creatinine": rng.uniform(0.5, 2.5, 150),
+        "anaemia": rng.choice([False, True], 150),
+    })
+    data["DEATH_EVENT"] = data["serum_creatinine"] + rng.normal(0, 0.5, 150) > 1.8
+    return data
+
+def make_preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), ["age", "serum_creatinine"]),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), ["anaemia"]),
+        remainder="passthrough"
+    )
+
+grid = {"logisticregression__C": [0.01, 1, 100]}
+
+# Test: every seed gets one row, matching a split_data and model_fit run with that seed
+def test_stability_study(mock_data, tmp_path):
+    output_file = str(tmp_path / "scores.csv")
+    scores = stability_study(mock_data, make_preprocessor(), LogisticRegression(max_iter=1000), grid,
+                             [5, 3, 4], n_jobs=2, output_file=output_file)
+
+    assert list(scores["seed"]) == [3, 4, 5]
+    assert set(scores.columns) >= {"best_C", "cv_score", "accuracy", "precision", "recall", "f1"}
+    assert len(pd.read_csv(output_file)) == 3
+
+    train, test = split_data(mock_data, str(tmp_path / "split"), random_state=4)
+    best_model, search = model_fit(LogisticRegression(max_iter=1000), make_preprocessor(), grid, train, search="path")
+    row = scores.set_index("seed").loc[4]
+    assert row["best_C"] == search.best_params_["logisticregression__C"]
+    assert row["accuracy"] == pytest.approx(accuracy_score(test["DEATH_EVENT"],
+                                                           best_model.predict(test.drop(columns=["DEATH_EVENT"]))))
+
+# Test: the summary has ordered intervals for every metric
+def test_stability_summary():
+    rng = np.random.default_rng(0)
+    scores = pd.DataFrame({metric: rng.uniform(0.6, 0.9, 50)
+                           for metric in ["cv_score", "accuracy", "precision", "recall", "f1"]})
+    summary = stability_summary(scores, level=0.9)
+
+    assert list(summary["metric"]) == ["cv_score", "accuracy", "precision", "recall", "f1"]
+    assert (summary["lower"] < summary["mean_lower"]).all()
+    assert (summary["mean_lower"] < summary["mean"]).all() and (summary["mean"] < summary["mean_upper"]).all()
+    assert (summary["mean_upper"] < summary["upper"]).all()
+    with pytest.raises(ValueError, match="level"):
+        stability_summary(scores, level=1.5)
@@ -0,0 +1,81 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, MinMaxScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.stream_fit import stream_fit, fit_preprocessor_in_chunks
+from src.dataset_io import iter_dataset_chunks
+
+@pytest.fixture
+def training_file(tmp_path):
+    """Write a separable dataset with a rare category that only appears late in the file."""
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        "age": rng.normal(60, 10, 1000),
+        "serum_creatinine": rng.normal(1.4, 0.5, 1000),
+        "anaemia": rng.choice([False, True], 1000),
+        "time": rng.integers(0, 300, 1000),
+        "ward": rng.choice(["A", "B"], 1000),
+    })
+    # The rare ward only appears in the last chunk
+    data.loc[990:, "ward"] = "C"
+    data["DEATH_EVENT"] = (data["age"] + 20 * data["serum_creatinine"] + rng.normal(0, 3, 1000)) > 88
+    path = tmp_path / "train.csv"
+    data.to_csv(path, index=False)
+    return data, str(path)
+
+def make_preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), ["age", "serum_creatinine"]),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), ["anaemia", "ward"]),
+        remainder="drop"
+    )
+
+# Test: the streamed scaler matches a batch fit and the model learns the signal
+def test_stream_fit(training_file):
+    data, path = training_file
+    pipeline, stats = stream_fit(path, make_preprocessor(), chunksize=64, epochs=5, random_state=1)
+
+    scaler = pipeline[0].named_transformers_["standardscaler"]
+    np.testing.assert_allclose(scaler.mean_, data[["age", "serum_creatinine"]].mean())
+    np.testing.assert_allclose(scaler.scale_, data[["age", "serum_creatinine"]].std(ddof=0))
+    assert pipeline.score(data.drop(columns=["DEATH_EVENT"]), data["DEATH_EVENT"]) > 0.85
+    assert pipeline.predict_proba(data.drop(columns=["DEATH_EVENT"]).head()).shape == (5, 2)
+    assert stats["rows"] == 1000
+    assert stats["max_chunk_rows"] == 64
+
+    # The late rare category is encoded, not ignored as unknown
+    encoder = pipeline[0].named_transformers_["onehotencoder"]
+    assert list(encoder.categories_[1]) == ["A", "B", "C"]
+    encoded = pipeline[0].transform(data.drop(columns=["DEATH_EVENT"]).tail(10))
+    assert (encoded[:, -1] == 1).all()
+
+# Test: the preprocessor fitted over chunks transforms like one fitted on the whole data
+def test_fit_preprocessor_in_chunks(training_file):
+    data, path = training_file
+    X = data.drop(columns=["DEATH_EVENT"])
+    fitted = fit_preprocessor_in_chunks(iter_dataset_chunks(path, 64), make_preprocessor())
+
+    np.testing.assert_allclose(fitted.transform(X), make_preprocessor().fit(X).transform(X), atol=1e-12)
+    with pytest.raises(ValueError, match="no rows"):
+        fit_preprocessor_in_chunks([], make_preprocessor())
+
+# Test: the result depends on the seed but not on the order of repeated runs
+def test_stream_fit_reproducible(training_file):
+    _, path = training_file
+    first, _ = stream_fit(path, make_preprocessor(), chunksize=100, epochs=2, random_state=3)
+    second, _ = stream_fit(path, make_preprocessor(), chunksize=100, epochs=2, random_state=3)
+    np.testing.assert_array_equal(first[-1].coef_, second[-1].coef_)
+
+    other, _ = stream_fit(path, make_preprocessor(), chunksize=100, epochs=2, random_state=4)
+    assert not np.array_equal(first[-1].coef_, other[-1].coef_)
+
+# Test: to raise value error for transformers that cannot be fitted incrementally
+def test_stream_fit_unsupported_transformer(training_file):
+    _, path = training_file
+    preprocessor = make_column_transformer((MinMaxScaler(), ["age"]))
+    with pytest.raises(ValueError, match="cannot be fitted incrementally"):
+        stream_fit(path, preprocessor)
@@ -0,0 +1,76 @@
+import pytest
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.stream_split_data import stream_split_data, _class_key
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    """Write an imbalanced dataset to CSV."""
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        "row_id": np.arange(2000),
+        "age": rng.integers(40, 90, 2000).astype(float),
+        "DEATH_EVENT": rng.random(2000) < 0.3,
+    })
+    path = tmp_path / "source.csv"
+    data.to_csv(path, index=False)
+    return data, str(path)
+
+def read_split(output_dir):
+    train = pd.read_csv(os.path.join(output_dir, "heart_failure_train.csv"))
+    test = pd.read_csv(os.path.join(output_dir, "heart_failure_test.csv"))
+    return train, test
+
+# Test: every row lands in exactly one output and class proportions hold
+def test_stream_split_data_stratified(source_file, tmp_path):
+    data, path = source_file
+    counts = stream_split_data(path, str(tmp_path / "out"), train_size=0.8, chunksize=128, block_size=50)
+    train, test = read_split(str(tmp_path / "out"))
+
+    assert sorted(pd.concat([train, test])["row_id"]) == list(range(len(data)))
+    for label in [False, True]:
+        n_label = (data["DEATH_EVENT"] == label).sum()
+        assert counts[label]["train"] + counts[label]["test"] == n_label
+        # Within one block of the target proportion
+        assert abs(counts[label]["train"] - 0.8 * n_label) <= 50
+    assert train["DEATH_EVENT"].mean() == pytest.approx(data["DEATH_EVENT"].mean(), abs=0.02)
+
+# Test: the split depends on random_state but not on the chunk size
+def test_stream_split_data_reproducible(source_file, tmp_path):
+    _, path = source_file
+    stream_split_data(path, str(tmp_path / "a"), random_state=1, chunksize=100)
+    stream_split_data(path, str(tmp_path / "b"), random_state=1, chunksize=777)
+    stream_split_data(path, str(tmp_path / "c"), random_state=2, chunksize=100)
+
+    train_a, _ = read_split(str(tmp_path / "a"))
+    train_b, _ = read_split(str(tmp_path / "b"))
+    train_c, _ = read_split(str(tmp_path / "c"))
+    pd.testing.assert_frame_equal(train_a, train_b)
+    assert set(train_a["row_id"]) != set(train_c["row_id"])
+
+# Test: Invalid train_size
+def test_stream_split_data_invalid_train_size(source_file, tmp_path):
+    _, path = source_file
+    with pytest.raises(ValueError, match="train_size must be between 0 and 1."):
+        stream_split_data(path, str(tmp_path), train_size=1.5)
+
+# Test: Missing DEATH_EVENT column
+def test_stream_split_data_missing_column(source_file, tmp_path):
+    data, _ = source_file
+    path = tmp_path / "no_target.csv"
+    data.drop(columns=["DEATH_EVENT"]).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="must contain the 'DEATH_EVENT' column"):
+        stream_split_data(str(path), str(tmp_path / "out"))
+
+# Test: a label gives the same seed whether it is read as an integer, a float or a boolean
+def test_class_key_normalises_labels():
+    assert _class_key(1) == _class_key(1.0) == _class_key(np.float64(1.0)) == _class_key(np.int64(1)) == _class_key(True)
+    assert _class_key(0.0) == _class_key(False)
+    assert _class_key(1.5) != _class_key(1)
+    # String labels are keyed on the whole label, not a prefix
+    assert _class_key("deceased_early") != _class_key("deceased_late")
+    assert _class_key("alive") == _class_key(np.str_("alive"))
@@ -0,0 +1,112 @@
+import pytest
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.streaming_correlation import CorrelationAccumulator, RankSketch, streaming_correlation
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(522)
+    data = pd.DataFrame({
+        "age": rng.normal(60, 12, 500),
+        "platelets": rng.normal(263_000, 97_000, 500),
+        "serum_creatinine": rng.lognormal(0.3, 0.4, 500),
+        "ejection_fraction": rng.integers(15, 80, 500),
+    })
+    data["time"] = data["age"] * 2 + rng.normal(0, 5, 500)
+    data["anaemia"] = rng.random(500) > 0.5
+    return data
+
+# Test: the chunked Pearson and Spearman correlations equal DataFrame.corr, whatever the chunk size
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+@pytest.mark.parametrize("chunksize", [1, 37, 1000])
+def test_streaming_correlation_matches_pandas(data, method, chunksize):
+    result = streaming_correlation(data, chunksize=chunksize, method=method)
+    pd.testing.assert_frame_equal(result, data.corr(method=method), rtol=1e-10)
+
+# Test: accumulators built on separate rows merge into the accumulator of all rows
+def test_correlation_accumulator_merge(data):
+    values = data.to_numpy(dtype=float)
+    whole = CorrelationAccumulator(data.columns).update(values)
+    merged = CorrelationAccumulator(data.columns).update(values[:123]).merge(
+        CorrelationAccumulator(data.columns).update(values[123:]))
+
+    assert (merged.n == 500).all()
+    np.testing.assert_allclose(merged.mean, whole.mean)
+    np.testing.assert_allclose(merged.m2, whole.m2)
+    np.testing.assert_allclose(merged.comoment, whole.comoment)
+    pd.testing.assert_frame_equal(merged.covariance(), data.astype(float).cov())
+
+    with pytest.raises(ValueError, match="same columns"):
+        whole.merge(CorrelationAccumulator(["age"]))
+
+# Test: with missing values every pair of columns uses the rows where both are present, as DataFrame.corr does
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+@pytest.mark.parametrize("chunksize", [7, 100, 1000])
+def test_streaming_correlation_missing_values(data, method, chunksize):
+    rng = np.random.default_rng(1)
+    data = data.astype(float)
+    for column, fraction in [("age", 0.1), ("platelets", 0.3), ("time", 0.05)]:
+        data.loc[rng.random(len(data)) < fraction, column] = np.nan
+    # A column missing from whole chunks
+    data.loc[:150, "serum_creatinine"] = np.nan
+
+    result = streaming_correlation(data, chunksize=chunksize, method=method)
+    pd.testing.assert_frame_equal(result, data.corr(method=method), rtol=1e-10)
+
+    values = data.to_numpy()
+    merged = CorrelationAccumulator(data.columns).update(values[:200]).merge(
+        CorrelationAccumulator(data.columns).update(values[200:]))
+    pd.testing.assert_frame_equal(merged.covariance(), data.cov(), rtol=1e-10)
+
+# Test: rank sketches give average ranks while exact, and close ranks once compressed
+def test_rank_sketch():
+    values = np.array([3.0, 1.0, 3.0, 2.0, 5.0, 3.0])
+    sketch = RankSketch().update(values[:3]).merge(RankSketch().update(values[3:]))
+    assert sketch.exact
+    np.testing.assert_array_equal(sketch.ranks(values), pd.Series(values).rank())
+    # Missing values are not counted
+    np.testing.assert_array_equal(RankSketch().update([np.nan, 2.0, 1.0]).counts, [1.0, 1.0])
+
+    values = np.random.default_rng(0).normal(size=5000)
+    sketch = RankSketch(max_bins=100).update(values)
+    assert not sketch.exact and len(sketch.values) <= 100
+    assert np.abs(sketch.ranks(values) - pd.Series(values).rank()).max() < 5000 / 100
+
+# Test: a compressed sketch gives a close Spearman correlation
+def test_streaming_spearman_approximate(data):
+    result = streaming_correlation(data, chunksize=50, method="spearman", max_bins=32)
+    np.testing.assert_allclose(result, data.corr(method="spearman"), atol=0.02)
+
+# Test: the transform is applied chunk by chunk, and a dataset file is read in chunks
+def test_streaming_correlation_transform_and_file(data, tmp_path):
+    scaler = StandardScaler().set_output(transform="pandas").fit(data)
+    expected = scaler.transform(data).corr()
+    result = streaming_correlation(data, chunksize=64, transform=scaler.transform)
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-10)
+
+    path = str(tmp_path / "data.csv")
+    data.to_csv(path, index=False)
+    pd.testing.assert_frame_equal(streaming_correlation(path, chunksize=64), data.corr(), rtol=1e-10)
+
+# Test: the result does not depend on the number of workers
+def test_streaming_correlation_n_jobs(data):
+    result = streaming_correlation(data, chunksize=100, method="spearman", n_jobs=2)
+    pd.testing.assert_frame_equal(result, data.corr(method="spearman"), rtol=1e-10)
+
+# Test: constant and empty columns give NaN as in DataFrame.corr, and bad input raises a ValueError
+def test_streaming_correlation_edge_cases(data):
+    data["constant"] = 1.0
+    data["empty"] = np.nan
+    for method in ["pearson", "spearman"]:
+        pd.testing.assert_frame_equal(streaming_correlation(data, chunksize=100, method=method),
+                                      data.corr(method=method), rtol=1e-10)
+
+    with pytest.raises(ValueError, match="method"):
+        streaming_correlation(data, method="kendall")
+    with pytest.raises(ValueError, match="no rows"):
+        streaming_correlation(data.iloc[:0])
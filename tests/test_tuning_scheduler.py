@@ -0,0 +1,69 @@
+import pytest
+import os
+import sys
+import pandas as pd
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.model_selection import GridSearchCV, cross_validate
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.tuning_scheduler import tune_models
+
+@pytest.fixture
+def mock_data():
+    """Create a mock dataset with numeric and boolean columns."""
+    rng = np.random.default_rng(123)
+    return pd.DataFrame({
+        "age": rng.uniform(40, 80, 120),
+        "serum_creatinine": rng.uniform(0.5, 2.5, 120),
+        "anaemia": rng.choice([False, True], 120),
+        "DEATH_EVENT": rng.choice([0, 1], 120),
+    })
+
+@pytest.fixture
+def preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), ["age", "serum_creatinine"]),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop='if_binary', dtype=int), ["anaemia"]),
+        remainder="passthrough"
+    )
+
+# Test: every model gets the same results as tuning it on its own
+def test_tune_models_matches_separate_runs(mock_data, preprocessor):
+    knn_grid = {"kneighborsclassifier__n_neighbors": [3, 5, 7]}
+    lr_grid = {"logisticregression__C": [0.1, 1, 10], "logisticregression__fit_intercept": [True, False]}
+    results = tune_models({
+        'tree': {'model': DecisionTreeClassifier(random_state=1), 'preprocessor': preprocessor, 'grid': None, 'cv': 5},
+        'knn': {'model': KNeighborsClassifier(), 'preprocessor': preprocessor, 'grid': knn_grid},
+        'lr': {'model': LogisticRegression(), 'preprocessor': preprocessor, 'grid': lr_grid},
+    }, mock_data, n_jobs=2)
+
+    X, y = mock_data.drop(columns=["DEATH_EVENT"]), mock_data["DEATH_EVENT"]
+    tree = cross_validate(make_pipeline(preprocessor, DecisionTreeClassifier(random_state=1)), X, y,
+                          return_train_score=True)
+    np.testing.assert_allclose(results['tree']['test_score'], tree['test_score'])
+    np.testing.assert_allclose(results['tree']['train_score'], tree['train_score'])
+
+    for name, model, grid in [('knn', KNeighborsClassifier(), knn_grid), ('lr', LogisticRegression(), lr_grid)]:
+        search = GridSearchCV(make_pipeline(preprocessor, model), grid, cv=10, return_train_score=True).fit(X, y)
+        for key in ["mean_test_score", "split9_test_score", "mean_train_score", "rank_test_score"]:
+            np.testing.assert_allclose(results[name].cv_results_[key], search.cv_results_[key])
+        assert results[name].cv_results_['params'] == search.cv_results_['params']
+        assert results[name].best_params_ == search.best_params_
+        np.testing.assert_array_equal(results[name].best_estimator_.predict(X), search.best_estimator_.predict(X))
+
+# Test: the schedule summary reports wall time and a utilisation between 0 and 1
+def test_tune_models_schedule(mock_data, preprocessor):
+    results = tune_models({
+        'knn': {'model': KNeighborsClassifier(), 'preprocessor': preprocessor,
+                'grid': {"kneighborsclassifier__n_neighbors": [3, 5]}},
+    }, mock_data, n_jobs=1)
+
+    schedule = results['_schedule']
+    assert schedule['workers'] == 1
+    assert schedule['wall_time'] > 0
+    assert 0 < schedule['utilisation'] <= 1